@@ -0,0 +1,81 @@
+import json
+import os
+import sys
+import time
+from argparse import ArgumentParser, Namespace
+from typing import Any, Dict, List
+
+from .common import REPOSITORY_ROOT, environment
+from .suites import BENCHMARKS
+
+
+def run(args: Namespace) -> None:
+    names = args.only or list(BENCHMARKS)
+    unknown = [name for name in names if name not in BENCHMARKS]
+    if unknown:
+        raise SystemExit(f"Unknown benchmark(s): {', '.join(unknown)}. Available: {', '.join(BENCHMARKS)}")
+    results: List[Dict[str, Any]] = []
+    for name in names:
+        print(f"running {name}", file=sys.stderr)
+        for result in BENCHMARKS[name](args):
+            results.append(result.to_dict())
+            print(f"  {json.dumps(results[-1], ensure_ascii=False)}", file=sys.stderr)
+    output = args.output or os.path.join(
+        REPOSITORY_ROOT, "benchmarks", "results", time.strftime("%Y%m%d-%H%M%S") + ".json"
+    )
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w", encoding="utf-8") as fout:
+        json.dump({"environment": environment(), "results": results}, fout, ensure_ascii=False, indent=2)
+    print(output)
+
+
+def _key(result: Dict[str, Any]) -> str:
+    return result["name"] + json.dumps(result["params"], sort_keys=True)
+
+
+def compare(args: Namespace) -> None:
+    with open(args.baseline, "r", encoding="utf-8") as f:
+        baseline = {_key(r): r for r in json.load(f)["results"]}
+    with open(args.candidate, "r", encoding="utf-8") as f:
+        candidate = json.load(f)["results"]
+    for result in candidate:
+        before = baseline.get(_key(result))
+        if before is None or "stats" not in before or "stats" not in result:
+            continue
+        ratio = result["stats"]["median_seconds"] / before["stats"]["median_seconds"]
+        marker = "slower" if ratio > 1.0 + args.threshold else "faster" if ratio < 1.0 - args.threshold else "same"
+        print(f"{marker:>6} {ratio:6.2f}x  {result['name']} {json.dumps(result['params'], ensure_ascii=False)}")
+
+
+def main() -> None:
+    parser = ArgumentParser(prog="python -m benchmarks", description="ols2t benchmark suite")
+    subcommand_parser = parser.add_subparsers(dest="subcommand")
+    run_parser = subcommand_parser.add_parser("run", help="Run benchmarks and write results as JSON")
+    run_parser.add_argument("--only", nargs="*", help=f"Benchmarks to run (default: all of {', '.join(BENCHMARKS)})")
+    run_parser.add_argument("--output", help="Result file (default: benchmarks/results/<timestamp>.json)")
+    run_parser.add_argument("--repeat", type=int, default=5)
+    run_parser.add_argument("--model", default="tiny", help="Whisper model size or local path for end_to_end_tiny")
+    run_parser.add_argument("--synthetic-seconds", type=int, nargs="*", default=[60, 600])
+    run_parser.add_argument("--concurrency", type=int, nargs="*", default=[1, 4, 16])
+    run_parser.add_argument("--requests-per-client", type=int, default=4)
+    run_parser.add_argument(
+        "--sweep-real-time-factor",
+        type=float,
+        default=0.0,
+        help="Simulated decode time per second of audio for segment_merging_sweep",
+    )
+    compare_parser = subcommand_parser.add_parser("compare", help="Compare two result files by median time")
+    compare_parser.add_argument("baseline")
+    compare_parser.add_argument("candidate")
+    compare_parser.add_argument("--threshold", type=float, default=0.05)
+    args = parser.parse_args()
+    if args.subcommand == "run":
+        run(args)
+    elif args.subcommand == "compare":
+        compare(args)
+    else:
+        parser.print_help()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+import wave
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from typing import Any, Dict, List
+
+import numpy as np
+from numpy.typing import NDArray
+
+import ols2t
+
+REPOSITORY_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), os.pardir))
+FIXTURE_DIR = os.path.join(REPOSITORY_ROOT, "tests", "fixtures")
+SAMPLING_RATE = 16000
+
+
+@dataclass
+class BenchmarkResult:
+    name: str
+    params: Dict[str, Any] = field(default_factory=dict)
+    timings: List[float] = field(default_factory=list)
+    metrics: Dict[str, Any] = field(default_factory=dict)
+    skipped: str | None = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        result: Dict[str, Any] = {"name": self.name, "params": self.params}
+        if self.skipped is not None:
+            result["skipped"] = self.skipped
+            return result
+        result["stats"] = summarize(self.timings)
+        result["metrics"] = self.metrics
+        return result
+
+
+def summarize(timings: List[float]) -> Dict[str, float]:
+    if len(timings) == 0:
+        return {}
+    return {
+        "repeat": len(timings),
+        "min_seconds": min(timings),
+        "median_seconds": statistics.median(timings),
+        "mean_seconds": statistics.fmean(timings),
+        "stdev_seconds": statistics.stdev(timings) if len(timings) > 1 else 0.0,
+        "max_seconds": max(timings),
+    }
+
+
+def percentile(values: List[float], q: float) -> float:
+    if len(values) == 0:
+        return 0.0
+    return float(np.percentile(np.asarray(values), q))
+
+
+def measure(function: Callable[[], Any], repeat: int, warmup: int = 1) -> List[float]:
+    for _ in range(warmup):
+        function()
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        function()
+        timings.append(time.perf_counter() - started)
+    return timings
+
+
+def environment() -> Dict[str, Any]:
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "HEAD"], cwd=REPOSITORY_ROOT, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        "ols2t_version": ols2t.__version__,
+        "git_commit": commit,
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "cpu_count": os.cpu_count(),
+        "numpy": np.__version__,
+        "created_at": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+    }
+
+
+def synthetic_speech_like_audio(seconds: float, seed: int = 0) -> NDArray[np.float32]:
+    """Amplitude-modulated harmonics with pauses; deterministic for a given seed."""
+    rng = np.random.default_rng(seed)
+    t = np.arange(int(seconds * SAMPLING_RATE), dtype=np.float32) / SAMPLING_RATE
+    carrier = sum(np.sin(2 * np.pi * f * t) / (i + 1) for i, f in enumerate((180.0, 360.0, 540.0, 1200.0)))
+    envelope = np.clip(np.sin(2 * np.pi * 0.5 * t), 0.0, None)
+    noise = rng.normal(0.0, 0.01, size=t.shape)
+    return np.asarray(0.3 * carrier * envelope + noise, dtype=np.float32)
+
+
+def write_wav(path: str, audio: NDArray[np.float32]) -> None:
+    pcm = (np.clip(audio, -1.0, 1.0) * 32767).astype("<i2")
+    with wave.open(path, "wb") as fout:
+        fout.setnchannels(1)
+        fout.setsampwidth(2)
+        fout.setframerate(SAMPLING_RATE)
+        fout.writeframes(pcm.tobytes())
@@ -0,0 +1,358 @@
+import glob
+import os
+import tempfile
+import threading
+import time
+from argparse import Namespace
+from collections.abc import Callable, Generator
+from concurrent.futures import ThreadPoolExecutor
+from multiprocessing import Event as MPEvent
+from multiprocessing import Queue as MPQueue
+from typing import Dict, List
+
+import numpy as np
+from pydantic import BaseModel
+
+from ols2t.core import SpeechToTextCore
+from ols2t.metrics import pipeline_metrics
+from ols2t.models import (
+    AudioChunkStream,
+    AudioFrameStream,
+    BaseStream,
+    FileStream,
+    Segment,
+    SegmentMergingParameters,
+    TranscriptionContext,
+)
+from ols2t.speech_to_text_models.base import BaseSpeechToTextModel
+from ols2t.speech_to_text_models.stub import StubSpeechToTextModel
+from ols2t.types import AudioFrameChunk, ContinuousBufferReader
+
+from .common import (
+    FIXTURE_DIR,
+    SAMPLING_RATE,
+    BenchmarkResult,
+    measure,
+    percentile,
+    synthetic_speech_like_audio,
+    write_wav,
+)
+
+Benchmark = Callable[[Namespace], List[BenchmarkResult]]
+
+BENCHMARKS: Dict[str, Benchmark] = {}
+
+
+def benchmark(name: str) -> Callable[[Benchmark], Benchmark]:
+    def register(function: Benchmark) -> Benchmark:
+        BENCHMARKS[name] = function
+        return function
+
+    return register
+
+
+@benchmark("file_stream_decode")
+def file_stream_decode(args: Namespace) -> List[BenchmarkResult]:
+    results = []
+    sources = {"hello_ja.wav": os.path.join(FIXTURE_DIR, "hello_ja.wav")}
+    sources["longtext_all.m4a"] = os.path.join(FIXTURE_DIR, "longtext_all.m4a")
+    with tempfile.TemporaryDirectory() as tempdir:
+        for seconds in args.synthetic_seconds:
+            path = os.path.join(tempdir, f"synthetic_{seconds}s.wav")
+            write_wav(path, synthetic_speech_like_audio(seconds))
+            sources[f"synthetic_{seconds}s.wav"] = path
+        for name, path in sources.items():
+            samples = 0
+
+            def decode() -> None:
+                nonlocal samples
+                with FileStream(path=path) as chunks:
+                    samples = sum(len(chunk) for chunk in chunks)
+
+            timings = measure(decode, repeat=args.repeat)
+            audio_seconds = samples / SAMPLING_RATE
+            results.append(
+                BenchmarkResult(
+                    name="file_stream_decode",
+                    params={"source": name, "audio_seconds": audio_seconds},
+                    timings=timings,
+                    metrics={"real_time_factor": min(timings) / audio_seconds},
+                )
+            )
+    return results
+
+
+@benchmark("continuous_buffer_reader")
+def continuous_buffer_reader(args: Namespace) -> List[BenchmarkResult]:
+    results = []
+    total_bytes = 8 * 1024 * 1024
+    for chunk_size in (1024, 16 * 1024, 64 * 1024):
+        read_size = 32 * 1024
+        chunk = b"\x00" * chunk_size
+
+        def read_all() -> None:
+            queue: "MPQueue[bytes | None]" = MPQueue(maxsize=256)
+            stop_event = MPEvent()
+
+            def feed() -> None:
+                for _ in range(total_bytes // chunk_size):
+                    queue.put(chunk)
+                stop_event.set()
+
+            feeder = threading.Thread(target=feed)
+            feeder.start()
+            reader = ContinuousBufferReader(queue, stop_event)
+            remaining = total_bytes
+            while remaining > 0:
+                remaining -= len(reader.read(min(read_size, remaining)))
+            feeder.join()
+            queue.close()
+            queue.join_thread()
+
+        timings = measure(read_all, repeat=args.repeat)
+        results.append(
+            BenchmarkResult(
+                name="continuous_buffer_reader",
+                params={"chunk_bytes": chunk_size, "read_bytes": read_size, "total_bytes": total_bytes},
+                timings=timings,
+                metrics={"megabytes_per_second": total_bytes / min(timings) / 1e6},
+            )
+        )
+    return results
+
+
+def sliding_window_candidates(words: int, windows_per_word: int, seed: int = 0) -> List[Segment]:
+    """Word candidates as produced by re-decoding overlapping windows: every word appears several times, jittered."""
+    rng = np.random.default_rng(seed)
+    segments = []
+    for i in range(words):
+        for _ in range(windows_per_word):
+            start = i * 0.3 + rng.normal(0.0, 0.02)
+            end = start + 0.25 + rng.normal(0.0, 0.02)
+            segments.append(Segment(text=f"w{i}", start=start, end=end, probability=float(rng.uniform(0.2, 1.0))))
+    return segments
+
+
+@benchmark("merge_segments")
+def merge_segments(args: Namespace) -> List[BenchmarkResult]:
+    from ols2t.speech_to_text_models.segment_merging import (
+        SegmentMergingSpeechToTextModel,
+    )
+
+    results = []
+    model = SegmentMergingSpeechToTextModel(model=StubSpeechToTextModel())
+    for words in (10, 100, 1000, 5000):
+        candidates = sliding_window_candidates(words=words, windows_per_word=3)
+        timings = measure(lambda: model.merge_segments(list(candidates)), repeat=args.repeat)
+        results.append(
+            BenchmarkResult(
+                name="merge_segments",
+                params={"candidates": len(candidates)},
+                timings=timings,
+                metrics={"candidates_per_second": len(candidates) / min(timings)},
+            )
+        )
+    return results
+
+
+class _ChunkedStream(AudioFrameStream):
+    """Like :class:`AudioFrameStream`, but hands the chunks over one by one as a live stream would."""
+
+    def __enter__(self) -> AudioChunkStream:
+        return AudioChunkStream(sampling_rate=self.sampling_rate, data=iter(self.chunks))
+
+
+class _WordGridModel(BaseSpeechToTextModel):
+    """Emits a word every 0.3 seconds of every window it decodes and counts how much audio it was given."""
+
+    def __init__(self, real_time_factor: float, seed: int = 0) -> None:
+        super(_WordGridModel, self).__init__()
+        self.real_time_factor = real_time_factor
+        self.rng = np.random.default_rng(seed)
+        self.windows = 0
+        self.decoded_seconds = 0.0
+
+    def transcribe(
+        self, input_stream: BaseStream, context: TranscriptionContext | None = None
+    ) -> Generator[Segment, None, None]:
+        with input_stream as chunks:
+            duration = sum(len(chunk) for chunk in chunks) / chunks.sampling_rate
+        self.windows += 1
+        self.decoded_seconds += duration
+        time.sleep(self.real_time_factor * duration)
+        for i in range(int(duration / 0.3)):
+            start = i * 0.3 + float(self.rng.normal(0.0, 0.02))
+            yield Segment(text=f"w{i}", start=start, end=start + 0.25, probability=float(self.rng.uniform(0.1, 1.0)))
+
+
+@benchmark("segment_merging_sweep")
+def segment_merging_sweep(args: Namespace) -> List[BenchmarkResult]:
+    """
+    Latency and compute of the segment merging model over a grid of ``buffer_length`` and ``margin``.
+
+    ``decode_amplification`` is the audio decoded by the inner model per second of input, and ``latency_*`` is how far
+    the input had advanced past the end of a word when the word was emitted.
+    """
+    from ols2t.speech_to_text_models.segment_merging import (
+        SegmentMergingSpeechToTextModel,
+    )
+
+    results = []
+    audio_seconds = 60
+    chunk = AudioFrameChunk(np.zeros(SAMPLING_RATE, dtype=np.float32))
+    for buffer_length in (1, 2, 4, 8):
+        for margin in (0.0, 0.5, 1.0):
+            model = _WordGridModel(real_time_factor=args.sweep_real_time_factor)
+            sut = SegmentMergingSpeechToTextModel(model=model)
+            context = TranscriptionContext(
+                segment_merging_parameters=SegmentMergingParameters(buffer_length=buffer_length, margin=margin)
+            )
+            latencies: List[float] = []
+
+            def run() -> None:
+                model.windows = 0
+                model.decoded_seconds = 0.0
+                latencies.clear()
+                stream = _ChunkedStream(chunks=[chunk] * audio_seconds, sampling_rate=SAMPLING_RATE)
+                for segment in sut.transcribe(input_stream=stream, context=context):
+                    latencies.append(min(model.windows, audio_seconds) - segment.end)
+
+            timings = measure(run, repeat=args.repeat)
+            results.append(
+                BenchmarkResult(
+                    name="segment_merging_sweep",
+                    params={"buffer_length": buffer_length, "margin": margin, "audio_seconds": audio_seconds},
+                    timings=timings,
+                    metrics={
+                        "decode_amplification": model.decoded_seconds / audio_seconds,
+                        "segments": len(latencies),
+                        "latency_p50_seconds": percentile(latencies, 50),
+                        "latency_p95_seconds": percentile(latencies, 95),
+                    },
+                )
+            )
+    return results
+
+
+class _AudioFrameChunkHolder(BaseModel):
+    value: AudioFrameChunk
+
+
+@benchmark("audio_frame_chunk_serialization")
+def audio_frame_chunk_serialization(args: Namespace) -> List[BenchmarkResult]:
+    results = []
+    audio = synthetic_speech_like_audio(1.0)
+    holder = _AudioFrameChunkHolder(value=AudioFrameChunk(audio))
+    as_json = holder.model_dump_json()
+    as_bytes = audio.tobytes()
+    cases: Dict[str, Callable[[], object]] = {
+        "from_bytes": lambda: AudioFrameChunk(as_bytes),
+        "from_ndarray": lambda: AudioFrameChunk(audio),
+        "validate_bytes": lambda: _AudioFrameChunkHolder(value=as_bytes),
+        "dump_json": holder.model_dump_json,
+        "validate_json": lambda: _AudioFrameChunkHolder.model_validate_json(as_json),
+    }
+    for operation, function in cases.items():
+        timings = measure(lambda: [function() for _ in range(100)], repeat=args.repeat)
+        results.append(
+            BenchmarkResult(
+                name="audio_frame_chunk_serialization",
+                params={"operation": operation, "samples": len(audio), "iterations": 100},
+                timings=timings,
+                metrics={"operations_per_second": 100 / min(timings)},
+            )
+        )
+    return results
+
+
+@benchmark("end_to_end_tiny")
+def end_to_end_tiny(args: Namespace) -> List[BenchmarkResult]:
+    from ols2t.settings import WhisperSpeechToTextModelSettings
+    from ols2t.speech_to_text_models.whisper import WhisperSpeechToTextModel
+
+    params = {"model": args.model, "source": "longtext_all_decoded.npy"}
+    try:
+        settings = WhisperSpeechToTextModelSettings(path_or_model_size=args.model, language="ja")
+        model = WhisperSpeechToTextModel(path_or_model_size=settings.path_or_model_size, language=settings.language)
+        model.model_cache
+        core = SpeechToTextCore(model=model)
+    except Exception as e:
+        return [BenchmarkResult(name="end_to_end_tiny", params=params, skipped=f"model unavailable: {e}")]
+    audio = np.load(os.path.join(FIXTURE_DIR, "longtext_all_decoded.npy"))
+    audio_seconds = len(audio) / SAMPLING_RATE
+    segments = 0
+
+    def run() -> None:
+        nonlocal segments
+        stream = AudioFrameStream(chunks=[AudioFrameChunk(audio)], sampling_rate=SAMPLING_RATE)
+        segments = sum(1 for _ in core.transcribe(input_stream=stream))
+
+    pipeline_metrics.reset()
+    timings = measure(run, repeat=args.repeat, warmup=0)
+    return [
+        BenchmarkResult(
+            name="end_to_end_tiny",
+            params={**params, "audio_seconds": audio_seconds},
+            timings=timings,
+            metrics={
+                "real_time_factor": min(timings) / audio_seconds,
+                "segments": segments,
+                "pipeline": pipeline_metrics.summary(),
+            },
+        )
+    ]
+
+
+@benchmark("http_concurrency")
+def http_concurrency(args: Namespace) -> List[BenchmarkResult]:
+    from starlette.testclient import TestClient
+
+    from ols2t.interfaces.http_api import HttpApi
+    from ols2t.settings import HttpApiSettings
+
+    results = []
+    http_api = HttpApi(core=SpeechToTextCore(model=StubSpeechToTextModel()), settings=HttpApiSettings())
+    with open(os.path.join(FIXTURE_DIR, "hello_ja.wav"), "rb") as f:
+        wav = f.read()
+    webm_chunks = []
+    for path in sorted(glob.glob(os.path.join(FIXTURE_DIR, "webm_chunks", "webm_chunk_*.bin"))):
+        with open(path, "rb") as f:
+            webm_chunks.append(f.read())
+
+    def post(client: TestClient) -> float:
+        started = time.perf_counter()
+        response = client.post("/transcribe", files={"file": ("hello_ja.wav", wav, "audio/wav")})
+        response.raise_for_status()
+        return time.perf_counter() - started
+
+    def websocket(client: TestClient) -> float:
+        started = time.perf_counter()
+        with client.websocket_connect("/ws/transcribe") as ws:
+            for chunk in webm_chunks:
+                ws.send_bytes(chunk)
+            ws.send_bytes(b"")
+            while "done" not in ws.receive_json():
+                pass
+        return time.perf_counter() - started
+
+    for name, request in (("post_transcribe", post), ("ws_transcribe", websocket)):
+        for concurrency in args.concurrency:
+            requests = concurrency * args.requests_per_client
+            with TestClient(http_api.app) as client, ThreadPoolExecutor(max_workers=concurrency) as executor:
+                started = time.perf_counter()
+                latencies = list(executor.map(lambda _: request(client), range(requests)))
+                elapsed = time.perf_counter() - started
+            results.append(
+                BenchmarkResult(
+                    name="http_concurrency",
+                    params={"endpoint": name, "concurrency": concurrency, "requests": requests},
+                    timings=[elapsed],
+                    metrics={
+                        "requests_per_second": requests / elapsed,
+                        "latency_p50_seconds": percentile(latencies, 50),
+                        "latency_p95_seconds": percentile(latencies, 95),
+                        "latency_p99_seconds": percentile(latencies, 99),
+                    },
+                )
+            )
+    return results
@@ -1,5 +1,5 @@
 from .core import SpeechToTextCore
-from .models import BytesChunkStream, FileStream, MicrophoneStream
+from .models import BytesChunkStream, FileStream, MicrophoneStream, PcmFileStream
 from .settings import (
     SpeechToTextCoreSettings,
     SpeechToTextModelSettings,
@@ -20,4 +20,5 @@ __all__ = [
     "FileStream",
     "MicrophoneStream",
     "BytesChunkStream",
+    "PcmFileStream",
 ]
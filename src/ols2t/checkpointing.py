@@ -0,0 +1,133 @@
+import os
+import tempfile
+import time
+from typing import List
+
+from oltl import BaseModel
+from pydantic import Field
+
+from .writers import TextSegmentWriter
+
+
+def write_atomically(path: str, lines: List[str]) -> None:
+    """Write ``lines`` to ``path`` so that readers see either the previous state or the complete new file."""
+    directory, name = os.path.split(os.path.abspath(path))
+    fd, temp_path = tempfile.mkstemp(dir=directory, prefix=f".{name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as fout:
+            fout.writelines(lines)
+            fout.flush()
+            os.fsync(fout.fileno())
+        os.replace(temp_path, path)
+    except BaseException:
+        os.unlink(temp_path)
+        raise
+
+
+class CheckpointError(Exception):
+    pass
+
+
+def checkpoint_path(output_path: str) -> str:
+    """
+    >>> checkpoint_path("long.jsonl")
+    'long.jsonl.checkpoint'
+    """
+    return output_path + ".checkpoint"
+
+
+class TranscriptionCheckpoint(BaseModel):
+    """
+    Progress of a transcription written to an output file.
+
+    ``offset`` is the end of the last segment written, in seconds of audio, and ``output_size`` the size of the output
+    file in bytes right after that segment was written and synced.
+
+    >>> TranscriptionCheckpoint(audio_file="long.wav", offset=12.5, output_size=1024).model_dump_json()
+    '{"audio_file":"long.wav","offset":12.5,"output_size":1024}'
+    """
+
+    audio_file: str
+    offset: float = Field(default=0.0, ge=0.0)
+    output_size: int = Field(default=0, ge=0)
+
+    @classmethod
+    def load(cls, path: str) -> "TranscriptionCheckpoint":
+        with open(path, "r", encoding="utf-8") as fin:
+            checkpoint: TranscriptionCheckpoint = cls.model_validate_json(fin.read())
+        return checkpoint
+
+    def save(self, path: str) -> None:
+        write_atomically(path, [self.model_dump_json()])
+
+
+def resume_output(checkpoint_path: str, output_path: str, audio_file: str) -> TranscriptionCheckpoint:
+    """
+    Prepare ``output_path`` to continue from the checkpoint at ``checkpoint_path``.
+
+    Output written after the checkpoint was taken is truncated, because the segments it holds are transcribed again.
+    Without a checkpoint the transcription starts from the beginning, which is only allowed while the output is
+    missing or empty so that a finished or foreign output is never overwritten.
+    """
+    if not os.path.exists(checkpoint_path):
+        if os.path.exists(output_path) and os.path.getsize(output_path) > 0:
+            raise CheckpointError(f"{checkpoint_path} does not exist; refusing to resume into non-empty {output_path}")
+        return TranscriptionCheckpoint(audio_file=audio_file)
+    checkpoint = TranscriptionCheckpoint.load(checkpoint_path)
+    if os.path.abspath(checkpoint.audio_file) != os.path.abspath(audio_file):
+        raise CheckpointError(f"{checkpoint_path} belongs to {checkpoint.audio_file}, not {audio_file}")
+    if not os.path.exists(output_path) or os.path.getsize(output_path) < checkpoint.output_size:
+        raise CheckpointError(f"{output_path} is shorter than recorded in {checkpoint_path}; cannot resume")
+    os.truncate(output_path, checkpoint.output_size)
+    return checkpoint
+
+
+class Checkpointer:
+    """
+    Periodically records how far a transcription written to ``output`` has progressed.
+
+    Call :meth:`update` after each segment is written. At most every ``interval`` seconds the writer is flushed and
+    synced, then the checkpoint is replaced atomically, so the checkpoint never refers to output that is not on disk.
+    """
+
+    def __init__(
+        self, path: str, checkpoint: TranscriptionCheckpoint, output: TextSegmentWriter, interval: float = 60.0
+    ) -> None:
+        self._path = path
+        self._checkpoint = checkpoint
+        self._output = output
+        self._interval = interval
+        self._last_saved = time.monotonic()
+
+    @property
+    def path(self) -> str:
+        return self._path
+
+    @property
+    def checkpoint(self) -> TranscriptionCheckpoint:
+        return self._checkpoint
+
+    @property
+    def interval(self) -> float:
+        return self._interval
+
+    def update(self, offset: float, now: float | None = None) -> bool:
+        """Record that audio up to ``offset`` has been written. Returns whether a checkpoint was saved."""
+        now = time.monotonic() if now is None else now
+        if now - self._last_saved < self.interval:
+            return False
+        self.save(offset)
+        self._last_saved = now
+        return True
+
+    def save(self, offset: float) -> None:
+        self._output.sync()
+        self._checkpoint = TranscriptionCheckpoint(
+            audio_file=self._checkpoint.audio_file, offset=offset, output_size=self._output.tell()
+        )
+        self._checkpoint.save(self.path)
+
+    def finish(self) -> None:
+        """Remove the checkpoint once the whole file has been transcribed."""
+        if os.path.exists(self.path):
+            os.unlink(self.path)
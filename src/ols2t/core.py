@@ -1,10 +1,73 @@
-from collections.abc import Generator
+import asyncio
+import queue as stdlib_queue
+import threading
+from collections.abc import AsyncGenerator, Generator, Iterable, Sequence
+from concurrent.futures import Executor, ThreadPoolExecutor
+from types import TracebackType
+from typing import Any, Set, Tuple, Type, TypeVar
 
-from .models import BaseStream, Segment
+from .models import BaseStream, Segment, TranscriptionContext
 from .settings import SpeechToTextCoreSettings
 from .speech_to_text_models.base import BaseSpeechToTextModel
 from .speech_to_text_models.factory import create_speech_to_text_model
 
+T = TypeVar("T")
+
+
+async def iterate_in_executor(
+    iterable: Iterable[T], max_buffered: int = 64, executor: Executor | None = None
+) -> AsyncGenerator[T, None]:
+    """
+    Iterate a blocking iterable on ``executor`` and yield its items to the event loop.
+
+    At most ``max_buffered`` items are buffered; the worker thread blocks until the consumer catches up. Waiting for
+    items does not occupy a thread. When the consumer stops early (``break``, ``aclose()`` or cancellation), the
+    worker stops at the next item and closes the iterable. Exceptions raised by the iterable are re-raised here.
+
+    >>> async def collect():
+    ...     return [x async for x in iterate_in_executor(range(3))]
+    >>> asyncio.run(collect())
+    [0, 1, 2]
+    """
+    loop = asyncio.get_running_loop()
+    queue: asyncio.Queue[T] = asyncio.Queue(maxsize=max_buffered)
+    stopped = threading.Event()
+
+    def produce() -> None:
+        iterator = iter(iterable)
+        try:
+            for item in iterator:
+                if stopped.is_set():
+                    return
+                asyncio.run_coroutine_threadsafe(queue.put(item), loop).result()
+        finally:
+            close = getattr(iterator, "close", None)
+            if close is not None:
+                close()
+
+    producer = loop.run_in_executor(executor, produce)
+    get: asyncio.Future[T] | None = None
+    try:
+        while True:
+            get = asyncio.ensure_future(queue.get())
+            pending: Set["asyncio.Future[Any]"] = {get, producer}
+            await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            if get.done():
+                yield get.result()
+                continue
+            get.cancel()
+            while not queue.empty():
+                yield queue.get_nowait()
+            producer.result()
+            return
+    finally:
+        stopped.set()
+        if get is not None and not get.done():
+            get.cancel()
+        # Make room so that a worker blocked on a full queue wakes up and sees ``stopped``.
+        while not queue.empty():
+            queue.get_nowait()
+
 
 class SpeechToTextCore:
     def __init__(self, model: BaseSpeechToTextModel) -> None:
@@ -14,8 +77,92 @@ class SpeechToTextCore:
     def model(self) -> BaseSpeechToTextModel:
         return self._model
 
-    def transcribe(self, input_stream: BaseStream) -> Generator[Segment, None, None]:
-        yield from self.model.transcribe(input_stream=input_stream)
+    def close(self) -> None:
+        """Close the model. Interfaces close their core when they stop running."""
+        self.model.close()
+
+    def __enter__(self) -> "SpeechToTextCore":
+        return self
+
+    def __exit__(
+        self, exc_type: Type[BaseException] | None, exc_value: BaseException | None, traceback: TracebackType | None
+    ) -> None:
+        self.close()
+
+    def transcribe(
+        self, input_stream: BaseStream, context: TranscriptionContext | None = None
+    ) -> Generator[Segment, None, None]:
+        yield from self.model.transcribe(input_stream=input_stream, context=context)
+
+    def transcribe_channels(
+        self, input_streams: Sequence[BaseStream], max_workers: int | None = None
+    ) -> Generator[Segment, None, None]:
+        """
+        Transcribe several channels of one recording as independent streams in parallel.
+
+        Segments are tagged with the index of their stream as ``channel`` and yielded as soon as any channel produces
+        them, so segments of different channels interleave. Each channel has its own context (e.g. its own detected
+        language). Stopping early cancels the remaining channels.
+        """
+        results: "stdlib_queue.Queue[Tuple[int, Segment | BaseException | None]]" = stdlib_queue.Queue()
+        contexts = [TranscriptionContext() for _ in input_streams]
+
+        def run(channel: int) -> None:
+            try:
+                for segment in self.transcribe(input_stream=input_streams[channel], context=contexts[channel]):
+                    results.put((channel, segment.with_channel(channel)))
+            except BaseException as e:
+                results.put((channel, e))
+                return
+            results.put((channel, None))
+
+        with ThreadPoolExecutor(
+            max_workers=max_workers or max(len(input_streams), 1), thread_name_prefix="ols2t-channel"
+        ) as executor:
+            for channel in range(len(input_streams)):
+                executor.submit(run, channel)
+            remaining = len(input_streams)
+            try:
+                while remaining > 0:
+                    _, item = results.get()
+                    if item is None:
+                        remaining -= 1
+                    elif isinstance(item, BaseException):
+                        raise item
+                    else:
+                        yield item
+            finally:
+                if remaining > 0:
+                    for context in contexts:
+                        context.cancel()
+
+    async def atranscribe(
+        self,
+        input_stream: BaseStream,
+        context: TranscriptionContext | None = None,
+        max_buffered_segments: int = 64,
+        executor: Executor | None = None,
+    ) -> AsyncGenerator[Segment, None]:
+        """
+        Asynchronous counterpart of :meth:`transcribe`.
+
+        The model runs on ``executor`` (the event loop's default executor when ``None``) and at most
+        ``max_buffered_segments`` segments are held while the consumer is busy. See :func:`iterate_in_executor`.
+        If the consumer stops before the end, ``context`` is cancelled so that the model stops decoding as well.
+        """
+        context = context or TranscriptionContext()
+        finished = False
+        try:
+            async for segment in iterate_in_executor(
+                self.transcribe(input_stream=input_stream, context=context),
+                max_buffered=max_buffered_segments,
+                executor=executor,
+            ):
+                yield segment
+            finished = True
+        finally:
+            if not finished:
+                context.cancel()
 
     @classmethod
     def create(cls, settings: SpeechToTextCoreSettings) -> "SpeechToTextCore":
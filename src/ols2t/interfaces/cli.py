@@ -1,9 +1,39 @@
-from argparse import ArgumentParser
+import json
+import os
+import sys
+from argparse import ArgumentParser, Namespace
+from collections.abc import Iterator
 
+from ..checkpointing import (
+    Checkpointer,
+    CheckpointError,
+    TranscriptionCheckpoint,
+    checkpoint_path,
+    resume_output,
+)
 from ..core import SpeechToTextCore
-from ..models import BaseStream, FileStream, MicrophoneStream
+from ..metrics import pipeline_metrics
+from ..models import (
+    BaseStream,
+    FileStream,
+    MicrophoneStream,
+    PcmFileStream,
+    Segment,
+)
+from ..profiling import TranscriptionProfiler
+from ..settings import BackpressurePolicy
+from ..writers import (
+    BaseSegmentWriter,
+    FlushPolicy,
+    OutputFormat,
+    TextSegmentWriter,
+    create_segment_writer,
+)
 from .base import BaseInterface
 
+# Memory-mapped instead of decoded, see PcmFileStream.
+PCM_FILE_EXTENSIONS = (".npy", ".f32", ".s16")
+
 
 class Cli(BaseInterface):
     def __init__(self, core: SpeechToTextCore, basic_argument_parser: ArgumentParser) -> None:
@@ -11,8 +41,80 @@ class Cli(BaseInterface):
         self._parser = basic_argument_parser
         subcommand_parser = self._parser.add_subparsers(dest="subcommand")
         transcribe_parser = subcommand_parser.add_parser("transcribe")
-        transcribe_parser.add_argument("audio_file")
+        transcribe_parser.add_argument(
+            "audio_file",
+            help="Audio file to transcribe, raw mono 16 kHz PCM (.npy, .f32 or .s16), or - for the microphone",
+        )
         transcribe_parser.add_argument("output_file")
+        transcribe_parser.add_argument(
+            "--metrics", action="store_true", help="Print a JSON summary of per-stage metrics to stderr when done"
+        )
+        transcribe_parser.add_argument(
+            "--backpressure",
+            type=BackpressurePolicy,
+            choices=[policy.value for policy in BackpressurePolicy],
+            default=BackpressurePolicy.DROP_OLDEST,
+            help="What to do with microphone audio when transcription falls behind",
+        )
+        transcribe_parser.add_argument(
+            "--profile", metavar="DIRECTORY", help="Profile the transcription and write a pstats file to DIRECTORY"
+        )
+        transcribe_parser.add_argument(
+            "--split-channels",
+            action="store_true",
+            help="Transcribe each channel of the audio file separately and tag segments with their channel",
+        )
+        transcribe_parser.add_argument(
+            "--checkpoint",
+            action="store_true",
+            help="Periodically record the progress in OUTPUT_FILE.checkpoint so that an interrupted run can be resumed",
+        )
+        transcribe_parser.add_argument(
+            "--checkpoint-interval",
+            type=float,
+            default=60.0,
+            metavar="SECONDS",
+            help="Minimum time between two checkpoints",
+        )
+        transcribe_parser.add_argument(
+            "--chunk-seconds",
+            type=float,
+            metavar="SECONDS",
+            help="Feed the decoded audio file to the model in chunks of this length (default: the whole file at once). "
+            "Whisper yields segments as it decodes, so --checkpoint needs no chunks; with segment merging, segments "
+            "are only confirmed, and checkpointed, window by window, but every window is decoded buffer_length times "
+            "and words at chunk boundaries can be cut",
+        )
+        transcribe_parser.add_argument(
+            "--resume",
+            action="store_true",
+            help="Continue from OUTPUT_FILE.checkpoint if it exists, keeping the output written so far (implies "
+            "--checkpoint)",
+        )
+        transcribe_parser.add_argument(
+            "--format",
+            type=OutputFormat,
+            choices=[output_format.value for output_format in OutputFormat],
+            default=OutputFormat.JSONL,
+            help="Format of OUTPUT_FILE",
+        )
+        transcribe_parser.add_argument(
+            "--flush-segments",
+            type=int,
+            default=256,
+            metavar="N",
+            help="Write buffered segments to OUTPUT_FILE once N of them are buffered",
+        )
+        transcribe_parser.add_argument(
+            "--flush-seconds",
+            type=float,
+            default=1.0,
+            metavar="SECONDS",
+            help="Write buffered segments to OUTPUT_FILE at least this often",
+        )
+        transcribe_parser.add_argument(
+            "-q", "--quiet", action="store_true", help="Do not echo the transcribed text to stdout"
+        )
 
     @property
     def parser(self) -> ArgumentParser:
@@ -20,16 +122,87 @@ class Cli(BaseInterface):
 
     def run(self) -> None:
         args = self.parser.parse_args()
-        if args.subcommand == "transcribe":
-            stream: BaseStream
-            if args.audio_file == "-":
-                stream = MicrophoneStream()
+        with self.core:
+            if args.subcommand == "transcribe":
+                self.transcribe(args)
             else:
-                stream = FileStream(path=args.audio_file)
-            with open(args.output_file, "w", encoding="utf-8") as fout:
-                for segment in self.core.transcribe(input_stream=stream):
-                    print(segment.text, end="", flush=True)
-                    fout.write(segment.model_dump_json())
-                    fout.write("\n")
+                self.parser.print_help()
+
+    def transcribe(self, args: Namespace) -> None:
+        checkpoint = self.prepare_checkpoint(args)
+        stream = self.create_stream(args, checkpoint)
+        profiler = None if args.profile is None else TranscriptionProfiler(output_dir=args.profile)
+        transcription: Iterator[Segment]
+        if args.split_channels and isinstance(stream, FileStream):
+            transcription = self.core.transcribe_channels(input_streams=stream.split_channels())
         else:
-            self.parser.print_help()
+            transcription = self.core.transcribe(input_stream=stream)
+        if checkpoint.offset > 0.0:
+            transcription = (segment.shifted(checkpoint.offset) for segment in transcription)
+        if profiler is not None:
+            transcription = profiler.iterate(transcription)
+        # Echo every segment immediately on a terminal; let a redirected stdout buffer.
+        flush_echo = sys.stdout.isatty()
+        with self.create_writer(args) as writer:
+            checkpointer = self.create_checkpointer(args, checkpoint, writer)
+            for segment in transcription:
+                if not args.quiet:
+                    print(segment.text, end="", flush=flush_echo)
+                writer.write(segment)
+                if checkpointer is not None:
+                    checkpointer.update(segment.end)
+        if checkpointer is not None:
+            checkpointer.finish()
+        self.print_summary(args, stream, profiler)
+
+    def prepare_checkpoint(self, args: Namespace) -> TranscriptionCheckpoint:
+        """Validate the checkpoint options and, with ``--resume``, prepare the output to continue."""
+        if (args.checkpoint or args.resume) and (
+            args.audio_file == "-" or args.split_channels or args.format != OutputFormat.JSONL
+        ):
+            self.parser.error("--checkpoint and --resume require an audio file, jsonl output and no --split-channels")
+        if not args.resume:
+            return TranscriptionCheckpoint(audio_file=args.audio_file)
+        try:
+            checkpoint = resume_output(checkpoint_path(args.output_file), args.output_file, args.audio_file)
+        except CheckpointError as e:
+            self.parser.error(str(e))
+        if checkpoint.offset > 0.0:
+            print(f"resuming from {checkpoint.offset:.1f}s", file=sys.stderr)
+        return checkpoint
+
+    def create_stream(self, args: Namespace, checkpoint: TranscriptionCheckpoint) -> BaseStream:
+        if args.audio_file == "-":
+            if args.split_channels:
+                self.parser.error("--split-channels requires an audio file")
+            return MicrophoneStream(backpressure_policy=args.backpressure)
+        if os.path.splitext(args.audio_file)[1].lower() in PCM_FILE_EXTENSIONS:
+            if args.split_channels:
+                self.parser.error("--split-channels is not supported for raw PCM files, which are mono")
+            return PcmFileStream(path=args.audio_file, start=checkpoint.offset)
+        return FileStream(path=args.audio_file, start=checkpoint.offset, chunk_seconds=args.chunk_seconds)
+
+    def create_writer(self, args: Namespace) -> BaseSegmentWriter:
+        flush_policy = FlushPolicy(max_segments=args.flush_segments, max_seconds=args.flush_seconds)
+        return create_segment_writer(args.format, args.output_file, flush_policy=flush_policy, append=args.resume)
+
+    def create_checkpointer(
+        self, args: Namespace, checkpoint: TranscriptionCheckpoint, writer: BaseSegmentWriter
+    ) -> Checkpointer | None:
+        if not (args.checkpoint or args.resume):
+            return None
+        if not isinstance(writer, TextSegmentWriter):
+            self.parser.error(f"--checkpoint and --resume are not supported for {args.format.value} output")
+        return Checkpointer(checkpoint_path(args.output_file), checkpoint, writer, interval=args.checkpoint_interval)
+
+    def print_summary(self, args: Namespace, stream: BaseStream, profiler: TranscriptionProfiler | None) -> None:
+        """Report dropped audio, the profile and, with ``--metrics``, the pipeline metrics to stderr."""
+        if isinstance(stream, MicrophoneStream) and stream.dropped_frames > 0:
+            print(file=sys.stderr)
+            print(f"dropped {stream.dropped_seconds:.1f}s of audio because transcription fell behind", file=sys.stderr)
+        if profiler is not None and profiler.profiled:
+            print(file=sys.stderr)
+            print(f"profile written to {profiler.output_path}", file=sys.stderr)
+        if args.metrics:
+            print(file=sys.stderr)
+            print(json.dumps(pipeline_metrics.summary(), ensure_ascii=False, indent=2), file=sys.stderr)
@@ -1,7 +1,13 @@
 from argparse import ArgumentParser
 
 from ..core import SpeechToTextCore
-from ..settings import CliSettings, HttpApiSettings, InterfaceSettings
+from ..settings import (
+    CliSettings,
+    HttpApiSettings,
+    InterfaceSettings,
+    SocketApiSettings,
+    WatchFolderSettings,
+)
 from .base import BaseInterface
 from .cli import Cli
 
@@ -15,4 +21,12 @@ def create_interface(
         from .http_api import HttpApi
 
         return HttpApi(core=core, settings=settings)
+    if isinstance(settings, SocketApiSettings):
+        from .socket_api import SocketApi
+
+        return SocketApi(core=core, settings=settings)
+    if isinstance(settings, WatchFolderSettings):
+        from .watch_folder import WatchFolder
+
+        return WatchFolder(core=core, settings=settings)
     raise ValueError(f"Unsupported interface type: {settings.type}")
@@ -1,30 +1,146 @@
 import asyncio
+import json
 import os
 import queue as stdlib_queue
 import tempfile
+import threading
+from collections.abc import Generator, Mapping
+from concurrent.futures import Future
 from multiprocessing import Event as MPEvent
 from multiprocessing import Queue as MPQueue
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Literal, Set, Tuple
+
+from oltl import BaseModel
+from pydantic import field_validator
 
 try:
     import uvicorn
-    from fastapi import FastAPI, UploadFile, WebSocket, WebSocketDisconnect
+    from fastapi import (
+        FastAPI,
+        HTTPException,
+        Request,
+        UploadFile,
+        WebSocket,
+        WebSocketDisconnect,
+    )
+    from fastapi.responses import PlainTextResponse, Response
 except ImportError:
     raise ImportError(
         "fastapi and uvicorn are required for the HTTP API interface. " "Install them with: pip install ols2t[http]"
     )
 
-from ..core import SpeechToTextCore
-from ..models import BytesChunkStream, FileStream, Segment
+from ..core import SpeechToTextCore, iterate_in_executor
+from ..metrics import PipelineStage, Stopwatch, pipeline_metrics
+from ..models import (
+    BaseStream,
+    BytesChunkStream,
+    FileStream,
+    PcmChunkStream,
+    Segment,
+    SegmentMergingParameters,
+    TranscriptionContext,
+)
+from ..multiplexing import (
+    MultiplexFrameType,
+    SchedulerFullError,
+    TranscriptionScheduler,
+    decode_multiplex_frame,
+    put_nowait_with_backpressure,
+    put_unless_done,
+)
+from ..profiling import TranscriptionProfiler
 from ..settings import HttpApiSettings
+from ..speech_to_text_models.remote import RemoteSpeechToTextModel
+from ..types import PcmSampleFormat
 from .base import BaseInterface
 
+WORKER_CONFIG_ENVIRONMENT_VARIABLE = "OLS2T_HTTP_API_WORKER_CONFIG"
+DISCONNECT_POLL_INTERVAL = 0.5
+
+
+try:
+    import orjson
+except ImportError:
+    orjson = None  # type: ignore[assignment]
+
+
+def _dumps(payload: Any) -> str:
+    with Stopwatch() as stopwatch:
+        if orjson is not None:
+            serialized = orjson.dumps(payload).decode("utf-8")
+        else:
+            serialized = json.dumps(payload, ensure_ascii=False, separators=(",", ":"))
+    pipeline_metrics.observe_stage(PipelineStage.SERIALIZE, stopwatch.elapsed)
+    return serialized
+
+
+class AudioFormat(BaseModel):
+    """
+    Raw PCM format requested for ``/ws/transcribe``, by query parameters or a first text message.
+
+    >>> AudioFormat.model_validate({"format": "s16le", "sampling_rate": "16000"})
+    AudioFormat(format=<PcmSampleFormat.S16LE: 's16le'>, sampling_rate=16000)
+    >>> AudioFormat.model_validate_json('{"format": "s16le", "sampling_rate": [16000]}')
+    Traceback (most recent call last):
+        ...
+    pydantic_core._pydantic_core.ValidationError: 1 validation error for AudioFormat
+    ...
+    """
+
+    format: PcmSampleFormat | None = None
+    sampling_rate: Literal[16000] | None = None
+
+    @field_validator("sampling_rate", mode="before")
+    @classmethod
+    def _parse_query_parameter(cls, value: Any) -> Any:
+        # Query parameters are strings.
+        if isinstance(value, str) and value.isdigit():
+            return int(value)
+        return value
+
+
+async def _collect_batch(
+    segment_queue: "asyncio.Queue[Segment | None]", first: Segment, flush_interval: float
+) -> Tuple[List[Segment], bool]:
+    """
+    Gather ``first`` and every segment that is already queued or arrives within ``flush_interval`` seconds.
+
+    Segments reach the queue one at a time from the transcription thread, so little is ever queued in advance; it is
+    the interval that lets the segments of one decode step, which follow each other within milliseconds, share a frame.
+    Returns the batch and whether the end of the transcription was reached.
+    """
+    loop = asyncio.get_running_loop()
+    batch = [first]
+    deadline = loop.time() + flush_interval
+    while True:
+        try:
+            segment = segment_queue.get_nowait()
+        except asyncio.QueueEmpty:
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                return batch, False
+            try:
+                segment = await asyncio.wait_for(segment_queue.get(), remaining)
+            except asyncio.TimeoutError:
+                return batch, False
+        if segment is None:
+            return batch, True
+        batch.append(segment)
+
+
+async def _cancel_on_disconnect(request: Request, context: TranscriptionContext) -> None:
+    """Cancel ``context`` once the client of ``request`` has disconnected."""
+    while not await request.is_disconnected():
+        await asyncio.sleep(DISCONNECT_POLL_INTERVAL)
+    context.cancel()
+
 
 class HttpApi(BaseInterface):
     def __init__(self, core: SpeechToTextCore, settings: HttpApiSettings) -> None:
         super().__init__(core=core)
         self._settings = settings
-        self._app = self._create_app()
+        self._scheduler: TranscriptionScheduler | None = None
+        self._app: FastAPI | None = None
 
     @property
     def settings(self) -> HttpApiSettings:
@@ -32,14 +148,71 @@ class HttpApi(BaseInterface):
 
     @property
     def app(self) -> FastAPI:
+        # Built on first use: with several workers, the parent process only spawns the worker processes.
+        if self._app is None:
+            self._app = self._create_app()
         return self._app
 
+    @property
+    def scheduler(self) -> TranscriptionScheduler:
+        if self._scheduler is None:
+            self._scheduler = TranscriptionScheduler(
+                core=self.core,
+                max_workers=self.settings.multiplex_workers,
+                max_pending=self.settings.multiplex_max_pending_streams,
+            )
+        return self._scheduler
+
+    def _create_profiler(self, headers: Mapping[str, str]) -> TranscriptionProfiler | None:
+        if self.settings.profile_output_dir is None:
+            return None
+        requested = headers.get(self.settings.profile_header, "").lower() in ("1", "true", "yes")
+        if not (requested or self.settings.profile_all_requests):
+            return None
+        return TranscriptionProfiler(
+            output_dir=self.settings.profile_output_dir, request_id=headers.get("X-Request-ID")
+        )
+
+    def _create_context(self, query_params: Mapping[str, str]) -> TranscriptionContext:
+        """
+        Build the context of one request from its query parameters.
+
+        ``buffer_length``, ``margin`` and ``probability_threshold`` override the segment merging settings for this
+        request only. Invalid values raise ``ValueError``.
+        """
+        overrides = {name: query_params[name] for name in SegmentMergingParameters.model_fields if name in query_params}
+        return TranscriptionContext(segment_merging_parameters=SegmentMergingParameters.model_validate(overrides))
+
+    async def _negotiate_audio_format(self, websocket: WebSocket) -> Tuple[PcmSampleFormat | None, bytes | None]:
+        """
+        Decide how incoming audio is decoded.
+
+        Raw PCM is selected with ``?format=f32le|s16le`` or by a first text message such as ``{"format": "s16le"}``.
+        Otherwise the first binary message is returned so it can be fed to the container decoder.
+        """
+        query = {
+            name: websocket.query_params[name] for name in ("format", "sampling_rate") if name in websocket.query_params
+        }
+        audio_format = AudioFormat.model_validate(query)
+        if "format" not in query:
+            message = await websocket.receive()
+            if message["type"] == "websocket.disconnect":
+                raise WebSocketDisconnect(code=message.get("code", 1000))
+            if message.get("text") is None:
+                return None, message.get("bytes") or b""
+            audio_format = AudioFormat.model_validate_json(message["text"])
+        return audio_format.format, None
+
     def _create_app(self) -> FastAPI:
         app = FastAPI()
         core = self.core
 
         @app.post("/transcribe")
-        async def transcribe(file: UploadFile) -> List[Dict[str, Any]]:
+        async def transcribe(request: Request, file: UploadFile) -> Response:
+            try:
+                context = self._create_context(request.query_params)
+            except ValueError as e:
+                raise HTTPException(status_code=422, detail=str(e))
             content = await file.read()
             suffix = ""
             if file.filename:
@@ -51,64 +224,317 @@ class HttpApi(BaseInterface):
                 tmp_path = tmp.name
             try:
                 stream = FileStream(path=tmp_path)
+                profiler = self._create_profiler(request.headers)
+                transcription = core.transcribe(input_stream=stream, context=context)
+                if profiler is not None:
+                    transcription = profiler.iterate(transcription)
                 loop = asyncio.get_event_loop()
-                segments: List[Segment] = await loop.run_in_executor(
-                    None, lambda: list(core.transcribe(input_stream=stream))
+                watcher = asyncio.ensure_future(_cancel_on_disconnect(request, context))
+                try:
+                    segments: List[Segment] = await loop.run_in_executor(None, list, transcription)
+                finally:
+                    watcher.cancel()
+                if context.cancelled:
+                    return Response(status_code=499)
+                # Another request holding the profiler means this one ran unprofiled and has no pstats file.
+                headers = {"X-Request-ID": profiler.request_id} if profiler is not None and profiler.profiled else {}
+                return Response(
+                    content=_dumps([s.model_dump() for s in segments]), media_type="application/json", headers=headers
                 )
-                return [s.model_dump() for s in segments]
             finally:
                 os.unlink(tmp_path)
 
         @app.websocket("/ws/transcribe")
         async def ws_transcribe(websocket: WebSocket) -> None:
             await websocket.accept()
-            chunk_queue: "MPQueue[bytes]" = MPQueue(maxsize=256)
-            stop_event = MPEvent()
-            stream = BytesChunkStream(chunk_queue=chunk_queue, stop_event=stop_event)
+            try:
+                context = self._create_context(websocket.query_params)
+                sample_format, first_chunk = await self._negotiate_audio_format(websocket)
+            except WebSocketDisconnect:
+                return
+            except ValueError as e:
+                await websocket.send_json({"error": str(e)})
+                await websocket.close(code=1003)
+                return
+
+            stream: BaseStream
+            loop = asyncio.get_event_loop()
+            if sample_format is None:
+                chunk_queue: "MPQueue[bytes | None]" = MPQueue(maxsize=256)
+                stop_event = MPEvent()
+                stream = BytesChunkStream(chunk_queue=chunk_queue, stop_event=stop_event)
+
+                async def feed(data: bytes) -> None:
+                    chunk_queue.put(data, block=True, timeout=5.0)
+
+                async def finish() -> None:
+                    try:
+                        chunk_queue.put_nowait(None)
+                    except stdlib_queue.Full:
+                        stop_event.set()
+
+            else:
+                pcm_queue: "stdlib_queue.Queue[bytes | None]" = stdlib_queue.Queue(maxsize=256)
+                pcm_stop_event = threading.Event()
+                stream = PcmChunkStream(chunk_queue=pcm_queue, sample_format=sample_format, stop_event=pcm_stop_event)
+
+                async def feed(data: bytes) -> None:
+                    try:
+                        pcm_queue.put_nowait(data)
+                    except stdlib_queue.Full:
+                        await loop.run_in_executor(None, pcm_queue.put, data, True, 5.0)
+
+                async def finish() -> None:
+                    # The stream ends once the queued audio is consumed, even if the end marker does not fit.
+                    pcm_stop_event.set()
+                    try:
+                        pcm_queue.put_nowait(None)
+                    except stdlib_queue.Full:
+                        pass
 
-            seg_q: stdlib_queue.Queue[Segment | None] = stdlib_queue.Queue()
+            profiler = self._create_profiler(websocket.headers)
 
-            def _transcribe() -> None:
+            def transcribe() -> Generator[Segment, None, None]:
+                transcription = core.transcribe(input_stream=stream, context=context)
+                if profiler is not None:
+                    transcription = profiler.iterate(transcription)
+                yield from transcription
+
+            segment_queue: asyncio.Queue[Segment | None] = asyncio.Queue()
+
+            async def pump_segments() -> None:
                 try:
-                    for segment in core.transcribe(input_stream=stream):
-                        seg_q.put(segment)
+                    async for segment in iterate_in_executor(transcribe()):
+                        segment_queue.put_nowait(segment)
                 finally:
-                    seg_q.put(None)
+                    segment_queue.put_nowait(None)
 
-            loop = asyncio.get_event_loop()
-            transcribe_future = loop.run_in_executor(None, _transcribe)
+            pump = asyncio.ensure_future(pump_segments())
 
             async def receive_audio() -> None:
                 try:
-                    while True:
+                    data = first_chunk if first_chunk is not None else await websocket.receive_bytes()
+                    while len(data) > 0:
+                        await feed(data)
                         data = await websocket.receive_bytes()
-                        if len(data) == 0:
-                            break
-                        chunk_queue.put(data, block=True, timeout=5.0)
                 except WebSocketDisconnect:
-                    pass
+                    context.cancel()
                 finally:
-                    stop_event.set()
+                    await finish()
+
+            batch = websocket.query_params.get("batch", str(self.settings.websocket_batch_segments)).lower() in (
+                "1",
+                "true",
+                "yes",
+            )
 
             async def send_segments() -> None:
-                while True:
-                    try:
-                        segment = await loop.run_in_executor(None, seg_q.get, True, 1.0)
-                    except stdlib_queue.Empty:
-                        continue
+                finished = False
+                while not finished:
+                    segment = await segment_queue.get()
                     if segment is None:
                         break
-                    await websocket.send_json(segment.model_dump())
+                    if not batch:
+                        await websocket.send_text(_dumps(segment.model_dump()))
+                        continue
+                    segments, finished = await _collect_batch(
+                        segment_queue, segment, self.settings.websocket_flush_interval
+                    )
+                    await websocket.send_text(_dumps({"segments": [s.model_dump() for s in segments]}))
                 await websocket.send_json({"done": True})
 
             try:
                 await asyncio.gather(receive_audio(), send_segments())
             except Exception:
-                stop_event.set()
+                context.cancel()
+                await finish()
             finally:
-                await transcribe_future
+                await pump
+
+        @app.websocket("/ws/transcribe/multiplex")
+        async def ws_transcribe_multiplex(websocket: WebSocket) -> None:
+            """
+            Many audio streams over one socket.
+
+            Binary frames carry a 5 byte header (stream ID as uint32 LE, frame type 0 = audio / 1 = end) followed by
+            raw PCM in the format given by ``?format=``. Results are JSON objects tagged with ``stream_id``.
+            An empty binary frame closes the connection after all streams have finished.
+
+            Streams share the scheduler with every other connection. A stream that has to wait for a free worker is
+            announced with ``{"stream_id": ..., "queued": true}``; once the wait list is full, new streams get an
+            ``error`` and their frames are ignored until their end frame. Each stream buffers at most
+            ``multiplex_queue_size`` frames, and ``multiplex_backpressure`` decides what happens to more.
+            """
+            await websocket.accept()
+            try:
+                sample_format = PcmSampleFormat(websocket.query_params.get("format", PcmSampleFormat.F32LE))
+            except ValueError as e:
+                await websocket.send_json({"error": str(e)})
+                await websocket.close(code=1003)
+                return
+            loop = asyncio.get_event_loop()
+            results: asyncio.Queue[Dict[str, Any] | None] = asyncio.Queue()
+            streams: Dict[int, Tuple["stdlib_queue.Queue[bytes | None]", "Future[None]"]] = {}
+            rejected: Set[int] = set()
+            jobs: List[asyncio.Future[None]] = []
+            closers: List[asyncio.Future[None]] = []
+            contexts: List[TranscriptionContext] = []
+
+            def open_stream(stream_id: int) -> Tuple["stdlib_queue.Queue[bytes | None]", "Future[None]"]:
+                pcm_queue: "stdlib_queue.Queue[bytes | None]" = stdlib_queue.Queue(
+                    maxsize=self.settings.multiplex_queue_size
+                )
+                stream = PcmChunkStream(chunk_queue=pcm_queue, sample_format=sample_format)
+                context = TranscriptionContext()
+
+                def on_segment(segment: Segment) -> None:
+                    loop.call_soon_threadsafe(results.put_nowait, {"stream_id": stream_id, **segment.model_dump()})
+
+                def on_done(future: asyncio.Future[None]) -> None:
+                    error = None if future.cancelled() else future.exception()
+                    message: Dict[str, Any] = {"stream_id": stream_id, "done": True}
+                    if error is not None:
+                        message["error"] = repr(error)
+                    results.put_nowait(message)
+
+                future = self.scheduler.submit(stream, on_segment, context=context)
+                contexts.append(context)
+                job = asyncio.wrap_future(future)
+                job.add_done_callback(on_done)
+                jobs.append(job)
+                return pcm_queue, future
+
+            async def feed(pcm_queue: "stdlib_queue.Queue[bytes | None]", future: "Future[None]", data: bytes) -> None:
+                try:
+                    dropped = put_nowait_with_backpressure(pcm_queue, data, self.settings.multiplex_backpressure)
+                except stdlib_queue.Full:
+                    # BLOCK stops reading the socket, which holds back every stream of this connection.
+                    await loop.run_in_executor(None, put_unless_done, pcm_queue, data, future)
+                    return
+                if dropped is not None:
+                    pipeline_metrics.count_dropped_audio("multiplex", len(dropped) / sample_format.sample_width / 16000)
+
+            async def close_stream(pcm_queue: "stdlib_queue.Queue[bytes | None]", future: "Future[None]") -> None:
+                # The end of a stream is never dropped; wait in the background for room if the queue is full.
+                try:
+                    pcm_queue.put_nowait(None)
+                except stdlib_queue.Full:
+                    await loop.run_in_executor(None, put_unless_done, pcm_queue, None, future)
+
+            async def receive_audio() -> None:
+                try:
+                    while True:
+                        frame = await websocket.receive_bytes()
+                        if len(frame) == 0:
+                            break
+                        try:
+                            stream_id, frame_type, payload = decode_multiplex_frame(frame)
+                        except ValueError as e:
+                            await results.put({"error": str(e)})
+                            continue
+                        if stream_id in rejected:
+                            if frame_type == MultiplexFrameType.END:
+                                rejected.discard(stream_id)
+                            continue
+                        entry = streams.get(stream_id)
+                        if entry is None:
+                            if len(streams) >= self.settings.multiplex_max_streams_per_connection:
+                                await results.put({"stream_id": stream_id, "error": "Too many streams"})
+                                if frame_type != MultiplexFrameType.END:
+                                    rejected.add(stream_id)
+                                continue
+                            queued = self.scheduler.active >= self.scheduler.max_workers
+                            try:
+                                entry = streams[stream_id] = open_stream(stream_id)
+                            except SchedulerFullError as e:
+                                await results.put({"stream_id": stream_id, "error": str(e)})
+                                if frame_type != MultiplexFrameType.END:
+                                    rejected.add(stream_id)
+                                continue
+                            if queued:
+                                await results.put({"stream_id": stream_id, "queued": True})
+                        pcm_queue, future = entry
+                        if frame_type == MultiplexFrameType.END:
+                            closers.append(asyncio.ensure_future(close_stream(pcm_queue, future)))
+                            del streams[stream_id]
+                        elif len(payload) > 0:
+                            await feed(pcm_queue, future, bytes(payload))
+                except WebSocketDisconnect:
+                    for context in contexts:
+                        context.cancel()
+                    for _, future in streams.values():
+                        future.cancel()
+                finally:
+                    for pcm_queue, future in streams.values():
+                        closers.append(asyncio.ensure_future(close_stream(pcm_queue, future)))
+                    streams.clear()
+                    await asyncio.gather(*closers, return_exceptions=True)
+                    await asyncio.gather(*jobs, return_exceptions=True)
+                    # Done callbacks run on the next loop iteration; let them enqueue before the final sentinel.
+                    await asyncio.sleep(0)
+                    await results.put(None)
+
+            async def send_results() -> None:
+                while (message := await results.get()) is not None:
+                    await websocket.send_text(_dumps(message))
+                await websocket.send_json({"done": True})
+
+            try:
+                await asyncio.gather(receive_audio(), send_results())
+            except Exception:
+                for context in contexts:
+                    context.cancel()
+                for pcm_queue, future in streams.values():
+                    future.cancel()
+                    closers.append(asyncio.ensure_future(close_stream(pcm_queue, future)))
+
+        @app.get("/metrics")
+        async def metrics() -> PlainTextResponse:
+            """Metrics of the process serving the request; with several workers, scrape each worker."""
+            return PlainTextResponse(pipeline_metrics.to_prometheus(), media_type="text/plain; version=0.0.4")
 
         return app
 
     def run(self) -> None:
-        uvicorn.run(self.app, host=self._settings.host, port=self._settings.port)
+        """
+        Serve the API. With ``workers`` greater than one, uvicorn spawns that many processes running
+        :func:`create_worker_app` and this process builds no app of its own. Metrics are kept per process, so
+        ``/metrics`` then reports only the worker that happens to serve the scrape.
+        """
+        if self.settings.workers <= 1:
+            with self.core:
+                uvicorn.run(self.app, host=self._settings.host, port=self._settings.port)
+            return
+        model = self.core.model
+        if not isinstance(model, RemoteSpeechToTextModel):
+            raise ValueError(
+                "HttpApi with more than one worker requires a REMOTE speech-to-text model, "
+                "so that model weights are loaded once by the model servers instead of by every worker"
+            )
+        os.environ[WORKER_CONFIG_ENVIRONMENT_VARIABLE] = json.dumps(
+            {
+                "http_api_settings": self.settings.model_dump(mode="json"),
+                "addresses": model.addresses,
+                "timeout": model.timeout,
+            }
+        )
+        uvicorn.run(
+            f"{__name__}:create_worker_app",
+            factory=True,
+            workers=self.settings.workers,
+            host=self._settings.host,
+            port=self._settings.port,
+        )
+
+
+def create_worker_app() -> FastAPI:
+    """
+    Application factory run by every uvicorn worker process when ``HttpApiSettings.workers`` is greater than one.
+
+    Workers only parse requests and encode responses; transcription is forwarded to the model servers listed in the
+    configuration that :meth:`HttpApi.run` passes through the environment.
+    """
+    config = json.loads(os.environ[WORKER_CONFIG_ENVIRONMENT_VARIABLE])
+    model = RemoteSpeechToTextModel(addresses=config["addresses"], timeout=config["timeout"])
+    settings = HttpApiSettings.model_validate(config["http_api_settings"])
+    return HttpApi(core=SpeechToTextCore(model=model), settings=settings).app
@@ -0,0 +1,139 @@
+import asyncio
+import os
+import queue as stdlib_queue
+import socket
+
+from ..core import SpeechToTextCore
+from ..models import PcmChunkStream, Segment, TranscriptionContext
+from ..multiplexing import SchedulerFullError, TranscriptionScheduler, put_unless_done
+from ..settings import SocketApiSettings
+from ..socket_protocol import (
+    FrameType,
+    SocketProtocolError,
+    decode_config,
+    decode_context,
+    encode_frame,
+    encode_segment,
+    read_frame,
+)
+from ..types import PcmSampleFormat
+from .base import BaseInterface
+
+
+class SocketApi(BaseInterface):
+    """
+    Streams raw PCM in and compact binary segment records out over a TCP or Unix domain socket.
+
+    See :class:`ols2t.socket_protocol.FrameType` for the framing and :class:`ols2t.socket_protocol.SocketApiClient`
+    for a client. At most ``max_workers`` transcriptions run at once and ``max_pending_clients`` more may wait for a
+    worker; a client starting a transcription beyond that gets an ``ERROR`` frame and is disconnected.
+    """
+
+    def __init__(self, core: SpeechToTextCore, settings: SocketApiSettings) -> None:
+        super(SocketApi, self).__init__(core=core)
+        self._settings = settings
+        self._scheduler = TranscriptionScheduler(
+            core=core, max_workers=settings.max_workers, max_pending=settings.max_pending_clients
+        )
+
+    @property
+    def settings(self) -> SocketApiSettings:
+        return self._settings
+
+    @property
+    def scheduler(self) -> TranscriptionScheduler:
+        return self._scheduler
+
+    async def start_server(self) -> asyncio.Server:
+        if self.settings.unix_socket_path is not None:
+            if os.path.exists(self.settings.unix_socket_path):
+                os.unlink(self.settings.unix_socket_path)
+            return await asyncio.start_unix_server(self.handle_connection, path=self.settings.unix_socket_path)
+        return await asyncio.start_server(self.handle_connection, host=self.settings.host, port=self.settings.port)
+
+    async def handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        sock = writer.get_extra_info("socket")
+        if sock is not None and sock.family in (socket.AF_INET, socket.AF_INET6):
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        try:
+            while await self._transcribe_session(reader, writer):
+                pass
+        except SocketProtocolError as e:
+            writer.write(encode_frame(FrameType.ERROR, str(e).encode("utf-8")))
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except ConnectionError:
+                pass
+
+    async def _transcribe_session(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> bool:
+        """Serve one transcription. Returns ``False`` when the client closed the connection before starting one."""
+        frame = await read_frame(reader)
+        if frame is None:
+            return False
+        sample_format = PcmSampleFormat.F32LE
+        context = TranscriptionContext()
+        while frame is not None and frame[0] in (FrameType.CONFIG, FrameType.CONTEXT):
+            frame_type, payload = frame
+            if frame_type == FrameType.CONFIG:
+                sample_format, sampling_rate = decode_config(payload)
+                if sampling_rate != 16000:
+                    raise SocketProtocolError(f"Unsupported sampling rate: {sampling_rate}. Only 16000 is supported")
+            else:
+                context = decode_context(payload)
+            frame = await read_frame(reader)
+        loop = asyncio.get_event_loop()
+        pcm_queue: "stdlib_queue.Queue[bytes | None]" = stdlib_queue.Queue(maxsize=256)
+        stream = PcmChunkStream(chunk_queue=pcm_queue, sample_format=sample_format)
+
+        def on_segment(segment: Segment) -> None:
+            loop.call_soon_threadsafe(writer.write, encode_frame(FrameType.SEGMENT, encode_segment(segment)))
+
+        try:
+            future = self.scheduler.submit(stream, on_segment, context=context)
+        except SchedulerFullError as e:
+            raise SocketProtocolError(f"Server is at capacity: {e}")
+        try:
+            while True:
+                if frame is None:
+                    frame = await read_frame(reader)
+                    if frame is None:
+                        raise SocketProtocolError("Connection closed before END")
+                frame_type, payload = frame
+                frame = None
+                if frame_type == FrameType.END:
+                    break
+                if frame_type != FrameType.AUDIO:
+                    raise SocketProtocolError(f"Unexpected frame from the client: {frame_type.name}")
+                try:
+                    pcm_queue.put_nowait(payload)
+                except stdlib_queue.Full:
+                    await loop.run_in_executor(None, put_unless_done, pcm_queue, payload, future)
+                await writer.drain()
+        except BaseException:
+            # The client is gone or broke the protocol; nobody will read the rest of this transcription.
+            context.cancel()
+            raise
+        finally:
+            await loop.run_in_executor(None, put_unless_done, pcm_queue, None, future)
+        try:
+            await asyncio.wrap_future(future)
+        except Exception as e:
+            writer.write(encode_frame(FrameType.ERROR, repr(e).encode("utf-8")))
+            await writer.drain()
+            return False
+        writer.write(encode_frame(FrameType.DONE))
+        await writer.drain()
+        return True
+
+    async def serve_forever(self) -> None:
+        server = await self.start_server()
+        async with server:
+            await server.serve_forever()
+
+    def run(self) -> None:
+        with self.core:
+            asyncio.run(self.serve_forever())
@@ -0,0 +1,121 @@
+import fnmatch
+import os
+import sys
+import threading
+import time
+import traceback
+from concurrent.futures import Future, ThreadPoolExecutor
+from functools import partial
+from typing import Dict, List, Set, Tuple
+
+from ..checkpointing import write_atomically
+from ..core import SpeechToTextCore
+from ..models import FileStream
+from ..settings import WatchFolderSettings
+from .base import BaseInterface
+
+
+class WatchFolder(BaseInterface):
+    """
+    Transcribes audio files dropped into a spool directory, keeping the model loaded between files.
+
+    The directory is polled every ``poll_interval`` seconds. A file is picked up once its size and modification time
+    have not changed for ``stable_seconds``. Its segments are written as JSON lines to ``<file><output_suffix>``
+    next to it, atomically, so an output file only exists for a finished transcription. Files with an output or an
+    ``<file><error_suffix>`` file are skipped, which makes restarts resume where the previous run stopped.
+    """
+
+    def __init__(self, core: SpeechToTextCore, settings: WatchFolderSettings) -> None:
+        super(WatchFolder, self).__init__(core=core)
+        self._settings = settings
+        self._observed: Dict[str, Tuple[int, int, float]] = {}
+        self._in_progress: Set[str] = set()
+        self._lock = threading.Lock()
+        self._stop_event = threading.Event()
+
+    @property
+    def settings(self) -> WatchFolderSettings:
+        return self._settings
+
+    def output_path(self, path: str) -> str:
+        return path + self.settings.output_suffix
+
+    def error_path(self, path: str) -> str:
+        return path + self.settings.error_suffix
+
+    def is_finished(self, path: str) -> bool:
+        return os.path.exists(self.output_path(path)) or os.path.exists(self.error_path(path))
+
+    def scan(self, now: float | None = None) -> List[str]:
+        """Return the files that are ready to be transcribed, oldest first."""
+        now = time.monotonic() if now is None else now
+        candidates: List[Tuple[int, str]] = []
+        seen: Set[str] = set()
+        with os.scandir(self.settings.input_dir) as entries:
+            for entry in entries:
+                if entry.name.startswith(".") or not entry.is_file():
+                    continue
+                if not any(fnmatch.fnmatch(entry.name, pattern) for pattern in self.settings.patterns):
+                    continue
+                path = entry.path
+                seen.add(path)
+                stat = entry.stat()
+                # _release forgets a file from a worker thread, so the bookkeeping is shared with it.
+                with self._lock:
+                    if path in self._in_progress or self.is_finished(path):
+                        continue
+                    previous = self._observed.get(path)
+                    if previous is None or previous[:2] != (stat.st_size, stat.st_mtime_ns):
+                        self._observed[path] = (stat.st_size, stat.st_mtime_ns, now)
+                        continue
+                if now - previous[2] >= self.settings.stable_seconds:
+                    candidates.append((stat.st_mtime_ns, path))
+        with self._lock:
+            for path in [path for path in self._observed if path not in seen]:
+                del self._observed[path]
+        return [path for _, path in sorted(candidates)]
+
+    def process(self, path: str) -> None:
+        try:
+            lines = [
+                segment.model_dump_json() + "\n" for segment in self.core.transcribe(input_stream=FileStream(path=path))
+            ]
+        except Exception:
+            write_atomically(self.error_path(path), [traceback.format_exc()])
+            print(f"failed to transcribe {path}; see {self.error_path(path)}", file=sys.stderr)
+            return
+        write_atomically(self.output_path(path), lines)
+
+    def _release(self, path: str, future: "Future[None]") -> None:
+        # A file whose output could not be written is retried on a later poll.
+        with self._lock:
+            self._in_progress.discard(path)
+            self._observed.pop(path, None)
+
+    def poll_once(self, executor: ThreadPoolExecutor) -> List["Future[None]"]:
+        """Submit every ready file, without queueing more than the pool can start right away."""
+        futures = []
+        for path in self.scan():
+            with self._lock:
+                if len(self._in_progress) >= self.settings.max_workers:
+                    break
+                self._in_progress.add(path)
+            future = executor.submit(self.process, path)
+            future.add_done_callback(partial(self._release, path))
+            futures.append(future)
+        return futures
+
+    def stop(self) -> None:
+        self._stop_event.set()
+
+    def run(self) -> None:
+        with (
+            self.core,
+            ThreadPoolExecutor(max_workers=self.settings.max_workers, thread_name_prefix="ols2t-watch") as executor,
+        ):
+            try:
+                while not self._stop_event.is_set():
+                    self.poll_once(executor)
+                    self._stop_event.wait(self.settings.poll_interval)
+            except KeyboardInterrupt:
+                pass
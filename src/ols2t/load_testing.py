@@ -0,0 +1,265 @@
+import asyncio
+import json
+import os
+import socket
+import sys
+import threading
+import time
+from argparse import ArgumentParser, Namespace
+from collections.abc import Generator, Sequence
+from contextlib import contextmanager
+from enum import Enum
+from typing import Any, Dict, List
+
+import numpy as np
+
+try:
+    import httpx
+    import uvicorn
+    import websockets
+except ImportError:
+    raise ImportError(
+        "httpx, uvicorn and websockets are required for load testing. " "Install them with: pip install ols2t[loadtest]"
+    )
+
+from oltl import BaseModel
+
+from .core import SpeechToTextCore
+from .settings import HttpApiSettings
+from .speech_to_text_models.stub import StubSpeechToTextModel
+
+
+class LoadTestEndpoint(str, Enum):
+    TRANSCRIBE = "transcribe"
+    WS_TRANSCRIBE = "ws_transcribe"
+
+
+class RequestResult(BaseModel):
+    """Timing of a single request. ``time_to_first_segment`` is ``None`` when no segment was received."""
+
+    latency: float
+    time_to_first_segment: float | None
+    segments: int
+    error: str | None = None
+
+
+class LoadTestConfig(BaseModel):
+    url: str
+    endpoint: LoadTestEndpoint
+    audio_path: str
+    audio_seconds: float
+    concurrency: int = 1
+    requests_per_client: int = 1
+    speed: float = 1.0
+    chunk_bytes: int = 16384
+
+
+def percentiles(values: Sequence[float]) -> Dict[str, float | None]:
+    """
+    >>> percentiles([1.0, 2.0, 3.0, 4.0])
+    {'p50': 2.5, 'p95': 3.85, 'p99': 3.97}
+    >>> percentiles([])
+    {'p50': None, 'p95': None, 'p99': None}
+    """
+    if len(values) == 0:
+        return {"p50": None, "p95": None, "p99": None}
+    p50, p95, p99 = np.percentile(np.asarray(values, dtype=np.float64), [50, 95, 99])
+    return {"p50": round(float(p50), 6), "p95": round(float(p95), 6), "p99": round(float(p99), 6)}
+
+
+def summarize(config: LoadTestConfig, results: List[RequestResult], elapsed: float) -> Dict[str, Any]:
+    succeeded = [r for r in results if r.error is None]
+    errors: Dict[str, int] = {}
+    for r in results:
+        if r.error is not None:
+            errors[r.error] = errors.get(r.error, 0) + 1
+    return {
+        "config": config.model_dump(mode="json"),
+        "requests": len(results),
+        "succeeded": len(succeeded),
+        "error_rate": (len(results) - len(succeeded)) / len(results) if results else 0.0,
+        "errors": errors,
+        "elapsed_seconds": elapsed,
+        "throughput_requests_per_second": len(succeeded) / elapsed if elapsed > 0 else 0.0,
+        "throughput_audio_seconds_per_second": len(succeeded) * config.audio_seconds / elapsed if elapsed > 0 else 0.0,
+        "latency_seconds": percentiles([r.latency for r in succeeded]),
+        "time_to_first_segment_seconds": percentiles(
+            [r.time_to_first_segment for r in succeeded if r.time_to_first_segment is not None]
+        ),
+    }
+
+
+def _chunks(data: bytes, size: int) -> List[bytes]:
+    return [data[i : i + size] for i in range(0, len(data), size)]
+
+
+async def _post_transcribe(client: httpx.AsyncClient, config: LoadTestConfig, audio: bytes) -> RequestResult:
+    started = time.perf_counter()
+    try:
+        response = await client.post(
+            "/transcribe", files={"file": (os.path.basename(config.audio_path), audio, "application/octet-stream")}
+        )
+        response.raise_for_status()
+        latency = time.perf_counter() - started
+        segments = len(response.json())
+        return RequestResult(
+            latency=latency,
+            time_to_first_segment=latency if segments > 0 else None,
+            segments=segments,
+        )
+    except Exception as e:
+        return RequestResult(
+            latency=time.perf_counter() - started, time_to_first_segment=None, segments=0, error=repr(e)
+        )
+
+
+async def _ws_transcribe(config: LoadTestConfig, audio: bytes) -> RequestResult:
+    chunks = _chunks(audio, config.chunk_bytes)
+    interval = config.audio_seconds / len(chunks) / config.speed if config.speed > 0 and chunks else 0.0
+    url = config.url.replace("http://", "ws://", 1).replace("https://", "wss://", 1).rstrip("/") + "/ws/transcribe"
+    started = time.perf_counter()
+    time_to_first_segment: float | None = None
+    segments = 0
+    try:
+        async with websockets.connect(url, max_size=None) as ws:
+
+            async def send() -> None:
+                for i, chunk in enumerate(chunks):
+                    delay = started + i * interval - time.perf_counter()
+                    if delay > 0:
+                        await asyncio.sleep(delay)
+                    await ws.send(chunk)
+                await ws.send(b"")
+
+            sender = asyncio.create_task(send())
+            try:
+                async for message in ws:
+                    data = json.loads(message)
+                    if "done" in data:
+                        break
+                    if time_to_first_segment is None:
+                        time_to_first_segment = time.perf_counter() - started
+                    segments += 1
+            finally:
+                sender.cancel()
+                await asyncio.gather(sender, return_exceptions=True)
+        return RequestResult(
+            latency=time.perf_counter() - started,
+            time_to_first_segment=time_to_first_segment,
+            segments=segments,
+        )
+    except Exception as e:
+        return RequestResult(
+            latency=time.perf_counter() - started,
+            time_to_first_segment=time_to_first_segment,
+            segments=segments,
+            error=repr(e),
+        )
+
+
+async def run_load_test(config: LoadTestConfig) -> Dict[str, Any]:
+    with open(config.audio_path, "rb") as f:
+        audio = f.read()
+    results: List[RequestResult] = []
+    async with httpx.AsyncClient(base_url=config.url, timeout=None) as client:
+
+        async def run_client() -> None:
+            for _ in range(config.requests_per_client):
+                if config.endpoint == LoadTestEndpoint.TRANSCRIBE:
+                    results.append(await _post_transcribe(client, config, audio))
+                else:
+                    results.append(await _ws_transcribe(config, audio))
+
+        started = time.perf_counter()
+        await asyncio.gather(*(run_client() for _ in range(config.concurrency)))
+        elapsed = time.perf_counter() - started
+    return summarize(config, results, elapsed)
+
+
+def _free_port() -> int:
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
+        s.bind(("127.0.0.1", 0))
+        port: int = s.getsockname()[1]
+        return port
+
+
+@contextmanager
+def serve_stub_http_api(delay: float = 0.0, real_time_factor: float = 0.0) -> Generator[str, None, None]:
+    """Run an HttpApi backed by :class:`StubSpeechToTextModel` on a free local port and yield its base URL."""
+    from .interfaces.http_api import HttpApi
+
+    port = _free_port()
+    core = SpeechToTextCore(model=StubSpeechToTextModel(delay=delay, real_time_factor=real_time_factor))
+    http_api = HttpApi(core=core, settings=HttpApiSettings(host="127.0.0.1", port=port))
+    server = uvicorn.Server(uvicorn.Config(http_api.app, host="127.0.0.1", port=port, log_level="warning"))
+    thread = threading.Thread(target=server.run, daemon=True)
+    thread.start()
+    try:
+        while not server.started:
+            if not thread.is_alive():
+                raise RuntimeError("Stub HTTP API server failed to start")
+            time.sleep(0.01)
+        yield f"http://127.0.0.1:{port}"
+    finally:
+        server.should_exit = True
+        thread.join()
+
+
+def audio_duration(path: str) -> float:
+    from faster_whisper.audio import decode_audio
+
+    with open(path, "rb") as f:
+        return len(decode_audio(f, sampling_rate=16000)) / 16000
+
+
+def parse_args(argv: Sequence[str] | None = None) -> Namespace:
+    parser = ArgumentParser(prog="ols2t-loadtest", description="Load generator for the ols2t HTTP API")
+    parser.add_argument("audio", help="Audio file sent by every request")
+    parser.add_argument("--url", help="Base URL of a running HttpApi. Without it, a stub-model server is started")
+    parser.add_argument("--endpoint", type=LoadTestEndpoint, default=LoadTestEndpoint.WS_TRANSCRIBE)
+    parser.add_argument("--concurrency", type=int, default=1, help="Number of concurrent clients")
+    parser.add_argument("--requests-per-client", type=int, default=1)
+    parser.add_argument(
+        "--speed", type=float, default=1.0, help="Websocket audio pacing relative to real time; 0 sends at once"
+    )
+    parser.add_argument("--chunk-bytes", type=int, default=16384, help="Websocket message size")
+    parser.add_argument("--stub-delay", type=float, default=0.0, help="Per-chunk delay of the stub model")
+    parser.add_argument("--stub-real-time-factor", type=float, default=0.0, help="Stub model time per audio second")
+    parser.add_argument("--output", help="Write the JSON report to this file instead of stdout")
+    return parser.parse_args(argv)
+
+
+def main(argv: Sequence[str] | None = None) -> None:
+    args = parse_args(argv)
+
+    def run(url: str) -> Dict[str, Any]:
+        config = LoadTestConfig(
+            url=url,
+            endpoint=args.endpoint,
+            audio_path=args.audio,
+            audio_seconds=audio_duration(args.audio),
+            concurrency=args.concurrency,
+            requests_per_client=args.requests_per_client,
+            speed=args.speed,
+            chunk_bytes=args.chunk_bytes,
+        )
+        return asyncio.run(run_load_test(config))
+
+    if args.url is None:
+        with serve_stub_http_api(delay=args.stub_delay, real_time_factor=args.stub_real_time_factor) as url:
+            report = run(url)
+    else:
+        report = run(args.url)
+    output = json.dumps(report, ensure_ascii=False, indent=2)
+    if args.output is None:
+        print(output)
+    else:
+        with open(args.output, "w", encoding="utf-8") as fout:
+            fout.write(output)
+            fout.write("\n")
+    if report["error_rate"] > 0:
+        print(f"{report['requests'] - report['succeeded']} request(s) failed", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
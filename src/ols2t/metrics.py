@@ -0,0 +1,390 @@
+import time
+from collections.abc import Generator, Iterable, Sequence
+from enum import Enum
+from threading import Lock
+from types import TracebackType
+from typing import Any, Callable, Dict, Generic, List, Tuple, Type, TypeAlias, TypeVar
+
+T = TypeVar("T")
+
+LabelValues: TypeAlias = Tuple[Tuple[str, str], ...]
+
+DEFAULT_DURATION_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+DEFAULT_CHUNK_SAMPLE_BUCKETS = (256, 1024, 4096, 8000, 16000, 32000, 64000, 160000, 480000, 960000)
+DEFAULT_QUEUE_WAIT_BUCKETS = (0.0001, 0.001, 0.01, 0.1, 0.5, 1.0, 2.5, 5.0)
+
+
+class PipelineStage(str, Enum):
+    DECODE_AUDIO = "decode_audio"
+    QUEUE_WAIT = "queue_wait"
+    MODEL_TRANSCRIBE = "model_transcribe"
+    MERGE_SEGMENTS = "merge_segments"
+    SERIALIZE = "serialize"
+
+
+class MetricType(str, Enum):
+    COUNTER = "counter"
+    GAUGE = "gauge"
+    HISTOGRAM = "histogram"
+
+
+class Counter:
+    """
+    A monotonically increasing value.
+
+    >>> c = Counter()
+    >>> c.inc()
+    >>> c.inc(2.5)
+    >>> c.value
+    3.5
+    """
+
+    def __init__(self) -> None:
+        self._value = 0.0
+        self._lock = Lock()
+
+    @property
+    def value(self) -> float:
+        return self._value
+
+    def inc(self, amount: float = 1.0) -> None:
+        with self._lock:
+            self._value += amount
+
+
+class Gauge:
+    """
+    A value that can go up and down. The largest value ever set is kept as well.
+
+    >>> g = Gauge()
+    >>> g.set(3)
+    >>> g.set(1)
+    >>> g.value, g.max_value
+    (1.0, 3.0)
+    """
+
+    def __init__(self) -> None:
+        self._value = 0.0
+        self._max_value = 0.0
+        self._lock = Lock()
+
+    @property
+    def value(self) -> float:
+        return self._value
+
+    @property
+    def max_value(self) -> float:
+        return self._max_value
+
+    def set(self, value: float) -> None:
+        with self._lock:
+            self._value = float(value)
+            self._max_value = max(self._max_value, self._value)
+
+
+class Histogram:
+    """
+    Observations counted into cumulative buckets, Prometheus style.
+
+    >>> h = Histogram(buckets=(1.0, 2.0))
+    >>> for v in (0.5, 1.5, 3.0):
+    ...     h.observe(v)
+    >>> h.count, h.sum
+    (3, 5.0)
+    >>> h.cumulative_counts()
+    [(1.0, 1), (2.0, 2), (inf, 3)]
+    """
+
+    def __init__(self, buckets: Sequence[float]) -> None:
+        self._upper_bounds = tuple(sorted(buckets))
+        self._bucket_counts = [0] * (len(self._upper_bounds) + 1)
+        self._sum = 0.0
+        self._count = 0
+        self._lock = Lock()
+
+    @property
+    def sum(self) -> float:
+        return self._sum
+
+    @property
+    def count(self) -> int:
+        return self._count
+
+    def observe(self, value: float) -> None:
+        index = len(self._upper_bounds)
+        for i, upper_bound in enumerate(self._upper_bounds):
+            if value <= upper_bound:
+                index = i
+                break
+        with self._lock:
+            self._bucket_counts[index] += 1
+            self._sum += value
+            self._count += 1
+
+    def cumulative_counts(self) -> List[Tuple[float, int]]:
+        result = []
+        total = 0
+        for upper_bound, count in zip((*self._upper_bounds, float("inf")), self._bucket_counts):
+            total += count
+            result.append((upper_bound, total))
+        return result
+
+
+M = TypeVar("M", bound=Counter | Gauge | Histogram)
+
+
+class MetricFamily(Generic[M]):
+    """
+    A named metric with one child per distinct set of label values.
+
+    >>> family = MetricFamily("requests_total", "Requests.", MetricType.COUNTER, Counter)
+    >>> family.labels(path="/a").inc()
+    >>> family.labels(path="/a").value
+    1.0
+    >>> family.labels(path="/b").value
+    0.0
+    """
+
+    def __init__(self, name: str, description: str, type: MetricType, factory: Callable[[], M]) -> None:
+        self._name = name
+        self._description = description
+        self._type = type
+        self._factory: Callable[[], M] = factory
+        self._children: Dict[LabelValues, M] = {}
+        self._lock = Lock()
+
+    @property
+    def name(self) -> str:
+        return self._name
+
+    @property
+    def description(self) -> str:
+        return self._description
+
+    @property
+    def type(self) -> MetricType:
+        return self._type
+
+    def labels(self, **labels: str) -> M:
+        key = tuple(sorted(labels.items()))
+        child = self._children.get(key)
+        if child is None:
+            with self._lock:
+                child = self._children.setdefault(key, self._factory())
+        return child
+
+    def children(self) -> List[Tuple[LabelValues, M]]:
+        with self._lock:
+            return list(self._children.items())
+
+    def clear(self) -> None:
+        with self._lock:
+            self._children.clear()
+
+
+class Stopwatch:
+    """
+    Accumulates time spent inside ``with`` blocks and inside ``next`` calls of wrapped iterables.
+
+    Time spent by the consumer of :meth:`iterate` between items is not counted, so a stopwatch can time a lazy
+    producer without charging it for downstream work.
+
+    >>> sw = Stopwatch()
+    >>> with sw:
+    ...     pass
+    >>> list(sw.iterate([1, 2]))
+    [1, 2]
+    >>> sw.elapsed >= 0.0
+    True
+    """
+
+    def __init__(self) -> None:
+        self._elapsed = 0.0
+        self._started = 0.0
+
+    @property
+    def elapsed(self) -> float:
+        return self._elapsed
+
+    def __enter__(self) -> "Stopwatch":
+        self._started = time.perf_counter()
+        return self
+
+    def __exit__(
+        self, exc_type: Type[BaseException] | None, exc_value: BaseException | None, traceback: TracebackType | None
+    ) -> None:
+        self._elapsed += time.perf_counter() - self._started
+
+    def iterate(self, iterable: Iterable[T]) -> Generator[T, None, None]:
+        iterator = iter(iterable)
+        while True:
+            with self:
+                try:
+                    item = next(iterator)
+                except StopIteration:
+                    return
+            yield item
+
+
+def _format_labels(labels: LabelValues, extra: LabelValues = ()) -> str:
+    items = (*labels, *extra)
+    if len(items) == 0:
+        return ""
+    escaped = ((k, v.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')) for k, v in items)
+    return "{" + ",".join(f'{k}="{v}"' for k, v in escaped) + "}"
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+class PipelineMetrics:
+    """
+    Timers and counters for each stage of the transcription pipeline.
+
+    >>> metrics = PipelineMetrics()
+    >>> metrics.observe_stage(PipelineStage.MODEL_TRANSCRIBE, 0.5, audio_seconds=2.0)
+    >>> metrics.summary()["stages"]["model_transcribe"]["real_time_factor"]
+    0.25
+    >>> print(metrics.to_prometheus().splitlines()[0])
+    # HELP ols2t_stage_duration_seconds Wall-clock time spent in each pipeline stage.
+    """
+
+    def __init__(self) -> None:
+        self._stage_duration = MetricFamily(
+            "ols2t_stage_duration_seconds",
+            "Wall-clock time spent in each pipeline stage.",
+            MetricType.HISTOGRAM,
+            lambda: Histogram(DEFAULT_DURATION_BUCKETS),
+        )
+        self._stage_audio = MetricFamily(
+            "ols2t_stage_audio_seconds_total",
+            "Seconds of audio processed by each pipeline stage.",
+            MetricType.COUNTER,
+            Counter,
+        )
+        self._queue_wait = MetricFamily(
+            "ols2t_queue_wait_seconds",
+            "Time spent waiting for the next chunk on a stream queue.",
+            MetricType.HISTOGRAM,
+            lambda: Histogram(DEFAULT_QUEUE_WAIT_BUCKETS),
+        )
+        self._queue_depth = MetricFamily(
+            "ols2t_queue_depth",
+            "Number of items waiting in a stream queue when the consumer last read from it.",
+            MetricType.GAUGE,
+            Gauge,
+        )
+        self._chunk_samples = MetricFamily(
+            "ols2t_chunk_samples",
+            "Number of audio samples per chunk yielded by a stream.",
+            MetricType.HISTOGRAM,
+            lambda: Histogram(DEFAULT_CHUNK_SAMPLE_BUCKETS),
+        )
+        self._segments = MetricFamily(
+            "ols2t_segments_total",
+            "Number of segments produced by each pipeline stage.",
+            MetricType.COUNTER,
+            Counter,
+        )
+        self._dropped_audio = MetricFamily(
+            "ols2t_dropped_audio_seconds_total",
+            "Seconds of captured audio discarded because the consumer fell behind.",
+            MetricType.COUNTER,
+            Counter,
+        )
+        self._families: List[MetricFamily[Any]] = [
+            self._stage_duration,
+            self._stage_audio,
+            self._queue_wait,
+            self._queue_depth,
+            self._chunk_samples,
+            self._segments,
+            self._dropped_audio,
+        ]
+
+    def observe_stage(self, stage: PipelineStage, seconds: float, audio_seconds: float | None = None) -> None:
+        self._stage_duration.labels(stage=stage.value).observe(seconds)
+        if audio_seconds is not None:
+            self._stage_audio.labels(stage=stage.value).inc(audio_seconds)
+
+    def observe_queue_wait(self, queue: str, seconds: float, depth: int | None = None) -> None:
+        self._queue_wait.labels(queue=queue).observe(seconds)
+        if depth is not None:
+            self._queue_depth.labels(queue=queue).set(depth)
+
+    def observe_chunk(self, stream: str, samples: int) -> None:
+        self._chunk_samples.labels(stream=stream).observe(samples)
+
+    def count_segments(self, stage: PipelineStage, count: int = 1) -> None:
+        self._segments.labels(stage=stage.value).inc(count)
+
+    def count_dropped_audio(self, stream: str, seconds: float) -> None:
+        self._dropped_audio.labels(stream=stream).inc(seconds)
+
+    def reset(self) -> None:
+        for family in self._families:
+            family.clear()
+
+    def summary(self) -> Dict[str, Any]:
+        stages: Dict[str, Dict[str, float]] = {}
+        for labels, histogram in self._stage_duration.children():
+            stage = dict(labels)["stage"]
+            stages[stage] = {
+                "count": histogram.count,
+                "total_seconds": histogram.sum,
+                "mean_seconds": histogram.sum / histogram.count if histogram.count else 0.0,
+            }
+        for labels, counter in self._stage_audio.children():
+            stage = dict(labels)["stage"]
+            entry = stages.setdefault(stage, {"count": 0, "total_seconds": 0.0, "mean_seconds": 0.0})
+            entry["audio_seconds"] = counter.value
+            entry["real_time_factor"] = entry["total_seconds"] / counter.value if counter.value else 0.0
+        queues: Dict[str, Dict[str, float]] = {}
+        for labels, histogram in self._queue_wait.children():
+            queues[dict(labels)["queue"]] = {"waits": histogram.count, "total_wait_seconds": histogram.sum}
+        for labels, gauge in self._queue_depth.children():
+            entry = queues.setdefault(dict(labels)["queue"], {"waits": 0, "total_wait_seconds": 0.0})
+            entry["depth"] = gauge.value
+            entry["max_depth"] = gauge.max_value
+        chunks: Dict[str, Dict[str, float]] = {}
+        for labels, histogram in self._chunk_samples.children():
+            chunks[dict(labels)["stream"]] = {
+                "count": histogram.count,
+                "total_samples": histogram.sum,
+                "mean_samples": histogram.sum / histogram.count if histogram.count else 0.0,
+            }
+        segments = {dict(labels)["stage"]: counter.value for labels, counter in self._segments.children()}
+        dropped_audio_seconds = {
+            dict(labels)["stream"]: counter.value for labels, counter in self._dropped_audio.children()
+        }
+        return {
+            "stages": stages,
+            "queues": queues,
+            "chunks": chunks,
+            "segments": segments,
+            "dropped_audio_seconds": dropped_audio_seconds,
+        }
+
+    def to_prometheus(self) -> str:
+        lines: List[str] = []
+        for family in self._families:
+            lines.append(f"# HELP {family.name} {family.description}")
+            lines.append(f"# TYPE {family.name} {family.type.value}")
+            for labels, child in family.children():
+                if isinstance(child, Histogram):
+                    for upper_bound, count in child.cumulative_counts():
+                        le = (("le", _format_value(upper_bound)),)
+                        lines.append(f"{family.name}_bucket{_format_labels(labels, le)} {count}")
+                    lines.append(f"{family.name}_sum{_format_labels(labels)} {_format_value(child.sum)}")
+                    lines.append(f"{family.name}_count{_format_labels(labels)} {child.count}")
+                else:
+                    lines.append(f"{family.name}{_format_labels(labels)} {_format_value(child.value)}")
+        return "\n".join(lines) + "\n"
+
+
+pipeline_metrics = PipelineMetrics()
@@ -1,26 +1,51 @@
-from collections.abc import Generator, Iterable
-from contextlib import AbstractContextManager
+import mmap
+import os
+import queue as stdlib_queue
+import threading
+import time
+from collections.abc import Callable, Generator, Iterable
+from contextlib import AbstractContextManager, contextmanager
 from enum import Enum
 from multiprocessing import Event as MPEvent
 from multiprocessing import Process
 from multiprocessing import Queue as MPQueue
+from multiprocessing import Value as MPValue
+from multiprocessing.sharedctypes import Synchronized
 from multiprocessing.synchronize import Event as EventClass
 from queue import Empty as QueueEmptyException
+from queue import Full as QueueFullException
 from types import TracebackType
-from typing import Literal, Type, TypeAlias
+from typing import Any, Dict, List, Literal, Tuple, Type, TypeAlias
 
+import av
 import numpy as np
 from av import container as av_container
+from av.audio.resampler import AudioResampler
 from faster_whisper.audio import decode_audio
+from numpy.typing import NDArray
 from oltl import BaseModel
-from pyaudio import PyAudio, paFloat32
-from pydantic import FilePath
-
-from .types import AudioFrameChunk, ContinuousBufferReader
+from pyaudio import PyAudio, paFloat32, paInputOverflowed
+from pydantic import Field, FilePath, SerializerFunctionWrapHandler, model_serializer
+
+from .metrics import PipelineStage, pipeline_metrics
+from .settings import BackpressurePolicy
+from .types import (
+    AudioFrameChunk,
+    ContinuousBufferReader,
+    PcmSampleFormat,
+    pcm_to_audio_frame_chunk,
+)
 
 SamplingRate: TypeAlias = int
 
 
+def _queue_depth(queue: "MPQueue[Any]") -> int | None:
+    try:
+        return queue.qsize()
+    except NotImplementedError:
+        return None
+
+
 class AudioChunkStream(Iterable[AudioFrameChunk]):
     """
     A stream of audio chunks.
@@ -95,6 +120,8 @@ class StreamType(str, Enum):
     MICROPHONE = "MICROPHONE"
     AUDIO_FRAME = "AUDIO_FRAME"
     BYTES_CHUNK = "BYTES_CHUNK"
+    PCM_CHUNK = "PCM_CHUNK"
+    PCM_FILE = "PCM_FILE"
 
 
 class BaseStream(BaseModel, AbstractContextManager[AudioChunkStream]):
@@ -117,16 +144,78 @@ class AudioFrameStream(BaseStream):
         return super().__exit__(exc_type, exc_value, traceback)
 
 
+def decode_audio_channels(path: str | os.PathLike[str], sampling_rate: SamplingRate = 16000) -> NDArray[np.float32]:
+    """
+    Decode every channel of an audio file, resampled to ``sampling_rate``, as an array of shape (channels, samples).
+    """
+    with av.open(os.fspath(path), "r") as container:
+        audio_stream = container.streams.audio[0]
+        resampler = AudioResampler(format="fltp", layout=audio_stream.layout, rate=sampling_rate)
+        planes: List[NDArray[Any]] = []
+        for frame in container.decode(audio_stream):
+            planes.extend(resampled.to_ndarray() for resampled in resampler.resample(frame))
+        planes.extend(resampled.to_ndarray() for resampled in resampler.resample(None))
+    if len(planes) == 0:
+        return np.zeros((audio_stream.channels, 0), dtype=np.float32)
+    return np.concatenate(planes, axis=1).astype(np.float32, copy=False)
+
+
 class FileStream(BaseStream):
+    """
+    An audio file decoded at once.
+
+    All channels are downmixed to mono unless ``channel`` selects one of them. Use :meth:`split_channels` to get every
+    channel from a single decoding pass. Audio before ``start`` seconds is skipped, so timestamps of segments
+    transcribed from it are relative to ``start``. The decoded audio is yielded as one chunk, or in chunks of
+    ``chunk_seconds`` so that models sliding a window over the chunks (e.g. segment merging) yield segments as they
+    go.
+    """
+
     type: Literal[StreamType.FILE] = StreamType.FILE
     path: FilePath
+    channel: int | None = None
+    start: float = Field(default=0.0, ge=0.0)
+    chunk_seconds: float | None = Field(default=None, gt=0.0)
+
+    def split_channels(self) -> List["AudioFrameStream"]:
+        """Decode the file once and return one stream per channel."""
+        started = time.perf_counter()
+        channels = decode_audio_channels(self.path)
+        pipeline_metrics.observe_stage(
+            PipelineStage.DECODE_AUDIO, time.perf_counter() - started, audio_seconds=channels.shape[1] / 16000
+        )
+        return [AudioFrameStream(chunks=[AudioFrameChunk(samples)], sampling_rate=16000) for samples in channels]
 
     def __enter__(self) -> AudioChunkStream:
         self._fp = open(self.path, "rb")
         sampling_rate = 16000
-        return AudioChunkStream(
-            sampling_rate, iter((AudioFrameChunk(decode_audio(self._fp, sampling_rate=sampling_rate)),))
+        started = time.perf_counter()
+        try:
+            if self.channel is None:
+                chunk = AudioFrameChunk(decode_audio(self._fp, sampling_rate=sampling_rate))
+            else:
+                channels = decode_audio_channels(self.path, sampling_rate=sampling_rate)
+                if not 0 <= self.channel < len(channels):
+                    raise ValueError(
+                        f"{self.path} has {len(channels)} channel(s); channel {self.channel} does not exist"
+                    )
+                chunk = AudioFrameChunk(channels[self.channel])
+        except BaseException:
+            self._fp.close()
+            raise
+        if self.start > 0.0:
+            chunk = AudioFrameChunk(chunk[round(self.start * sampling_rate) :])
+        pipeline_metrics.observe_stage(
+            PipelineStage.DECODE_AUDIO, time.perf_counter() - started, audio_seconds=len(chunk) / sampling_rate
         )
+        if self.chunk_seconds is None:
+            chunks = [chunk]
+        else:
+            frames = max(1, round(self.chunk_seconds * sampling_rate))
+            chunks = [AudioFrameChunk(chunk[i : i + frames]) for i in range(0, len(chunk), frames)]
+        for c in chunks:
+            pipeline_metrics.observe_chunk("file", len(c))
+        return AudioChunkStream(sampling_rate, iter(chunks))
 
     def __exit__(
         self, exc_type: Type[BaseException] | None, exc_value: BaseException | None, traceback: TracebackType | None
@@ -135,16 +224,165 @@ class FileStream(BaseStream):
         return super().__exit__(exc_type, exc_value, traceback)
 
 
-def recording_process(queue: "MPQueue[AudioFrameChunk | Exception | None]", stop_event: EventClass) -> None:
+class PcmFileStream(BaseStream):
+    """
+    Raw mono PCM already on disk, memory-mapped instead of decoded.
+
+    ``.npy`` files are read according to their header. Headerless ``.f32`` and ``.s16`` files are little-endian
+    float32 and int16; other extensions need an explicit ``sample_format``. Chunks of ``chunk_frames`` samples are
+    views of the mapping (float32 input is not copied) and pages of chunks already consumed are released, so the
+    resident memory stays bounded regardless of the file size. This holds for models that transcribe chunk by chunk;
+    :class:`ols2t.speech_to_text_models.sharded.ShardedSpeechToTextModel` gathers the whole input in memory. Audio
+    before ``start`` seconds is skipped, so timestamps of segments transcribed from it are relative to ``start``.
+
+    >>> import tempfile
+    >>> with tempfile.TemporaryDirectory() as d:
+    ...     path = os.path.join(d, "audio.npy")
+    ...     np.save(path, np.arange(5, dtype=np.float32))
+    ...     with PcmFileStream(path=path, chunk_frames=2) as s:
+    ...         [chunk.tolist() for chunk in s]
+    [[0.0, 1.0], [2.0, 3.0], [4.0]]
+    """
+
+    type: Literal[StreamType.PCM_FILE] = StreamType.PCM_FILE
+    path: FilePath
+    sample_format: PcmSampleFormat | None = None
+    sampling_rate: SamplingRate = 16000
+    chunk_frames: int = Field(default=16000 * 30, gt=0)
+    start: float = Field(default=0.0, ge=0.0)
+
+    def _open_samples(self, mapping: mmap.mmap) -> Tuple[np.ndarray[Any, Any], int]:
+        extension = os.path.splitext(self.path)[1].lower()
+        if extension == ".npy":
+            self._fp.seek(0)
+            version = np.lib.format.read_magic(self._fp)
+            if version == (1, 0):
+                shape, fortran_order, dtype = np.lib.format.read_array_header_1_0(self._fp)
+            else:
+                shape, fortran_order, dtype = np.lib.format.read_array_header_2_0(self._fp)
+            if len(shape) != 1:
+                raise ValueError(f"Only one-dimensional (mono) arrays are supported, got shape {shape}")
+            offset = self._fp.tell()
+            return np.frombuffer(mapping, dtype=dtype, count=shape[0], offset=offset), offset
+        sample_format = self.sample_format or {".f32": PcmSampleFormat.F32LE, ".s16": PcmSampleFormat.S16LE}.get(
+            extension
+        )
+        if sample_format is None:
+            raise ValueError(f"Cannot infer the sample format of {self.path}; set sample_format")
+        dtype = np.dtype("<f4") if sample_format == PcmSampleFormat.F32LE else np.dtype("<i2")
+        return np.frombuffer(mapping, dtype=dtype, count=len(mapping) // dtype.itemsize), 0
+
+    def __enter__(self) -> AudioChunkStream:
+        self._fp = open(self.path, "rb")
+        if os.fstat(self._fp.fileno()).st_size == 0:
+            self._mapping = None
+            return AudioChunkStream(self.sampling_rate, iter(()))
+        self._mapping = mmap.mmap(self._fp.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            samples, data_offset = self._open_samples(self._mapping)
+        except BaseException:
+            self._mapping.close()
+            self._fp.close()
+            raise
+        return AudioChunkStream(self.sampling_rate, self._iter_chunks(self._mapping, samples, data_offset))
+
+    def _iter_chunks(
+        self, mapping: mmap.mmap, samples: np.ndarray[Any, Any], data_offset: int
+    ) -> Generator[AudioFrameChunk, None, None]:
+        page_size = mmap.PAGESIZE
+        released = 0
+        for start in range(round(self.start * self.sampling_rate), len(samples), self.chunk_frames):
+            window = samples[start : start + self.chunk_frames]
+            if window.dtype == np.dtype("<f4"):
+                chunk = window.view(AudioFrameChunk)
+            elif window.dtype == np.dtype("<i2"):
+                chunk = window.astype(np.float32).view(AudioFrameChunk)
+                chunk *= 1 / 32768
+            else:
+                chunk = AudioFrameChunk(window)
+            pipeline_metrics.observe_chunk("pcm_file", len(chunk))
+            yield chunk
+            # The consumer has moved on: drop the pages before this window from the resident set.
+            # They are backed by the file, so touching them again simply reads them back in.
+            consumed = (data_offset + start * samples.itemsize) // page_size * page_size
+            if consumed > released and hasattr(mmap, "MADV_DONTNEED"):
+                mapping.madvise(mmap.MADV_DONTNEED, released, consumed - released)
+                released = consumed
+
+    def __exit__(
+        self, exc_type: Type[BaseException] | None, exc_value: BaseException | None, traceback: TracebackType | None
+    ) -> bool | None:
+        if self._mapping is not None:
+            try:
+                self._mapping.close()
+            except BufferError:
+                # Chunks handed out are still referenced; the mapping is unmapped once they are released.
+                pass
+        self._fp.close()
+        return super().__exit__(exc_type, exc_value, traceback)
+
+
+def put_with_backpressure(
+    queue: "MPQueue[AudioFrameChunk | Exception | None]",
+    chunk: AudioFrameChunk,
+    policy: BackpressurePolicy,
+    stop_event: EventClass,
+    dropped_frames: "Synchronized[int]",
+) -> None:
+    if policy == BackpressurePolicy.BLOCK:
+        while not stop_event.is_set():
+            try:
+                queue.put(chunk, timeout=0.1)
+                return
+            except QueueFullException:
+                continue
+        with dropped_frames.get_lock():
+            dropped_frames.value += len(chunk)
+        return
+    try:
+        queue.put(chunk, block=False)
+        return
+    except QueueFullException:
+        pass
+    if policy == BackpressurePolicy.DROP_OLDEST:
+        try:
+            oldest = queue.get(timeout=0.1)
+            if isinstance(oldest, np.ndarray):
+                with dropped_frames.get_lock():
+                    dropped_frames.value += len(oldest)
+            queue.put(chunk, block=False)
+            return
+        except (QueueEmptyException, QueueFullException):
+            pass
+    with dropped_frames.get_lock():
+        dropped_frames.value += len(chunk)
+
+
+def recording_process(
+    queue: "MPQueue[AudioFrameChunk | Exception | None]",
+    stop_event: EventClass,
+    backpressure_policy: BackpressurePolicy,
+    dropped_frames: "Synchronized[int]",
+) -> None:
     try:
         audio = PyAudio()
         sampling_rate = 16000
+        chunk_frames = 16000
         stream = audio.open(format=paFloat32, channels=1, rate=sampling_rate, input=True, frames_per_buffer=1024)
 
         while not stop_event.is_set():
             if stream.is_active():
-                data = stream.read(16000, exception_on_overflow=False)
-                queue.put(AudioFrameChunk(data), block=False)
+                try:
+                    data = stream.read(chunk_frames, exception_on_overflow=True)
+                except OSError as e:
+                    if e.errno != paInputOverflowed:
+                        raise
+                    # PortAudio overran its buffer, e.g. while a blocked put waited for space. The overrun audio and
+                    # this read are lost, so at least a chunk is counted.
+                    with dropped_frames.get_lock():
+                        dropped_frames.value += chunk_frames
+                    continue
+                put_with_backpressure(queue, AudioFrameChunk(data), backpressure_policy, stop_event, dropped_frames)
             else:
                 break
 
@@ -163,23 +401,54 @@ def recording_process(queue: "MPQueue[AudioFrameChunk | Exception | None]", stop
 class MicrophoneStream(BaseStream):
     type: Literal[StreamType.MICROPHONE] = StreamType.MICROPHONE
 
-    def __init__(self, type: StreamType = StreamType.MICROPHONE) -> None:
+    def __init__(
+        self,
+        type: StreamType = StreamType.MICROPHONE,
+        backpressure_policy: BackpressurePolicy = BackpressurePolicy.DROP_OLDEST,
+        max_queue_size: int = 256,
+    ) -> None:
         super(MicrophoneStream, self).__init__(type=type)
-        self._max_queue_size = 256
+        self._max_queue_size = max_queue_size
+        self._backpressure_policy = backpressure_policy
+        self._sampling_rate = 16000
         self._process: Process | None = None
         self._queue: "MPQueue[AudioFrameChunk | Exception | None]" | None = None
         self._stop_event: EventClass | None = None
+        self._dropped_frames: "Synchronized[int]" = MPValue("q", 0)
+        self._reported_dropped_frames = 0
+
+    @property
+    def backpressure_policy(self) -> BackpressurePolicy:
+        return self._backpressure_policy
+
+    @property
+    def dropped_frames(self) -> int:
+        return self._dropped_frames.value
+
+    @property
+    def dropped_seconds(self) -> float:
+        return self.dropped_frames / self._sampling_rate
 
     def __enter__(self) -> AudioChunkStream:
         self._queue = MPQueue(maxsize=self._max_queue_size)
         self._stop_event = MPEvent()
 
-        self._process = Process(target=recording_process, args=(self._queue, self._stop_event))
+        self._process = Process(
+            target=recording_process,
+            args=(self._queue, self._stop_event, self._backpressure_policy, self._dropped_frames),
+        )
         self._process.daemon = True
         self._process.start()
 
-        sampling_rate = 16000
-        return AudioChunkStream(sampling_rate, self._iter_chunks())
+        return AudioChunkStream(self._sampling_rate, self._iter_chunks())
+
+    def _report_dropped_frames(self) -> None:
+        dropped_frames = self.dropped_frames
+        if dropped_frames > self._reported_dropped_frames:
+            pipeline_metrics.count_dropped_audio(
+                "microphone", (dropped_frames - self._reported_dropped_frames) / self._sampling_rate
+            )
+            self._reported_dropped_frames = dropped_frames
 
     def _iter_chunks(self) -> Generator[AudioFrameChunk, None, None]:
         if self._queue is None:
@@ -190,16 +459,23 @@ class MicrophoneStream(BaseStream):
             raise RuntimeError("Process is not initialized. Did you call __enter__?")
         if self._process.is_alive() is False:
             raise RuntimeError("Process is not alive. Did you call __enter__?")
+        waiting_since = time.perf_counter()
         while True:
             try:
                 chunk = self._queue.get(timeout=1.0)
+                pipeline_metrics.observe_queue_wait(
+                    "microphone", time.perf_counter() - waiting_since, depth=_queue_depth(self._queue)
+                )
+                self._report_dropped_frames()
                 if chunk is None:
                     break
 
                 if isinstance(chunk, Exception):
                     raise chunk
 
+                pipeline_metrics.observe_chunk("microphone", len(chunk))
                 yield chunk
+                waiting_since = time.perf_counter()
             except QueueEmptyException:
                 continue
             except Exception:
@@ -211,6 +487,8 @@ class MicrophoneStream(BaseStream):
         if self._stop_event:
             self._stop_event.set()
 
+        self._report_dropped_frames()
+
         if self._process and self._process.is_alive():
             self._process.join(timeout=0.1)
             if self._process.is_alive():
@@ -227,6 +505,15 @@ class MicrophoneStream(BaseStream):
         return super().__exit__(exc_type, exc_value, traceback)
 
 
+class Word(BaseModel):
+    """A word of a segment, with its own timing and probability."""
+
+    text: str
+    start: float
+    end: float
+    probability: float
+
+
 class Segment(BaseModel):
     """A segment of transcribed text.
 
@@ -235,39 +522,246 @@ class Segment(BaseModel):
         start (float): The start time of the segment in seconds.
         end (float): The end time of the segment in seconds.
         probability (float): The probability of the transcribed text.
+        words (List[Word] | None): The words of the segment, when produced at segment granularity with word
+            timestamps. Omitted from the serialized output when ``None``.
+        channel (int | None): The audio channel the segment was transcribed from, when channels are transcribed
+            separately. Omitted from the serialized output when ``None``.
 
     >>> Segment(text="こんにちは", start=0.0, end=2.0, probability=0.9)
     Segment(text='こんにちは', start=0.0, end=2.0, probability=0.9)
-    """
+    >>> Segment(text="こんにちは", start=0.0, end=2.0, probability=0.9).model_dump()
+    {'text': 'こんにちは', 'start': 0.0, 'end': 2.0, 'probability': 0.9}
+    >>> segment = Segment(
+    ...     text="こんにちは", start=0.0, end=2.0, probability=0.9,
+    ...     words=[Word(text="こんにちは", start=0.5, end=1.5, probability=0.9)],
+    ... )
+    >>> segment.shifted(10.0).model_dump_json()
+    '{"text":"こんにちは","start":10.0,"end":12.0,"probability":0.9,"words":[{"text":"こんにちは","start":10.5,"end":11.5,"probability":0.9}]}'
+    """  # noqa: E501
 
     text: str
     start: float
     end: float
     probability: float
+    words: List[Word] | None = Field(default=None, repr=False)
+    channel: int | None = Field(default=None, repr=False)
+
+    @model_serializer(mode="wrap")
+    def _omit_missing_fields(self, handler: SerializerFunctionWrapHandler) -> Dict[str, Any]:
+        serialized: Dict[str, Any] = handler(self)
+        for name in ("words", "channel"):
+            if name in serialized and serialized[name] is None:
+                del serialized[name]
+        return serialized
+
+    def shifted(self, offset: float) -> "Segment":
+        """Return a copy moved by ``offset`` seconds, including its words."""
+        words = None
+        if self.words is not None:
+            words = [
+                Word(text=w.text, start=w.start + offset, end=w.end + offset, probability=w.probability)
+                for w in self.words
+            ]
+        return Segment(
+            text=self.text,
+            start=self.start + offset,
+            end=self.end + offset,
+            probability=self.probability,
+            words=words,
+            channel=self.channel,
+        )
+
+    def with_channel(self, channel: int) -> "Segment":
+        """
+        Return a copy tagged with ``channel``.
+
+        >>> Segment(text="hello", start=0.0, end=1.0, probability=0.9).with_channel(1).model_dump()
+        {'text': 'hello', 'start': 0.0, 'end': 1.0, 'probability': 0.9, 'channel': 1}
+        """
+        return Segment(
+            text=self.text,
+            start=self.start,
+            end=self.end,
+            probability=self.probability,
+            words=self.words,
+            channel=channel,
+        )
+
+
+class SegmentMergingParameters(BaseModel):
+    """
+    Per-request overrides of the sliding window parameters of the segment merging model.
+
+    Fields left ``None`` fall back to the values the model was configured with.
+
+    >>> SegmentMergingParameters(margin=1.0)
+    SegmentMergingParameters(buffer_length=None, margin=1.0, probability_threshold=None)
+    """
+
+    buffer_length: int | None = Field(default=None, gt=0)
+    margin: float | None = Field(default=None, ge=0.0)
+    probability_threshold: float | None = Field(default=None, ge=0.0, le=1.0)
+
+
+class TranscriptionContext:
+    """
+    State of the transcription of one input stream, shared by the models taking part in it.
+
+    A wrapping model passes its context to the models it delegates to, so decisions such as the detected language
+    are made once per stream rather than once per decode.
+
+    >>> context = TranscriptionContext()
+    >>> context.language is None
+    True
+    >>> context.language = "ja"
+    >>> context.language
+    'ja'
+
+    ``prompt`` is text already confirmed earlier in the stream. Models that support it condition the decoding on its
+    last ``prompt_token_budget`` tokens. A budget left ``None`` is set by the segment merging model from its own
+    configuration; no prompt is used while it is ``None`` or 0.
+
+    ``segment_merging_parameters`` carries per-request overrides for the segment merging model.
+
+    A context can be cancelled from any thread, e.g. when the client of a request goes away. Models stop yielding at
+    the next chunk or segment and stop the streams they registered with :meth:`on_cancel`.
+
+    >>> context = TranscriptionContext()
+    >>> with context.on_cancel(lambda: print("stopped")):
+    ...     context.cancel()
+    stopped
+    >>> context.cancelled
+    True
+    """
+
+    def __init__(
+        self,
+        language: str | None = None,
+        prompt: str | None = None,
+        prompt_token_budget: int | None = None,
+        segment_merging_parameters: SegmentMergingParameters | None = None,
+    ) -> None:
+        self._language = language
+        self._prompt = prompt
+        self._prompt_token_budget = prompt_token_budget
+        self._segment_merging_parameters = segment_merging_parameters or SegmentMergingParameters()
+        self._cancelled = False
+        self._cancel_callbacks: List[Callable[[], None]] = []
+        self._lock = threading.Lock()
+
+    @property
+    def language(self) -> str | None:
+        return self._language
+
+    @language.setter
+    def language(self, language: str | None) -> None:
+        self._language = language
+
+    @property
+    def prompt(self) -> str | None:
+        return self._prompt
+
+    @prompt.setter
+    def prompt(self, prompt: str | None) -> None:
+        self._prompt = prompt
+
+    @property
+    def prompt_token_budget(self) -> int | None:
+        return self._prompt_token_budget
+
+    @prompt_token_budget.setter
+    def prompt_token_budget(self, prompt_token_budget: int | None) -> None:
+        self._prompt_token_budget = prompt_token_budget
+
+    @property
+    def segment_merging_parameters(self) -> SegmentMergingParameters:
+        return self._segment_merging_parameters
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancelled
+
+    def cancel(self) -> None:
+        with self._lock:
+            if self._cancelled:
+                return
+            self._cancelled = True
+            callbacks, self._cancel_callbacks = self._cancel_callbacks, []
+        for callback in callbacks:
+            callback()
+
+    @contextmanager
+    def on_cancel(self, callback: Callable[[], None]) -> Generator[None, None, None]:
+        """Call ``callback`` if the context is cancelled while the block runs, or right away if it already was."""
+        with self._lock:
+            cancelled = self._cancelled
+            if not cancelled:
+                self._cancel_callbacks.append(callback)
+        if cancelled:
+            callback()
+        try:
+            yield
+        finally:
+            with self._lock:
+                if callback in self._cancel_callbacks:
+                    self._cancel_callbacks.remove(callback)
+
+
+class DecodingError(Exception):
+    """Raised from a :class:`BytesChunkStream` when its decoder process fails."""
 
 
 def decoding_process(
-    queue: "MPQueue[bytes]", output_queue: "MPQueue[AudioFrameChunk | Exception | None]", stop_event: EventClass
+    queue: "MPQueue[bytes | None]",
+    output_queue: "MPQueue[AudioFrameChunk | Exception | None]",
+    stop_event: EventClass,
 ) -> None:
+    """
+    Decode the container read from ``queue`` into ``output_queue``.
+
+    The output always ends with exactly one ``None`` (end of stream) or :class:`DecodingError`, after every decoded
+    frame. A stream that ends before any byte arrived is an empty stream rather than an error.
+    """
     reader = ContinuousBufferReader(queue, stop_event)
-    container = av_container.open(reader, "r")
-    audio_stream = container.streams.audio[0]
-    for packet in container.decode(audio_stream):
-        output_queue.put(AudioFrameChunk(packet.to_ndarray()[0]))
+    try:
+        with av_container.open(reader, "r") as container:
+            audio_stream = container.streams.audio[0]
+            for packet in container.decode(audio_stream):
+                output_queue.put(AudioFrameChunk(packet.to_ndarray()[0]))
+    except Exception as e:
+        if reader.received_bytes > 0:
+            # Exceptions raised by av do not always survive pickling, so only the message crosses the process boundary.
+            output_queue.put(DecodingError(f"Failed to decode audio: {e!r}"))
+            return
+    output_queue.put(None)
 
 
 class BytesChunkStream(BaseStream):
+    """
+    A stream of container bytes (e.g. WebM chunks from a browser) decoded in a separate process.
+
+    Write ``None`` to ``chunk_queue`` (or set ``stop_event``) after the last chunk. Chunks are yielded until the
+    decoder reports the end of the stream; a decoder failure is raised as :class:`DecodingError`. Leaving the context
+    early stops the decoder and drains its output so that it can exit on its own; it is only terminated if it does not
+    within ``shutdown_timeout`` seconds.
+    """
+
     type: Literal[StreamType.BYTES_CHUNK] = StreamType.BYTES_CHUNK
 
     def __init__(
-        self, chunk_queue: "MPQueue[bytes]", stop_event: EventClass, type: StreamType = StreamType.BYTES_CHUNK
+        self,
+        chunk_queue: "MPQueue[bytes | None]",
+        stop_event: EventClass,
+        type: StreamType = StreamType.BYTES_CHUNK,
+        shutdown_timeout: float = 1.0,
     ) -> None:
         super(BytesChunkStream, self).__init__(type=type)
         self._max_queue_size = 256
         self._process: Process | None = None
         self._output_queue: "MPQueue[AudioFrameChunk | Exception | None]" | None = None
         self._stop_event = stop_event
-        self._chunk_queue: "MPQueue[bytes]" = chunk_queue
+        self._chunk_queue: "MPQueue[bytes | None]" = chunk_queue
+        self._shutdown_timeout = shutdown_timeout
 
     def __enter__(self) -> AudioChunkStream:
         self._output_queue = MPQueue(maxsize=self._max_queue_size)
@@ -283,38 +777,143 @@ class BytesChunkStream(BaseStream):
             raise RuntimeError("Queue is not initialized. Did you call __enter__?")
         if self._process is None:
             raise RuntimeError("Process is not initialized. Did you call __enter__?")
-        if self._process.is_alive() is False:
-            raise RuntimeError("Process is not alive. Did you call __enter__?")
-        while self._process.is_alive():
+        waiting_since = time.perf_counter()
+        while True:
             try:
                 chunk = self._output_queue.get(timeout=1.0)
-                if chunk is None:
-                    break
-
-                if isinstance(chunk, Exception):
-                    raise chunk
-
-                yield chunk
             except QueueEmptyException:
-                continue
-            except Exception:
-                break
+                if self._process.is_alive():
+                    continue
+                # The end of stream is written before the process exits, so it is already in the queue by now.
+                try:
+                    chunk = self._output_queue.get(timeout=0.1)
+                except QueueEmptyException:
+                    raise DecodingError(
+                        f"Decoder process exited with code {self._process.exitcode} before the end of the stream"
+                    )
+            pipeline_metrics.observe_queue_wait(
+                "bytes_chunk", time.perf_counter() - waiting_since, depth=_queue_depth(self._output_queue)
+            )
+            if chunk is None:
+                return
+            if isinstance(chunk, Exception):
+                raise chunk
+            pipeline_metrics.observe_chunk("bytes_chunk", len(chunk))
+            yield chunk
+            waiting_since = time.perf_counter()
 
     def __exit__(
         self, exc_type: Type[BaseException] | None, exc_value: BaseException | None, traceback: TracebackType | None
     ) -> bool | None:
-
-        if self._process and self._process.is_alive():
-            self._process.join(timeout=0.1)
+        if self._process is not None:
+            if self._process.is_alive():
+                self._stop_event.set()
+            deadline = time.monotonic() + self._shutdown_timeout
+            # A decoder blocked on a full output queue can neither see the stop event nor exit, so keep draining.
+            while self._process.is_alive() and time.monotonic() < deadline:
+                if self._output_queue is not None:
+                    try:
+                        self._output_queue.get(timeout=0.05)
+                    except QueueEmptyException:
+                        pass
+                else:
+                    self._process.join(timeout=0.05)
             if self._process.is_alive():
                 self._process.terminate()
+            self._process.join()
+            self._process.close()
+            self._process = None
 
-        if self._output_queue:
+        if self._output_queue is not None:
             self._output_queue.close()
             self._output_queue.join_thread()
+            self._output_queue = None
 
-        if self._process:
-            self._process.join()
-            self._process.close()
+        return super().__exit__(exc_type, exc_value, traceback)
+
+
+class PcmChunkStream(BaseStream):
+    """
+    A stream of raw PCM byte chunks decoded in-process, without a container decoder.
+
+    Chunks are read from ``chunk_queue`` until ``None`` is received, or until ``stop_event`` is set and the queue has
+    been drained, so the stream also ends when the producer cannot deliver ``None``. Bytes are coalesced until at least
+    ``min_chunk_frames`` samples are available; a message that is already large enough is viewed without copying.
+
+    >>> chunk_queue = stdlib_queue.Queue()
+    >>> for data in (np.zeros(3, dtype="<i2").tobytes(), b"\\x00", b"\\x40", None):
+    ...     chunk_queue.put(data)
+    >>> with PcmChunkStream(chunk_queue=chunk_queue, sample_format=PcmSampleFormat.S16LE, min_chunk_frames=4) as s:
+    ...     list(s)
+    [AudioFrameChunk([0. , 0. , 0. , 0.5], dtype=float32)]
+    """
+
+    type: Literal[StreamType.PCM_CHUNK] = StreamType.PCM_CHUNK
 
+    def __init__(
+        self,
+        chunk_queue: "stdlib_queue.Queue[bytes | None]",
+        sample_format: PcmSampleFormat = PcmSampleFormat.F32LE,
+        sampling_rate: SamplingRate = 16000,
+        min_chunk_frames: int = 16000,
+        stop_event: threading.Event | None = None,
+        type: StreamType = StreamType.PCM_CHUNK,
+    ) -> None:
+        super(PcmChunkStream, self).__init__(type=type)
+        self._chunk_queue = chunk_queue
+        self._sample_format = sample_format
+        self._sampling_rate = sampling_rate
+        self._min_chunk_frames = min_chunk_frames
+        self._stop_event = stop_event or threading.Event()
+
+    @property
+    def sample_format(self) -> PcmSampleFormat:
+        return self._sample_format
+
+    @property
+    def stop_event(self) -> threading.Event:
+        return self._stop_event
+
+    def _get(self) -> bytes | None:
+        while True:
+            try:
+                return self._chunk_queue.get(timeout=1.0)
+            except QueueEmptyException:
+                if self._stop_event.is_set():
+                    return None
+
+    def __enter__(self) -> AudioChunkStream:
+        return AudioChunkStream(self._sampling_rate, self._iter_chunks())
+
+    def _iter_chunks(self) -> Generator[AudioFrameChunk, None, None]:
+        sample_width = self._sample_format.sample_width
+        min_chunk_bytes = max(self._min_chunk_frames, 1) * sample_width
+        pending: List[bytes] = []
+        pending_bytes = 0
+        finished = False
+        while not finished:
+            waiting_since = time.perf_counter()
+            data = self._get()
+            pipeline_metrics.observe_queue_wait(
+                "pcm_chunk", time.perf_counter() - waiting_since, depth=self._chunk_queue.qsize()
+            )
+            if data is None:
+                finished = True
+            else:
+                pending.append(data)
+                pending_bytes += len(data)
+            if pending_bytes < sample_width or (pending_bytes < min_chunk_bytes and not finished):
+                continue
+            buffer = pending[0] if len(pending) == 1 else b"".join(pending)
+            usable = len(buffer) - len(buffer) % sample_width
+            rest = buffer[usable:]
+            pending = [rest] if rest else []
+            pending_bytes = len(rest)
+            chunk = pcm_to_audio_frame_chunk(memoryview(buffer)[:usable], self._sample_format)
+            pipeline_metrics.observe_chunk("pcm_chunk", len(chunk))
+            yield chunk
+
+    def __exit__(
+        self, exc_type: Type[BaseException] | None, exc_value: BaseException | None, traceback: TracebackType | None
+    ) -> bool | None:
         return super().__exit__(exc_type, exc_value, traceback)
@@ -0,0 +1,172 @@
+import queue as stdlib_queue
+import struct
+import threading
+from collections.abc import Callable
+from concurrent.futures import Future, ThreadPoolExecutor
+from enum import IntEnum
+from typing import Tuple, TypeVar
+
+from .core import SpeechToTextCore
+from .models import BaseStream, Segment, TranscriptionContext
+from .settings import BackpressurePolicy
+
+T = TypeVar("T")
+
+MULTIPLEX_HEADER = struct.Struct("<IB")
+
+
+class MultiplexFrameType(IntEnum):
+    AUDIO = 0
+    END = 1
+
+
+def encode_multiplex_frame(stream_id: int, frame_type: MultiplexFrameType, payload: bytes = b"") -> bytes:
+    """
+    Prefix a payload with the stream ID (uint32 LE) and the frame type (uint8).
+
+    >>> encode_multiplex_frame(7, MultiplexFrameType.AUDIO, b"pcm")
+    b'\\x07\\x00\\x00\\x00\\x00pcm'
+    """
+    return MULTIPLEX_HEADER.pack(stream_id, frame_type) + payload
+
+
+def decode_multiplex_frame(frame: bytes) -> Tuple[int, MultiplexFrameType, memoryview]:
+    """
+    Split a frame into stream ID, frame type and a zero-copy view of the payload.
+
+    >>> stream_id, frame_type, payload = decode_multiplex_frame(b"\\x07\\x00\\x00\\x00\\x01")
+    >>> stream_id, frame_type, bytes(payload)
+    (7, <MultiplexFrameType.END: 1>, b'')
+    >>> decode_multiplex_frame(b"\\x07")
+    Traceback (most recent call last):
+    ...
+    ValueError: Multiplexed frame is shorter than its 5 byte header
+    """
+    if len(frame) < MULTIPLEX_HEADER.size:
+        raise ValueError(f"Multiplexed frame is shorter than its {MULTIPLEX_HEADER.size} byte header")
+    stream_id, frame_type = MULTIPLEX_HEADER.unpack_from(frame)
+    return stream_id, MultiplexFrameType(frame_type), memoryview(frame)[MULTIPLEX_HEADER.size :]
+
+
+def put_nowait_with_backpressure(queue: "stdlib_queue.Queue[T]", item: T, policy: BackpressurePolicy) -> T | None:
+    """
+    Put ``item`` into a bounded queue without blocking and return the item dropped to honour ``policy``, if any.
+
+    With ``BLOCK`` nothing is dropped and ``queue.Full`` is raised, so that the caller can wait for room.
+
+    >>> q = stdlib_queue.Queue(maxsize=2)
+    >>> [put_nowait_with_backpressure(q, item, BackpressurePolicy.DROP_OLDEST) for item in "abc"]
+    [None, None, 'a']
+    >>> put_nowait_with_backpressure(q, "d", BackpressurePolicy.DROP_NEWEST), list(q.queue)
+    ('d', ['b', 'c'])
+    """
+    try:
+        queue.put_nowait(item)
+        return None
+    except stdlib_queue.Full:
+        if policy == BackpressurePolicy.BLOCK:
+            raise
+    if policy == BackpressurePolicy.DROP_NEWEST:
+        return item
+    try:
+        dropped = queue.get_nowait()
+    except stdlib_queue.Empty:
+        dropped = None
+    try:
+        queue.put_nowait(item)
+    except stdlib_queue.Full:
+        return item
+    return dropped
+
+
+def put_unless_done(queue: "stdlib_queue.Queue[T]", item: T, job: "Future[None]") -> None:
+    """Block until there is room for ``item``, but give up once the transcription consuming the queue has ended."""
+    while not job.done():
+        try:
+            queue.put(item, timeout=0.1)
+            return
+        except stdlib_queue.Full:
+            continue
+
+
+class SchedulerFullError(Exception):
+    """Raised by :meth:`TranscriptionScheduler.submit` when no more transcriptions can be accepted."""
+
+
+class TranscriptionScheduler:
+    """
+    Runs transcriptions of many streams on one bounded pool of worker threads shared by all connections.
+
+    At most ``max_workers`` streams are transcribed at once. Up to ``max_pending`` more wait in submission order
+    (without limit when ``None``); their audio has to be buffered by the caller in the meantime. Beyond that,
+    :meth:`submit` raises :class:`SchedulerFullError` so that callers can turn the stream away instead of letting it
+    starve.
+    """
+
+    def __init__(self, core: SpeechToTextCore, max_workers: int, max_pending: int | None = None) -> None:
+        self._core = core
+        self._max_workers = max_workers
+        self._max_pending = max_pending
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="ols2t-scheduler")
+        self._lock = threading.Lock()
+        self._active = 0
+
+    @property
+    def max_workers(self) -> int:
+        return self._max_workers
+
+    @property
+    def max_pending(self) -> int | None:
+        return self._max_pending
+
+    @property
+    def active(self) -> int:
+        """Number of submitted transcriptions that have not finished, running or waiting."""
+        return self._active
+
+    @property
+    def pending(self) -> int:
+        """Number of submitted transcriptions waiting for a worker."""
+        return max(self._active - self.max_workers, 0)
+
+    def _release(self) -> None:
+        with self._lock:
+            self._active -= 1
+
+    def _release_if_cancelled(self, future: "Future[None]") -> None:
+        # A future cancelled before it started never runs, so it does not release itself.
+        if future.cancelled():
+            self._release()
+
+    def submit(
+        self,
+        input_stream: BaseStream,
+        on_segment: Callable[[Segment], None],
+        context: TranscriptionContext | None = None,
+    ) -> "Future[None]":
+        def run() -> None:
+            try:
+                if context is not None and context.cancelled:
+                    return
+                for segment in self._core.transcribe(input_stream=input_stream, context=context):
+                    on_segment(segment)
+            finally:
+                self._release()
+
+        with self._lock:
+            if self.max_pending is not None and self._active >= self.max_workers + self.max_pending:
+                raise SchedulerFullError(
+                    f"{self._active} transcriptions are running or waiting; the limit is "
+                    f"{self.max_workers + self.max_pending}"
+                )
+            self._active += 1
+        try:
+            future = self._executor.submit(run)
+        except BaseException:
+            self._release()
+            raise
+        future.add_done_callback(self._release_if_cancelled)
+        return future
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=True, cancel_futures=True)
@@ -0,0 +1,116 @@
+import cProfile
+import os
+import re
+import threading
+import uuid
+from collections.abc import Generator, Iterable
+from types import TracebackType
+from typing import Type, TypeVar
+
+T = TypeVar("T")
+
+_UNSAFE_REQUEST_ID_CHARACTERS = re.compile(r"[^A-Za-z0-9_.-]")
+
+# cProfile cannot run two profilers at once on Python 3.12+, and there a profiler also records other threads.
+_profiling_lock = threading.Lock()
+
+
+def generate_request_id() -> str:
+    return uuid.uuid4().hex
+
+
+def sanitize_request_id(request_id: str) -> str:
+    """
+    Make a client supplied request ID safe to use as a file name.
+
+    >>> sanitize_request_id("abc-123")
+    'abc-123'
+    >>> sanitize_request_id("../../etc/passwd")
+    '_.._etc_passwd'
+    >>> sanitize_request_id("")
+    '_'
+    """
+    sanitized = _UNSAFE_REQUEST_ID_CHARACTERS.sub("_", request_id)[:128].lstrip(".")
+    return sanitized or "_"
+
+
+class TranscriptionProfiler:
+    """
+    Profiles a transcription with cProfile and writes a pstats file named after the request ID.
+
+    The profiler only runs while a ``with`` block is active or while :meth:`iterate` is fetching the next item, so
+    the time a consumer spends between segments is not attributed to the transcription. Only one profiler runs in a
+    process at a time; while another one is running, the work is done without profiling and :attr:`profiled` stays
+    ``False``.
+
+    >>> import pstats, tempfile
+    >>> with tempfile.TemporaryDirectory() as d:
+    ...     profiler = TranscriptionProfiler(output_dir=d, request_id="req-1")
+    ...     with profiler:
+    ...         _ = sorted(range(10))
+    ...     os.path.basename(profiler.output_path), isinstance(pstats.Stats(profiler.output_path), pstats.Stats)
+    ('req-1.pstats', True)
+    """
+
+    def __init__(self, output_dir: str, request_id: str | None = None) -> None:
+        self._request_id = sanitize_request_id(request_id) if request_id else generate_request_id()
+        self._output_dir = output_dir
+        self._profile = cProfile.Profile()
+        self._profiled = False
+
+    @property
+    def request_id(self) -> str:
+        return self._request_id
+
+    @property
+    def output_path(self) -> str:
+        return os.path.join(self._output_dir, f"{self._request_id}.pstats")
+
+    @property
+    def profiled(self) -> bool:
+        """Whether this profiler ran, i.e. whether a pstats file is (or will be) written to :attr:`output_path`."""
+        return self._profiled
+
+    def _start(self) -> bool:
+        self._profiled = _profiling_lock.acquire(blocking=False)
+        return self._profiled
+
+    def _finish(self) -> None:
+        try:
+            self.dump()
+        finally:
+            _profiling_lock.release()
+
+    def __enter__(self) -> "TranscriptionProfiler":
+        if self._start():
+            self._profile.enable()
+        return self
+
+    def __exit__(
+        self, exc_type: Type[BaseException] | None, exc_value: BaseException | None, traceback: TracebackType | None
+    ) -> None:
+        if self.profiled:
+            self._profile.disable()
+            self._finish()
+
+    def iterate(self, iterable: Iterable[T]) -> Generator[T, None, None]:
+        iterator = iter(iterable)
+        if not self._start():
+            yield from iterator
+            return
+        try:
+            while True:
+                self._profile.enable()
+                try:
+                    item = next(iterator)
+                except StopIteration:
+                    return
+                finally:
+                    self._profile.disable()
+                yield item
+        finally:
+            self._finish()
+
+    def dump(self) -> None:
+        os.makedirs(self._output_dir, exist_ok=True)
+        self._profile.dump_stats(self.output_path)
@@ -1,8 +1,8 @@
 from enum import Enum
-from typing import Annotated, Literal, Union
+from typing import Annotated, Any, Dict, List, Literal, Union
 
 from oltl.settings import BaseSettings as OltlBaseSettings
-from pydantic import DirectoryPath, Field
+from pydantic import DirectoryPath, Field, model_validator
 from pydantic_settings import SettingsConfigDict
 
 
@@ -10,9 +10,26 @@ class BaseSettings(OltlBaseSettings):
     model_config = SettingsConfigDict(env_prefix="OLS2T_")
 
 
+class BackpressurePolicy(str, Enum):
+    """
+    What the capture process does when the consumer falls behind and the chunk queue is full.
+
+    ``DROP_OLDEST`` and ``DROP_NEWEST`` discard a queued or the new chunk and keep recording. ``BLOCK`` stops reading
+    from the device until the queue has space; audio the device cannot buffer meanwhile overflows and is lost. All
+    lost audio, including a chunk abandoned when the stream stops, is counted as dropped.
+    """
+
+    BLOCK = "BLOCK"
+    DROP_OLDEST = "DROP_OLDEST"
+    DROP_NEWEST = "DROP_NEWEST"
+
+
 class SpeechToTextModelType(str, Enum):
     WHISPER = "WHISPER"
     SEGMENT_MERGING = "SEGMENT_MERGING"
+    STUB = "STUB"
+    REMOTE = "REMOTE"
+    SHARDED = "SHARDED"
 
 
 class WhisperSpeechToTextModelSize(str, Enum):
@@ -36,6 +53,7 @@ class WhisperSpeechToTextModelSize(str, Enum):
 
 
 class WhisperSpeechToTextModelLanguage(str, Enum):
+    AUTO = "auto"
     EN = "en"
     JA = "ja"
 
@@ -45,6 +63,44 @@ class WhisperSpeechToTextModelDevice(str, Enum):
     CUDA = "cuda"
 
 
+class WhisperSpeechToTextModelOutputGranularity(str, Enum):
+    """
+    ``word`` yields one Segment per word. ``segment`` yields one Segment per Whisper segment, carrying its words in
+    ``Segment.words`` when word timestamps are enabled.
+    """
+
+    WORD = "word"
+    SEGMENT = "segment"
+
+
+class WhisperSpeechToTextModelDecodingPreset(str, Enum):
+    """
+    Defaults for the decoding settings of Whisper. Settings given explicitly take precedence over the preset.
+
+    ``default`` uses faster-whisper's beam search with temperature fallback and word timestamps.
+    ``fast`` uses greedy decoding without fallback, conditioning or word alignment and ``segment`` output
+    granularity; it is meant for bulk jobs that only need the text of each segment.
+    """
+
+    DEFAULT = "default"
+    FAST = "fast"
+
+
+# Overrides of the field defaults of WhisperSpeechToTextModelSettings, which are the default preset.
+WHISPER_DECODING_PRESETS: Dict[WhisperSpeechToTextModelDecodingPreset, Dict[str, Any]] = {
+    WhisperSpeechToTextModelDecodingPreset.DEFAULT: {},
+    WhisperSpeechToTextModelDecodingPreset.FAST: {
+        "beam_size": 1,
+        "best_of": 1,
+        "temperature": [0.0],
+        "condition_on_previous_text": False,
+        "without_timestamps": False,
+        "word_timestamps": False,
+        "output_granularity": WhisperSpeechToTextModelOutputGranularity.SEGMENT,
+    },
+}
+
+
 class BaseSpeechToTextModelSettings(BaseSettings):
     type: SpeechToTextModelType
 
@@ -57,15 +113,84 @@ class WhisperSpeechToTextModelSettings(BaseSpeechToTextModelSettings):
     path_or_model_size: WhisperSpeechToTextModelPathOrModelSize
     language: WhisperSpeechToTextModelLanguage
     device: WhisperSpeechToTextModelDevice = WhisperSpeechToTextModelDevice.CPU
+    cpu_threads: int = 0
+    decoding_preset: WhisperSpeechToTextModelDecodingPreset = WhisperSpeechToTextModelDecodingPreset.DEFAULT
+    beam_size: int = 5
+    best_of: int = 5
+    temperature: List[float] = Field(default_factory=lambda: [0.0, 0.2, 0.4, 0.6, 0.8, 1.0])
+    condition_on_previous_text: bool = True
+    without_timestamps: bool = False
+    word_timestamps: bool = True
+    output_granularity: WhisperSpeechToTextModelOutputGranularity = WhisperSpeechToTextModelOutputGranularity.WORD
+
+    @model_validator(mode="before")
+    @classmethod
+    def apply_decoding_preset(cls, data: Any) -> Any:
+        """
+        >>> settings = WhisperSpeechToTextModelSettings(
+        ...     path_or_model_size="tiny", language="ja", decoding_preset="fast", condition_on_previous_text=True
+        ... )
+        >>> settings.beam_size, settings.temperature, settings.word_timestamps, settings.condition_on_previous_text
+        (1, [0.0], False, True)
+        """
+        if not isinstance(data, dict) or "decoding_preset" not in data:
+            return data
+        preset = WhisperSpeechToTextModelDecodingPreset(data["decoding_preset"])
+        return {**WHISPER_DECODING_PRESETS[preset], **data}
+
+    @model_validator(mode="after")
+    def check_word_granularity_has_word_timestamps(self) -> "WhisperSpeechToTextModelSettings":
+        """
+        >>> WhisperSpeechToTextModelSettings(path_or_model_size="tiny", language="ja", word_timestamps=False)
+        Traceback (most recent call last):
+        ...
+        pydantic_core._pydantic_core.ValidationError: 1 validation error for WhisperSpeechToTextModelSettings
+        ...
+        """
+        if self.output_granularity == WhisperSpeechToTextModelOutputGranularity.WORD and not self.word_timestamps:
+            raise ValueError("output_granularity=word requires word_timestamps=true")
+        return self
 
 
 class SegmentMergingSpeechToTextModelSettings(BaseSpeechToTextModelSettings):
     type: Literal[SpeechToTextModelType.SEGMENT_MERGING] = SpeechToTextModelType.SEGMENT_MERGING
     speech_to_text_model_settings: "SpeechToTextModelSettings"
+    buffer_length: int = Field(default=2, gt=0)
+    margin: float = Field(default=0.5, ge=0.0)
+    probability_threshold: float = Field(default=0.2, ge=0.0, le=1.0)
+    prompt_token_budget: int = 0
+    deduplication_tolerance: float | None = None
+
+
+class StubSpeechToTextModelSettings(BaseSpeechToTextModelSettings):
+    type: Literal[SpeechToTextModelType.STUB] = SpeechToTextModelType.STUB
+    delay: float = 0.0
+    real_time_factor: float = 0.0
+    text: str = "stub"
+
+
+class RemoteSpeechToTextModelSettings(BaseSpeechToTextModelSettings):
+    type: Literal[SpeechToTextModelType.REMOTE] = SpeechToTextModelType.REMOTE
+    addresses: List[str]
+    timeout: float | None = None
+
+
+class ShardedSpeechToTextModelSettings(BaseSpeechToTextModelSettings):
+    type: Literal[SpeechToTextModelType.SHARDED] = SpeechToTextModelType.SHARDED
+    speech_to_text_model_settings: "SpeechToTextModelSettings"
+    num_workers: int = 2
+    max_shard_seconds: float = 600.0
 
 
 SpeechToTextModelSettings = Annotated[
-    Union[WhisperSpeechToTextModelSettings, SegmentMergingSpeechToTextModelSettings], Field(discriminator="type")
+    Union[
+        WhisperSpeechToTextModelSettings,
+        SegmentMergingSpeechToTextModelSettings,
+        StubSpeechToTextModelSettings,
+        RemoteSpeechToTextModelSettings,
+        ShardedSpeechToTextModelSettings,
+    ],
+    Field(discriminator="type"),
 ]
 
 
@@ -76,6 +201,8 @@ class SpeechToTextCoreSettings(BaseSettings):
 class InterfaceType(str, Enum):
     CLI = "CLI"
     HTTP_API = "HTTP_API"
+    SOCKET_API = "SOCKET_API"
+    WATCH_FOLDER = "WATCH_FOLDER"
 
 
 class BaseInterfaceSettings(BaseSettings):
@@ -90,9 +217,42 @@ class HttpApiSettings(BaseInterfaceSettings):
     type: Literal[InterfaceType.HTTP_API] = InterfaceType.HTTP_API
     host: str = "0.0.0.0"
     port: int = 8000
-
-
-InterfaceSettings = Annotated[Union[CliSettings, HttpApiSettings], Field(discriminator="type")]
+    profile_output_dir: str | None = None
+    profile_header: str = "X-Ols2t-Profile"
+    profile_all_requests: bool = False
+    workers: int = 1
+    websocket_batch_segments: bool = False
+    websocket_flush_interval: float = Field(default=0.05, ge=0.0)
+    multiplex_workers: int = 4
+    multiplex_max_pending_streams: int = Field(default=16, ge=0)
+    multiplex_max_streams_per_connection: int = 256
+    multiplex_queue_size: int = Field(default=64, ge=1)
+    multiplex_backpressure: BackpressurePolicy = BackpressurePolicy.DROP_OLDEST
+
+
+class SocketApiSettings(BaseInterfaceSettings):
+    type: Literal[InterfaceType.SOCKET_API] = InterfaceType.SOCKET_API
+    host: str = "127.0.0.1"
+    port: int = 8001
+    unix_socket_path: str | None = None
+    max_workers: int = 4
+    max_pending_clients: int = Field(default=0, ge=0)
+
+
+class WatchFolderSettings(BaseInterfaceSettings):
+    type: Literal[InterfaceType.WATCH_FOLDER] = InterfaceType.WATCH_FOLDER
+    input_dir: DirectoryPath
+    patterns: List[str] = ["*.wav", "*.mp3", "*.m4a", "*.flac", "*.ogg", "*.opus", "*.webm", "*.mp4"]
+    poll_interval: float = 2.0
+    stable_seconds: float = 2.0
+    max_workers: int = 2
+    output_suffix: str = ".jsonl"
+    error_suffix: str = ".error"
+
+
+InterfaceSettings = Annotated[
+    Union[CliSettings, HttpApiSettings, SocketApiSettings, WatchFolderSettings], Field(discriminator="type")
+]
 
 
 class SpeechToTextAppSettings(BaseSettings):
@@ -0,0 +1,330 @@
+import asyncio
+import socket
+import struct
+import threading
+from collections.abc import Generator, Iterable
+from enum import IntEnum
+from types import TracebackType
+from typing import List, Tuple, Type
+
+from oltl import BaseModel
+from pydantic import Field, ValidationError
+
+from .models import Segment, SegmentMergingParameters, TranscriptionContext, Word
+from .types import PcmSampleFormat
+
+FRAME_HEADER = struct.Struct("<BI")
+CONFIG_HEADER = struct.Struct("<I")
+# start, end, probability, channel (-1 if none), number of words (-1 if none), text length
+SEGMENT_HEADER = struct.Struct("<dddiiI")
+# start, end, probability, text length
+WORD_HEADER = struct.Struct("<dddI")
+MAX_FRAME_SIZE = 16 * 1024 * 1024
+
+SocketAddress = str | Tuple[str, int]
+
+
+class FrameType(IntEnum):
+    """
+    Frame types of the ols2t socket protocol.
+
+    Every frame is a 5 byte header (frame type as uint8, payload length as uint32 LE) followed by the payload.
+    A client optionally sends ``CONFIG`` and ``CONTEXT``, then ``AUDIO`` frames of raw PCM and ``END``; the server
+    answers with ``SEGMENT`` frames and ``DONE``, or ``ERROR``. A connection may carry several transcriptions one after
+    another. ``CONTEXT`` carries :class:`TranscriptionOptions` as JSON.
+    """
+
+    CONFIG = 1
+    CONTEXT = 4
+    AUDIO = 2
+    END = 3
+    SEGMENT = 16
+    DONE = 17
+    ERROR = 18
+
+
+class SocketProtocolError(Exception):
+    pass
+
+
+def encode_frame(frame_type: FrameType, payload: bytes = b"") -> bytes:
+    """
+    >>> encode_frame(FrameType.AUDIO, b"pcm")
+    b'\\x02\\x03\\x00\\x00\\x00pcm'
+    """
+    return FRAME_HEADER.pack(frame_type, len(payload)) + payload
+
+
+def encode_config(sample_format: PcmSampleFormat, sampling_rate: int = 16000) -> bytes:
+    return CONFIG_HEADER.pack(sampling_rate) + sample_format.value.encode("ascii")
+
+
+def decode_config(payload: bytes) -> Tuple[PcmSampleFormat, int]:
+    """
+    >>> decode_config(encode_config(PcmSampleFormat.S16LE))
+    (<PcmSampleFormat.S16LE: 's16le'>, 16000)
+    """
+    if len(payload) < CONFIG_HEADER.size:
+        raise SocketProtocolError("CONFIG frame is too short")
+    (sampling_rate,) = CONFIG_HEADER.unpack_from(payload)
+    try:
+        return PcmSampleFormat(payload[CONFIG_HEADER.size :].decode("ascii")), sampling_rate
+    except (UnicodeDecodeError, ValueError) as e:
+        raise SocketProtocolError(f"Unsupported sample format in CONFIG frame: {e}")
+
+
+class TranscriptionOptions(BaseModel):
+    """
+    Per-transcription overrides a client sends in a ``CONTEXT`` frame.
+
+    >>> options = TranscriptionOptions.from_context(TranscriptionContext(language="ja", prompt="こんにちは"))
+    >>> options.model_dump_json()
+    '{"language":"ja","prompt":"こんにちは","prompt_token_budget":null,"segment_merging":{"buffer_length":null,"margin":null,"probability_threshold":null}}'
+    >>> options.to_context().language
+    'ja'
+    """  # noqa: E501
+
+    language: str | None = None
+    prompt: str | None = None
+    prompt_token_budget: int | None = Field(default=None, ge=0)
+    segment_merging: SegmentMergingParameters = Field(default_factory=SegmentMergingParameters)
+
+    @classmethod
+    def from_context(cls, context: TranscriptionContext) -> "TranscriptionOptions":
+        return cls(
+            language=context.language,
+            prompt=context.prompt,
+            prompt_token_budget=context.prompt_token_budget,
+            segment_merging=context.segment_merging_parameters,
+        )
+
+    def to_context(self) -> TranscriptionContext:
+        return TranscriptionContext(
+            language=self.language,
+            prompt=self.prompt,
+            prompt_token_budget=self.prompt_token_budget,
+            segment_merging_parameters=self.segment_merging,
+        )
+
+
+def encode_context(context: TranscriptionContext) -> bytes:
+    payload: str = TranscriptionOptions.from_context(context).model_dump_json()
+    return payload.encode("utf-8")
+
+
+def decode_context(payload: bytes) -> TranscriptionContext:
+    try:
+        options: TranscriptionOptions = TranscriptionOptions.model_validate_json(payload)
+    except ValidationError as e:
+        raise SocketProtocolError(f"Invalid CONTEXT frame: {e}")
+    return options.to_context()
+
+
+def encode_segment(segment: Segment) -> bytes:
+    text = segment.text.encode("utf-8")
+    channel = -1 if segment.channel is None else segment.channel
+    word_count = -1 if segment.words is None else len(segment.words)
+    parts = [SEGMENT_HEADER.pack(segment.start, segment.end, segment.probability, channel, word_count, len(text)), text]
+    for word in segment.words or []:
+        word_text = word.text.encode("utf-8")
+        parts += [WORD_HEADER.pack(word.start, word.end, word.probability, len(word_text)), word_text]
+    return b"".join(parts)
+
+
+def decode_segment(payload: bytes) -> Segment:
+    """
+    >>> decode_segment(encode_segment(Segment(text="こんにちは", start=0.0, end=2.0, probability=0.9)))
+    Segment(text='こんにちは', start=0.0, end=2.0, probability=0.9)
+    >>> segment = Segment(
+    ...     text="こんにちは", start=0.0, end=2.0, probability=0.9, channel=1,
+    ...     words=[Word(text="こんにちは", start=0.5, end=1.5, probability=0.9)],
+    ... )
+    >>> decode_segment(encode_segment(segment)) == segment
+    True
+    """
+    try:
+        start, end, probability, channel, word_count, text_length = SEGMENT_HEADER.unpack_from(payload)
+        offset = SEGMENT_HEADER.size
+        text = payload[offset : offset + text_length].decode("utf-8")
+        offset += text_length
+        words: List[Word] | None = None
+        if word_count >= 0:
+            words = []
+            for _ in range(word_count):
+                word_start, word_end, word_probability, word_length = WORD_HEADER.unpack_from(payload, offset)
+                offset += WORD_HEADER.size
+                word_text = payload[offset : offset + word_length].decode("utf-8")
+                offset += word_length
+                words.append(Word(text=word_text, start=word_start, end=word_end, probability=word_probability))
+    except (struct.error, UnicodeDecodeError) as e:
+        raise SocketProtocolError(f"Malformed SEGMENT frame: {e}")
+    if offset != len(payload):
+        raise SocketProtocolError("Malformed SEGMENT frame: length does not match its contents")
+    return Segment(
+        text=text,
+        start=start,
+        end=end,
+        probability=probability,
+        words=words,
+        channel=None if channel < 0 else channel,
+    )
+
+
+def _parse_header(header: bytes) -> Tuple[FrameType, int]:
+    frame_type, length = FRAME_HEADER.unpack(header)
+    if length > MAX_FRAME_SIZE:
+        raise SocketProtocolError(f"Frame of {length} bytes exceeds the limit of {MAX_FRAME_SIZE} bytes")
+    try:
+        return FrameType(frame_type), length
+    except ValueError:
+        raise SocketProtocolError(f"Unknown frame type: {frame_type}")
+
+
+async def read_frame(reader: asyncio.StreamReader) -> Tuple[FrameType, bytes] | None:
+    """Read one frame, or return ``None`` if the peer closed the connection between frames."""
+    try:
+        header = await reader.readexactly(FRAME_HEADER.size)
+    except asyncio.IncompleteReadError as e:
+        if len(e.partial) == 0:
+            return None
+        raise SocketProtocolError("Connection closed in the middle of a frame header")
+    frame_type, length = _parse_header(header)
+    try:
+        return frame_type, await reader.readexactly(length)
+    except asyncio.IncompleteReadError:
+        raise SocketProtocolError("Connection closed in the middle of a frame payload")
+
+
+def _recv_exactly(sock: socket.socket, size: int) -> bytes:
+    buffer = bytearray(size)
+    view = memoryview(buffer)
+    received = 0
+    while received < size:
+        n = sock.recv_into(view[received:])
+        if n == 0:
+            raise SocketProtocolError("Connection closed by the server")
+        received += n
+    return bytes(buffer)
+
+
+def recv_frame(sock: socket.socket) -> Tuple[FrameType, bytes]:
+    frame_type, length = _parse_header(_recv_exactly(sock, FRAME_HEADER.size))
+    return frame_type, _recv_exactly(sock, length)
+
+
+def parse_socket_address(value: str) -> SocketAddress:
+    """
+    >>> parse_socket_address("unix:/run/ols2t/model.sock")
+    '/run/ols2t/model.sock'
+    >>> parse_socket_address("127.0.0.1:8001")
+    ('127.0.0.1', 8001)
+    """
+    if value.startswith("unix:"):
+        return value[len("unix:") :]
+    host, separator, port = value.rpartition(":")
+    if not separator or not port.isdigit():
+        raise ValueError(f"Socket address must be 'unix:PATH' or 'HOST:PORT': {value}")
+    return host.strip("[]"), int(port)
+
+
+def connect(address: SocketAddress, timeout: float | None = None) -> socket.socket:
+    """Connect to ``(host, port)`` over TCP or to a path over a Unix domain socket."""
+    if isinstance(address, str):
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.settimeout(timeout)
+        sock.connect(address)
+        return sock
+    sock = socket.create_connection(address, timeout=timeout)
+    sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+    return sock
+
+
+class SocketApiClient:
+    """
+    Blocking client of :class:`ols2t.interfaces.socket_api.SocketApi`.
+
+    Audio is sent from a background thread while segments are yielded as they arrive.
+    """
+
+    def __init__(
+        self,
+        address: SocketAddress,
+        sample_format: PcmSampleFormat = PcmSampleFormat.F32LE,
+        timeout: float | None = None,
+    ) -> None:
+        self._address = address
+        self._sample_format = sample_format
+        self._timeout = timeout
+        self._socket: socket.socket | None = None
+
+    @property
+    def address(self) -> SocketAddress:
+        return self._address
+
+    @property
+    def sample_format(self) -> PcmSampleFormat:
+        return self._sample_format
+
+    def __enter__(self) -> "SocketApiClient":
+        return self
+
+    def __exit__(
+        self, exc_type: Type[BaseException] | None, exc_value: BaseException | None, traceback: TracebackType | None
+    ) -> None:
+        self.close()
+
+    def _connection(self) -> socket.socket:
+        if self._socket is None:
+            self._socket = connect(self._address, timeout=self._timeout)
+        return self._socket
+
+    def close(self) -> None:
+        if self._socket is not None:
+            self._socket.close()
+            self._socket = None
+
+    def transcribe(
+        self, chunks: Iterable[bytes], context: TranscriptionContext | None = None
+    ) -> Generator[Segment, None, None]:
+        """
+        Transcribe PCM ``chunks`` on the server.
+
+        The language, prompt and segment merging parameters of ``context`` are sent along, so the server transcribes
+        with the same overrides.
+        """
+        sock = self._connection()
+        send_error: BaseException | None = None
+
+        def send() -> None:
+            nonlocal send_error
+            try:
+                sock.sendall(encode_frame(FrameType.CONFIG, encode_config(self._sample_format)))
+                if context is not None:
+                    sock.sendall(encode_frame(FrameType.CONTEXT, encode_context(context)))
+                for chunk in chunks:
+                    if len(chunk) > 0:
+                        sock.sendall(encode_frame(FrameType.AUDIO, chunk))
+                sock.sendall(encode_frame(FrameType.END))
+            except BaseException as e:
+                send_error = e
+
+        sender = threading.Thread(target=send, daemon=True)
+        sender.start()
+        try:
+            while True:
+                frame_type, payload = recv_frame(sock)
+                if frame_type == FrameType.SEGMENT:
+                    yield decode_segment(payload)
+                elif frame_type == FrameType.DONE:
+                    break
+                elif frame_type == FrameType.ERROR:
+                    raise SocketProtocolError(payload.decode("utf-8", errors="replace"))
+                else:
+                    raise SocketProtocolError(f"Unexpected frame from the server: {frame_type.name}")
+        except BaseException:
+            self.close()
+            raise
+        finally:
+            sender.join()
+        if send_error is not None:
+            raise send_error
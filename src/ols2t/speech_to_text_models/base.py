@@ -1,10 +1,27 @@
 from abc import ABC, abstractmethod
 from collections.abc import Generator
+from types import TracebackType
+from typing import Type, TypeVar
 
-from ..models import BaseStream, Segment
+from ..models import BaseStream, Segment, TranscriptionContext
+
+SpeechToTextModelT = TypeVar("SpeechToTextModelT", bound="BaseSpeechToTextModel")
 
 
 class BaseSpeechToTextModel(ABC):
     @abstractmethod
-    def transcribe(self, input_stream: BaseStream) -> Generator[Segment, None, None]:
+    def transcribe(
+        self, input_stream: BaseStream, context: TranscriptionContext | None = None
+    ) -> Generator[Segment, None, None]:
         raise NotImplementedError
+
+    def close(self) -> None:
+        """Release resources held across transcriptions, e.g. worker processes. Models may be used again after."""
+
+    def __enter__(self: SpeechToTextModelT) -> SpeechToTextModelT:
+        return self
+
+    def __exit__(
+        self, exc_type: Type[BaseException] | None, exc_value: BaseException | None, traceback: TracebackType | None
+    ) -> None:
+        self.close()
@@ -1,10 +1,16 @@
 from ..settings import (
+    RemoteSpeechToTextModelSettings,
     SegmentMergingSpeechToTextModelSettings,
+    ShardedSpeechToTextModelSettings,
     SpeechToTextModelSettings,
+    StubSpeechToTextModelSettings,
     WhisperSpeechToTextModelSettings,
 )
 from .base import BaseSpeechToTextModel
+from .remote import RemoteSpeechToTextModel
 from .segment_merging import SegmentMergingSpeechToTextModel
+from .sharded import ShardedSpeechToTextModel
+from .stub import StubSpeechToTextModel
 from .whisper import WhisperSpeechToTextModel
 
 
@@ -14,8 +20,35 @@ def create_speech_to_text_model(settings: SpeechToTextModelSettings) -> BaseSpee
             path_or_model_size=settings.path_or_model_size,
             language=settings.language,
             device=settings.device,
+            cpu_threads=settings.cpu_threads,
+            beam_size=settings.beam_size,
+            best_of=settings.best_of,
+            temperature=settings.temperature,
+            condition_on_previous_text=settings.condition_on_previous_text,
+            without_timestamps=settings.without_timestamps,
+            word_timestamps=settings.word_timestamps,
+            output_granularity=settings.output_granularity,
         )
     elif isinstance(settings, SegmentMergingSpeechToTextModelSettings):
         model = create_speech_to_text_model(settings=settings.speech_to_text_model_settings)
-        return SegmentMergingSpeechToTextModel(model=model)
+        return SegmentMergingSpeechToTextModel(
+            model=model,
+            buffer_length=settings.buffer_length,
+            margin=settings.margin,
+            probability_threshold=settings.probability_threshold,
+            prompt_token_budget=settings.prompt_token_budget,
+            deduplication_tolerance=settings.deduplication_tolerance,
+        )
+    elif isinstance(settings, StubSpeechToTextModelSettings):
+        return StubSpeechToTextModel(
+            delay=settings.delay, real_time_factor=settings.real_time_factor, text=settings.text
+        )
+    elif isinstance(settings, RemoteSpeechToTextModelSettings):
+        return RemoteSpeechToTextModel(addresses=settings.addresses, timeout=settings.timeout)
+    elif isinstance(settings, ShardedSpeechToTextModelSettings):
+        return ShardedSpeechToTextModel(
+            speech_to_text_model_settings=settings.speech_to_text_model_settings,
+            num_workers=settings.num_workers,
+            max_shard_seconds=settings.max_shard_seconds,
+        )
     raise ValueError(f"Unknown model type: {settings.type}")
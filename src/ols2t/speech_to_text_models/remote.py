@@ -0,0 +1,52 @@
+import itertools
+from collections.abc import Generator
+from typing import List
+
+import numpy as np
+
+from ..models import BaseStream, Segment, TranscriptionContext
+from ..socket_protocol import SocketApiClient, parse_socket_address
+from ..types import PcmSampleFormat
+from .base import BaseSpeechToTextModel
+
+
+class RemoteSpeechToTextModel(BaseSpeechToTextModel):
+    """
+    Delegates transcription to model servers running :class:`ols2t.interfaces.socket_api.SocketApi`.
+
+    Model weights are then loaded only by the model servers, however many front-end processes use this model.
+    Each transcription opens a connection to the next address in round-robin order. The language, prompt and segment
+    merging parameters of the context are forwarded to the model server; the language it detects is not sent back.
+    """
+
+    def __init__(self, addresses: List[str], timeout: float | None = None) -> None:
+        super(RemoteSpeechToTextModel, self).__init__()
+        if len(addresses) == 0:
+            raise ValueError("RemoteSpeechToTextModel needs at least one model server address")
+        self._addresses = list(addresses)
+        self._timeout = timeout
+        self._counter = itertools.count()
+
+    @property
+    def addresses(self) -> List[str]:
+        return list(self._addresses)
+
+    @property
+    def timeout(self) -> float | None:
+        return self._timeout
+
+    def transcribe(
+        self, input_stream: BaseStream, context: TranscriptionContext | None = None
+    ) -> Generator[Segment, None, None]:
+        context = context or TranscriptionContext()
+        address = parse_socket_address(self._addresses[next(self._counter) % len(self._addresses)])
+        with input_stream as chunks, context.on_cancel(chunks.stop):
+            if chunks.sampling_rate != 16000:
+                raise ValueError(f"Model servers expect 16000 Hz audio, got {chunks.sampling_rate} Hz")
+            with SocketApiClient(address, sample_format=PcmSampleFormat.F32LE, timeout=self.timeout) as client:
+                pcm = (np.asarray(chunk, dtype="<f4").tobytes() for chunk in chunks)
+                for segment in client.transcribe(pcm, context=context):
+                    if context.cancelled:
+                        # Leaving the client closes the connection, which the server treats as a cancellation.
+                        return
+                    yield segment
@@ -1,23 +1,55 @@
+import unicodedata
+from collections import deque
 from collections.abc import Generator
-from typing import List
+from typing import Deque, List
 
-from ..models import AudioFrameStream, BaseStream, Segment
+from ..metrics import PipelineStage, Stopwatch, pipeline_metrics
+from ..models import AudioFrameStream, BaseStream, Segment, TranscriptionContext
 from ..types import AudioFrameChunk
 from .base import BaseSpeechToTextModel
 
 
+def normalize_segment_text(text: str) -> str:
+    """
+    Normalize the text of a segment for duplicate detection.
+
+    >>> normalize_segment_text(" Hello,")
+    'hello'
+    >>> normalize_segment_text("ＡＢＣ。")
+    'abc'
+    >>> normalize_segment_text('"quoted"')
+    'quoted'
+    """
+    normalized = unicodedata.normalize("NFKC", text).strip().casefold()
+    punctuation = "".join(c for c in set(normalized) if unicodedata.category(c).startswith("P"))
+    return normalized.strip(punctuation).strip()
+
+
 class SegmentMergingSpeechToTextModel(BaseSpeechToTextModel):
-    def __init__(self, model: BaseSpeechToTextModel):
+    def __init__(
+        self,
+        model: BaseSpeechToTextModel,
+        buffer_length: int = 2,
+        margin: float = 0.5,
+        probability_threshold: float = 0.2,
+        prompt_token_budget: int = 0,
+        deduplication_tolerance: float | None = None,
+    ):
         super(SegmentMergingSpeechToTextModel, self).__init__()
         self._model = model
-        self._buffer_length = 2
-        self._margin = 0.5
-        self._probability_threshold = 0.2
+        self._prompt_token_budget = prompt_token_budget
+        self._deduplication_tolerance = deduplication_tolerance
+        self._buffer_length = buffer_length
+        self._margin = margin
+        self._probability_threshold = probability_threshold
 
     @property
     def model(self) -> BaseSpeechToTextModel:
         return self._model
 
+    def close(self) -> None:
+        self.model.close()
+
     @property
     def buffer_length(self) -> int:
         return self._buffer_length
@@ -30,43 +62,95 @@ class SegmentMergingSpeechToTextModel(BaseSpeechToTextModel):
     def probability_threshold(self) -> float:
         return self._probability_threshold
 
-    def transcribe(self, input_stream: BaseStream) -> Generator[Segment, None, None]:
+    @property
+    def prompt_token_budget(self) -> int:
+        return self._prompt_token_budget
+
+    @property
+    def deduplication_tolerance(self) -> float | None:
+        return self._deduplication_tolerance
+
+    def transcribe(
+        self, input_stream: BaseStream, context: TranscriptionContext | None = None
+    ) -> Generator[Segment, None, None]:
+        # Every sliding window is re-decoded by the inner model; sharing one context lets it keep per-stream
+        # decisions (e.g. the detected language) across windows.
+        context = context or TranscriptionContext()
+        if context.prompt_token_budget is None:
+            context.prompt_token_budget = self.prompt_token_budget
+        overrides = context.segment_merging_parameters
+        buffer_length = overrides.buffer_length or self.buffer_length
+        margin = self.margin if overrides.margin is None else overrides.margin
+        probability_threshold = (
+            self.probability_threshold if overrides.probability_threshold is None else overrides.probability_threshold
+        )
+        # Each segment is at least one token, so this many segments always cover the budget.
+        confirmed: Deque[Segment] = deque(maxlen=context.prompt_token_budget)
         chunk_buffer: List[AudioFrameChunk] = []
         segment_buffer: List[Segment] = []
         offset = 0.0
-        with input_stream as chunks:
+        with input_stream as chunks, context.on_cancel(chunks.stop):
             for chunk in chunks:
+                if context.cancelled:
+                    return
                 chunk_buffer.append(chunk)
-                if len(chunk_buffer) > self.buffer_length:
+                if len(chunk_buffer) > buffer_length:
                     x = chunk_buffer.pop(0)
                     offset += len(x) / chunks.sampling_rate
                 for segment in self.model.transcribe(
-                    AudioFrameStream(chunks=chunk_buffer.copy(), sampling_rate=chunks.sampling_rate)
+                    AudioFrameStream(chunks=chunk_buffer.copy(), sampling_rate=chunks.sampling_rate), context=context
                 ):
-                    if segment.probability < self.probability_threshold:
+                    if segment.probability < probability_threshold:
                         continue
-                    segment_buffer.append(
-                        Segment(
-                            start=segment.start + offset,
-                            end=segment.end + offset,
-                            probability=segment.probability,
-                            text=segment.text,
-                        )
-                    )
+                    self.add_segment(segment_buffer, segment.shifted(offset))
                 current_best = self.merge_segments(segment_buffer)
                 for segment in current_best:
-                    if segment.end < offset - self.margin:
+                    if segment.end < offset - margin:
+                        pipeline_metrics.count_segments(PipelineStage.MERGE_SEGMENTS)
+                        confirmed.append(segment)
                         yield segment
                     else:
                         break
-                segment_buffer = [segment for segment in segment_buffer if segment.end >= offset - self.margin]
+                if confirmed:
+                    context.prompt = "".join(segment.text for segment in confirmed)
+                segment_buffer = [segment for segment in segment_buffer if segment.end >= offset - margin]
+        if context.cancelled:
+            return
         for segment in self.merge_segments(segment_buffer):
+            pipeline_metrics.count_segments(PipelineStage.MERGE_SEGMENTS)
             yield segment
 
+    def add_segment(self, segment_buffer: List[Segment], segment: Segment) -> None:
+        """
+        Add ``segment`` to ``segment_buffer``.
+
+        With ``deduplication_tolerance`` set, a segment with the same normalized text as a buffered one whose start and
+        end are both within the tolerance is treated as the same word seen by another window: only the instance with
+        the higher weight is kept.
+        """
+        if self.deduplication_tolerance is not None:
+            text = normalize_segment_text(segment.text)
+            for i, buffered in enumerate(segment_buffer):
+                if (
+                    abs(buffered.start - segment.start) <= self.deduplication_tolerance
+                    and abs(buffered.end - segment.end) <= self.deduplication_tolerance
+                    and normalize_segment_text(buffered.text) == text
+                ):
+                    if self.compute_segment_weight(segment) > self.compute_segment_weight(buffered):
+                        segment_buffer[i] = segment
+                    return
+        segment_buffer.append(segment)
+
     def compute_segment_weight(self, segment: Segment) -> float:
         return (segment.end - segment.start) * segment.probability
 
     def merge_segments(self, segments: List[Segment]) -> List[Segment]:
+        with Stopwatch() as stopwatch:
+            merged = self._merge_segments(segments)
+        pipeline_metrics.observe_stage(PipelineStage.MERGE_SEGMENTS, stopwatch.elapsed)
+        return merged
+
+    def _merge_segments(self, segments: List[Segment]) -> List[Segment]:
         if len(segments) == 0:
             return []
         segments.sort(key=lambda x: x.end)
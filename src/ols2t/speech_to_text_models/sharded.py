@@ -0,0 +1,151 @@
+import math
+import multiprocessing
+from collections.abc import Generator, Sequence
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Tuple
+
+import numpy as np
+from faster_whisper.vad import VadOptions, get_speech_timestamps
+from numpy.typing import NDArray
+
+from ..models import AudioFrameStream, BaseStream, Segment, TranscriptionContext
+from ..settings import SpeechToTextModelSettings
+from ..types import AudioFrameChunk
+from .base import BaseSpeechToTextModel
+
+_worker_model: BaseSpeechToTextModel | None = None
+
+
+def plan_shards(
+    speech_timestamps: Sequence[Dict[str, int]], total_samples: int, num_shards: int
+) -> List[Tuple[int, int]]:
+    """
+    Split ``[0, total_samples)`` into ``num_shards`` ranges of roughly equal length, cutting only in silences.
+
+    Each cut is placed in the middle of the silence closest to the ideal equal-length cut. Fewer shards are returned
+    when there are not enough silences.
+
+    >>> speech = [{"start": 0, "end": 30}, {"start": 40, "end": 70}, {"start": 90, "end": 100}]
+    >>> plan_shards(speech, total_samples=100, num_shards=2)
+    [(0, 35), (35, 100)]
+    >>> plan_shards(speech, total_samples=100, num_shards=3)
+    [(0, 35), (35, 80), (80, 100)]
+    >>> plan_shards([{"start": 0, "end": 100}], total_samples=100, num_shards=4)
+    [(0, 100)]
+    """
+    silences = [(a["end"] + b["start"]) // 2 for a, b in zip(speech_timestamps, speech_timestamps[1:])]
+    cuts: List[int] = []
+    for k in range(1, num_shards):
+        ideal = total_samples * k / num_shards
+        candidates = [c for c in silences if c > (cuts[-1] if cuts else 0)]
+        if not candidates:
+            break
+        cuts.append(min(candidates, key=lambda c: abs(c - ideal)))
+    bounds = [0, *sorted(set(cuts)), total_samples]
+    return [(start, end) for start, end in zip(bounds, bounds[1:]) if end > start]
+
+
+def _initialize_worker(settings: SpeechToTextModelSettings) -> None:
+    from .factory import create_speech_to_text_model
+
+    global _worker_model
+    _worker_model = create_speech_to_text_model(settings=settings)
+
+
+def _transcribe_shard(
+    audio: NDArray[np.float32], sampling_rate: int, offset: float, language: str | None
+) -> List[Segment]:
+    if _worker_model is None:
+        raise RuntimeError("Shard worker was not initialized")
+    stream = AudioFrameStream(chunks=[AudioFrameChunk(audio)], sampling_rate=sampling_rate)
+    context = TranscriptionContext(language=language)
+    return [segment.shifted(offset) for segment in _worker_model.transcribe(input_stream=stream, context=context)]
+
+
+class ShardedSpeechToTextModel(BaseSpeechToTextModel):
+    """
+    Transcribes long audio by splitting it at silences into shards that are transcribed in parallel processes.
+
+    VAD runs once over the whole input, so all chunks of the input stream are concatenated in memory first; memory use
+    grows with the length of the input even for a memory-mapped :class:`ols2t.models.PcmFileStream`. Every worker
+    process builds its own model from ``speech_to_text_model_settings``, so the thread budget of each worker is set
+    there (e.g. ``cpu_threads`` of Whisper). Segments are shifted to global time and yielded in order.
+    """
+
+    def __init__(
+        self,
+        speech_to_text_model_settings: SpeechToTextModelSettings,
+        num_workers: int = 2,
+        max_shard_seconds: float = 600.0,
+    ) -> None:
+        super(ShardedSpeechToTextModel, self).__init__()
+        self._speech_to_text_model_settings = speech_to_text_model_settings
+        self._num_workers = num_workers
+        self._max_shard_seconds = max_shard_seconds
+        self._executor: ProcessPoolExecutor | None = None
+
+    @property
+    def speech_to_text_model_settings(self) -> SpeechToTextModelSettings:
+        return self._speech_to_text_model_settings
+
+    @property
+    def num_workers(self) -> int:
+        return self._num_workers
+
+    @property
+    def max_shard_seconds(self) -> float:
+        return self._max_shard_seconds
+
+    @property
+    def executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.num_workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_initialize_worker,
+                initargs=(self.speech_to_text_model_settings,),
+            )
+        return self._executor
+
+    def close(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(cancel_futures=True)
+            self._executor = None
+
+    def shard(self, audio: NDArray[np.float32], sampling_rate: int) -> List[Tuple[int, int]]:
+        total_seconds = len(audio) / sampling_rate
+        num_shards = max(self.num_workers, math.ceil(total_seconds / self.max_shard_seconds))
+        speech_timestamps = get_speech_timestamps(
+            audio, VadOptions(min_silence_duration_ms=300, speech_pad_ms=0), sampling_rate=sampling_rate
+        )
+        return plan_shards(speech_timestamps, total_samples=len(audio), num_shards=num_shards)
+
+    def transcribe(
+        self, input_stream: BaseStream, context: TranscriptionContext | None = None
+    ) -> Generator[Segment, None, None]:
+        context = context or TranscriptionContext()
+        with input_stream as chunks, context.on_cancel(chunks.stop):
+            sampling_rate = chunks.sampling_rate
+            parts = list(chunks)
+        if len(parts) == 0 or context.cancelled:
+            return
+        audio = np.concatenate(parts).astype(np.float32, copy=False)
+        futures = [
+            self.executor.submit(
+                _transcribe_shard,
+                audio[start:end],
+                sampling_rate,
+                start / sampling_rate,
+                context.language,
+            )
+            for start, end in self.shard(audio, sampling_rate)
+        ]
+        try:
+            for future in futures:
+                shard = future.result()
+                if context.cancelled:
+                    return
+                yield from shard
+        finally:
+            for future in futures:
+                future.cancel()
@@ -0,0 +1,41 @@
+import time
+from collections.abc import Generator
+
+from ..models import BaseStream, Segment, TranscriptionContext
+from .base import BaseSpeechToTextModel
+
+
+class StubSpeechToTextModel(BaseSpeechToTextModel):
+    """Emits one fixed segment per input chunk after an artificial delay, for testing transports without a model."""
+
+    def __init__(self, delay: float = 0.0, real_time_factor: float = 0.0, text: str = "stub") -> None:
+        super(StubSpeechToTextModel, self).__init__()
+        self._delay = delay
+        self._real_time_factor = real_time_factor
+        self._text = text
+
+    @property
+    def delay(self) -> float:
+        return self._delay
+
+    @property
+    def real_time_factor(self) -> float:
+        return self._real_time_factor
+
+    @property
+    def text(self) -> str:
+        return self._text
+
+    def transcribe(
+        self, input_stream: BaseStream, context: TranscriptionContext | None = None
+    ) -> Generator[Segment, None, None]:
+        context = context or TranscriptionContext()
+        with input_stream as chunks, context.on_cancel(chunks.stop):
+            for chunk in chunks:
+                if context.cancelled:
+                    return
+                duration = len(chunk) / chunks.sampling_rate
+                wait = self.delay + self.real_time_factor * duration
+                if wait > 0:
+                    time.sleep(wait)
+                yield Segment(text=self.text, start=chunks.offset - duration, end=chunks.offset, probability=1.0)
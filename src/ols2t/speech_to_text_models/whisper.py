@@ -1,12 +1,16 @@
-from collections.abc import Generator
+import math
+from collections.abc import Generator, Sequence
+from typing import List
 
 from faster_whisper import WhisperModel
 
-from ols2t.models import BaseStream, Segment
+from ols2t.models import BaseStream, Segment, TranscriptionContext, Word
 
+from ..metrics import PipelineStage, Stopwatch, pipeline_metrics
 from ..settings import (
     WhisperSpeechToTextModelDevice,
     WhisperSpeechToTextModelLanguage,
+    WhisperSpeechToTextModelOutputGranularity,
     WhisperSpeechToTextModelPathOrModelSize,
     WhisperSpeechToTextModelSize,
 )
@@ -19,11 +23,29 @@ class WhisperSpeechToTextModel(BaseSpeechToTextModel):
         path_or_model_size: WhisperSpeechToTextModelPathOrModelSize,
         language: WhisperSpeechToTextModelLanguage,
         device: WhisperSpeechToTextModelDevice = WhisperSpeechToTextModelDevice.CPU,
+        cpu_threads: int = 0,
+        beam_size: int = 5,
+        best_of: int = 5,
+        temperature: Sequence[float] = (0.0, 0.2, 0.4, 0.6, 0.8, 1.0),
+        condition_on_previous_text: bool = True,
+        without_timestamps: bool = False,
+        word_timestamps: bool = True,
+        output_granularity: WhisperSpeechToTextModelOutputGranularity = WhisperSpeechToTextModelOutputGranularity.WORD,
     ):
+        if output_granularity == WhisperSpeechToTextModelOutputGranularity.WORD and not word_timestamps:
+            raise ValueError("output_granularity=word requires word_timestamps=True")
         self._path_or_model_size = path_or_model_size
         self._language = language
         self._model_cache: WhisperModel | None = None
         self._device = device
+        self._cpu_threads = cpu_threads
+        self._beam_size = beam_size
+        self._best_of = best_of
+        self._temperature = list(temperature)
+        self._condition_on_previous_text = condition_on_previous_text
+        self._without_timestamps = without_timestamps
+        self._word_timestamps = word_timestamps
+        self._output_granularity = output_granularity
 
     @property
     def model_cache(self) -> WhisperModel:
@@ -35,24 +57,107 @@ class WhisperSpeechToTextModel(BaseSpeechToTextModel):
                     else str(self._path_or_model_size)
                 ),
                 device=self._device.value,
+                cpu_threads=self._cpu_threads,
             )
         return self._model_cache
 
-    def transcribe(self, input_stream: BaseStream) -> Generator[Segment, None, None]:
-        with input_stream as s:
+    @property
+    def word_timestamps(self) -> bool:
+        return self._word_timestamps
+
+    @property
+    def output_granularity(self) -> WhisperSpeechToTextModelOutputGranularity:
+        return self._output_granularity
+
+    def prompt_tokens(self, context: TranscriptionContext) -> List[int] | None:
+        """The last ``context.prompt_token_budget`` tokens of the confirmed text, used as ``initial_prompt``."""
+        if not context.prompt or context.prompt_token_budget is None or context.prompt_token_budget <= 0:
+            return None
+        tokens: List[int] = self.model_cache.hf_tokenizer.encode(
+            " " + context.prompt.strip(), add_special_tokens=False
+        ).ids
+        return tokens[-context.prompt_token_budget :]
+
+    def transcribe(
+        self, input_stream: BaseStream, context: TranscriptionContext | None = None
+    ) -> Generator[Segment, None, None]:
+        """
+        With ``language=auto`` the language is detected on the first voiced chunk and kept in ``context`` for the rest
+        of the stream. Cancelling ``context`` stops decoding at the next segment.
+
+        Each chunk is decoded on its own and its segments are shifted by the chunk's start, so times are relative to
+        the start of the stream. Words spanning a chunk boundary may be cut; the segment merging model avoids this by
+        re-decoding overlapping windows.
+        """
+        context = context or TranscriptionContext()
+        if self._language != WhisperSpeechToTextModelLanguage.AUTO:
+            context.language = self._language.value
+        with input_stream as s, context.on_cancel(s.stop):
+            chunk_start = 0
             for chunk in s:
-                segments, _ = self.model_cache.transcribe(
-                    chunk,
-                    language=self._language.value,
-                    word_timestamps=True,
-                    vad_filter=True,
-                    vad_parameters={
-                        "threshold": 0.2,
-                        "min_speech_duration_ms": 10,
-                        "max_speech_duration_s": 20,
-                        "min_silence_duration_ms": 100,
-                    },
-                )
-                for segment in segments:
-                    for word in segment.words:
-                        yield Segment(start=word.start, end=word.end, text=word.word, probability=word.probability)
+                offset = chunk_start / s.sampling_rate
+                chunk_start += len(chunk)
+                stopwatch = Stopwatch()
+                try:
+                    with stopwatch:
+                        segments, info = self.model_cache.transcribe(
+                            chunk,
+                            language=context.language,
+                            initial_prompt=self.prompt_tokens(context),
+                            beam_size=self._beam_size,
+                            best_of=self._best_of,
+                            temperature=self._temperature,
+                            condition_on_previous_text=self._condition_on_previous_text,
+                            without_timestamps=self._without_timestamps,
+                            word_timestamps=self._word_timestamps,
+                            vad_filter=True,
+                            vad_parameters={
+                                "threshold": 0.2,
+                                "min_speech_duration_ms": 10,
+                                "max_speech_duration_s": 20,
+                                "min_silence_duration_ms": 100,
+                            },
+                        )
+                    if context.language is None and info.duration_after_vad > 0:
+                        context.language = info.language
+                    for segment in stopwatch.iterate(segments):
+                        # faster-whisper decodes lazily, so returning here also stops the inference.
+                        if context.cancelled:
+                            return
+                        if (
+                            self.output_granularity == WhisperSpeechToTextModelOutputGranularity.WORD
+                            and segment.words is not None
+                        ):
+                            pipeline_metrics.count_segments(PipelineStage.MODEL_TRANSCRIBE, len(segment.words))
+                            for word in segment.words:
+                                yield Segment(
+                                    start=word.start + offset,
+                                    end=word.end + offset,
+                                    text=word.word,
+                                    probability=word.probability,
+                                )
+                            continue
+                        pipeline_metrics.count_segments(PipelineStage.MODEL_TRANSCRIBE)
+                        yield Segment(
+                            start=segment.start + offset,
+                            end=segment.end + offset,
+                            text=segment.text,
+                            probability=math.exp(segment.avg_logprob),
+                            words=(
+                                None
+                                if segment.words is None
+                                else [
+                                    Word(
+                                        text=w.word,
+                                        start=w.start + offset,
+                                        end=w.end + offset,
+                                        probability=w.probability,
+                                    )
+                                    for w in segment.words
+                                ]
+                            ),
+                        )
+                finally:
+                    pipeline_metrics.observe_stage(
+                        PipelineStage.MODEL_TRANSCRIBE, stopwatch.elapsed, audio_seconds=len(chunk) / s.sampling_rate
+                    )
@@ -1,5 +1,5 @@
-import time
 from base64 import b64decode
+from enum import Enum
 from io import BytesIO
 from multiprocessing import Queue as MPQueue
 from multiprocessing.synchronize import Event as EventClass
@@ -72,8 +72,34 @@ class AudioFrameChunk(NDArray[AudioSample]):
         return cast(List[float], self.tolist())
 
 
+class PcmSampleFormat(str, Enum):
+    F32LE = "f32le"
+    S16LE = "s16le"
+
+    @property
+    def sample_width(self) -> int:
+        return 4 if self == PcmSampleFormat.F32LE else 2
+
+
+def pcm_to_audio_frame_chunk(data: bytes | memoryview, sample_format: PcmSampleFormat) -> AudioFrameChunk:
+    r"""
+    Convert raw little-endian PCM into an AudioFrameChunk. float32 input is viewed without copying.
+
+    >>> pcm_to_audio_frame_chunk(b'\x00\x00\x80?\x00\x00\x00@', PcmSampleFormat.F32LE)
+    AudioFrameChunk([1., 2.], dtype=float32)
+    >>> pcm_to_audio_frame_chunk(b'\x00\x40\x00\xc0', PcmSampleFormat.S16LE)
+    AudioFrameChunk([ 0.5, -0.5], dtype=float32)
+    """
+    if sample_format == PcmSampleFormat.F32LE:
+        return np.frombuffer(data, dtype="<f4").view(AudioFrameChunk)
+    samples = np.frombuffer(data, dtype="<i2").astype(AudioSample)
+    samples *= 1.0 / 32768.0
+    return samples.view(AudioFrameChunk)
+
+
 class ContinuousBufferReader(BytesIO):
     """
+    >>> import time
     >>> from multiprocessing import Process
     >>> from multiprocessing import Event as MPEvent
     >>> queue = MPQueue(maxsize=256)
@@ -94,26 +120,46 @@ class ContinuousBufferReader(BytesIO):
     >>> stop_event.set()
     >>> reader.read(30)
     b'45678901234567890'
+
+    A ``None`` chunk marks the end of the stream without waiting for ``stop_event``:
+
+    >>> reader = ContinuousBufferReader(queue, MPEvent())
+    >>> queue.put(b"12345")
+    >>> queue.put(None)
+    >>> reader.read(10), reader.read(10), reader.finished
+    (b'12345', b'', True)
     """
 
-    def __init__(self, queue: "MPQueue[bytes]", stop_event: EventClass) -> None:
+    def __init__(self, queue: "MPQueue[bytes | None]", stop_event: EventClass) -> None:
         super(ContinuousBufferReader, self).__init__(b"")
-        self._queue: "MPQueue[bytes]" = queue
+        self._queue: "MPQueue[bytes | None]" = queue
         self._stop_event: EventClass = stop_event
+        self._finished = False
+        self._received_bytes = 0
+
+    @property
+    def finished(self) -> bool:
+        return self._finished
+
+    @property
+    def received_bytes(self) -> int:
+        return self._received_bytes
 
     def read(self, size: int | None = -1) -> bytes:
         if size is None or size < 0:
             raise ValueError("size must be positive")
-        while self.tell() < size:
+        while not self._finished and self.tell() < size:
             try:
-                chunk = self._queue.get(timeout=1.0)
-                if chunk is None:
-                    time.sleep(0.01)
-                self.write(chunk)
+                chunk = self._queue.get(timeout=0.1)
             except QueueEmptyException:
                 if self._stop_event.is_set():
-                    break
-                time.sleep(0.01)
+                    self._finished = True
+                continue
+            if chunk is None:
+                self._finished = True
+                continue
+            self._received_bytes += len(chunk)
+            self.write(chunk)
         current_buffer = self.getvalue()
         return_value: bytes = current_buffer[:size]
         self.seek(0)
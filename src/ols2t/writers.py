@@ -0,0 +1,245 @@
+import os
+import time
+from abc import ABC, abstractmethod
+from enum import Enum
+from types import TracebackType
+from typing import List, Type, TypeVar
+
+from oltl import BaseModel
+from pydantic import Field
+
+from .models import Segment
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None  # type: ignore[assignment]
+
+
+SegmentWriterT = TypeVar("SegmentWriterT", bound="BaseSegmentWriter")
+
+
+class OutputFormat(str, Enum):
+    JSONL = "jsonl"
+    SRT = "srt"
+    VTT = "vtt"
+    PARQUET = "parquet"
+
+
+class FlushPolicy(BaseModel):
+    """
+    When a writer hands its buffered segments to the output.
+
+    A flush happens once ``max_segments`` segments are buffered or ``max_seconds`` have passed since the previous
+    flush, whichever comes first; ``None`` disables a trigger. Both are checked when a segment is written, and the
+    writer always flushes when it is closed.
+
+    >>> FlushPolicy(max_segments=2).should_flush(buffered=2, elapsed=0.0)
+    True
+    >>> FlushPolicy(max_segments=None, max_seconds=None).should_flush(buffered=1000, elapsed=60.0)
+    False
+    """
+
+    max_segments: int | None = Field(default=256, ge=1)
+    max_seconds: float | None = Field(default=1.0, ge=0.0)
+
+    def should_flush(self, buffered: int, elapsed: float) -> bool:
+        if self.max_segments is not None and buffered >= self.max_segments:
+            return True
+        return self.max_seconds is not None and elapsed >= self.max_seconds
+
+
+def format_timestamp(seconds: float, decimal_marker: str = ".") -> str:
+    """
+    >>> format_timestamp(3725.5)
+    '01:02:05.500'
+    >>> format_timestamp(0.0015, decimal_marker=",")
+    '00:00:00,002'
+    """
+    milliseconds = round(seconds * 1000)
+    hours, milliseconds = divmod(milliseconds, 3_600_000)
+    minutes, milliseconds = divmod(milliseconds, 60_000)
+    seconds_part, milliseconds = divmod(milliseconds, 1000)
+    return f"{hours:02d}:{minutes:02d}:{seconds_part:02d}{decimal_marker}{milliseconds:03d}"
+
+
+class BaseSegmentWriter(ABC):
+    """Buffers segments and writes them out in batches according to ``flush_policy``."""
+
+    def __init__(self, flush_policy: FlushPolicy | None = None) -> None:
+        self._flush_policy = flush_policy or FlushPolicy()
+        self._buffer: List[Segment] = []
+        self._last_flushed = time.monotonic()
+
+    @property
+    def flush_policy(self) -> FlushPolicy:
+        return self._flush_policy
+
+    def write(self, segment: Segment) -> None:
+        self._buffer.append(segment)
+        if self.flush_policy.should_flush(len(self._buffer), time.monotonic() - self._last_flushed):
+            self.flush()
+
+    def flush(self) -> None:
+        if len(self._buffer) > 0:
+            self._write_segments(self._buffer)
+            self._buffer = []
+        self._flush_output()
+        self._last_flushed = time.monotonic()
+
+    def close(self) -> None:
+        self.flush()
+        self._close_output()
+
+    def __enter__(self: SegmentWriterT) -> SegmentWriterT:
+        return self
+
+    def __exit__(
+        self, exc_type: Type[BaseException] | None, exc_value: BaseException | None, traceback: TracebackType | None
+    ) -> None:
+        self.close()
+
+    @abstractmethod
+    def _write_segments(self, segments: List[Segment]) -> None:
+        raise NotImplementedError
+
+    @abstractmethod
+    def _flush_output(self) -> None:
+        raise NotImplementedError
+
+    @abstractmethod
+    def _close_output(self) -> None:
+        raise NotImplementedError
+
+
+class TextSegmentWriter(BaseSegmentWriter):
+    """
+    Writes segments to a UTF-8 text file.
+
+    With ``append`` the file is continued instead of truncated, and the header is only written to an empty file.
+    """
+
+    def __init__(self, path: str, flush_policy: FlushPolicy | None = None, append: bool = False) -> None:
+        super(TextSegmentWriter, self).__init__(flush_policy=flush_policy)
+        self._output = open(path, "a" if append else "w", encoding="utf-8")
+        if self._output.tell() == 0:
+            self._output.write(self.header())
+
+    def header(self) -> str:
+        return ""
+
+    @abstractmethod
+    def format_segment(self, segment: Segment) -> str:
+        raise NotImplementedError
+
+    def tell(self) -> int:
+        """Size of the output in bytes, including buffered segments only after :meth:`flush`."""
+        return self._output.tell()
+
+    def sync(self) -> None:
+        """Flush and make the output durable."""
+        self.flush()
+        os.fsync(self._output.fileno())
+
+    def _write_segments(self, segments: List[Segment]) -> None:
+        self._output.write("".join(self.format_segment(segment) for segment in segments))
+
+    def _flush_output(self) -> None:
+        self._output.flush()
+
+    def _close_output(self) -> None:
+        self._output.close()
+
+
+class JsonlSegmentWriter(TextSegmentWriter):
+    """One JSON object per line, the same as ``Segment.model_dump_json()``."""
+
+    def format_segment(self, segment: Segment) -> str:
+        line: str = segment.model_dump_json()
+        return line + "\n"
+
+
+class SrtSegmentWriter(TextSegmentWriter):
+    """One SubRip cue per segment, numbered from 1."""
+
+    def __init__(self, path: str, flush_policy: FlushPolicy | None = None) -> None:
+        super(SrtSegmentWriter, self).__init__(path=path, flush_policy=flush_policy)
+        self._index = 0
+
+    def format_segment(self, segment: Segment) -> str:
+        self._index += 1
+        start = format_timestamp(segment.start, decimal_marker=",")
+        end = format_timestamp(segment.end, decimal_marker=",")
+        return f"{self._index}\n{start} --> {end}\n{segment.text.strip()}\n\n"
+
+
+class VttSegmentWriter(TextSegmentWriter):
+    """One WebVTT cue per segment."""
+
+    def header(self) -> str:
+        return "WEBVTT\n\n"
+
+    def format_segment(self, segment: Segment) -> str:
+        return f"{format_timestamp(segment.start)} --> {format_timestamp(segment.end)}\n{segment.text.strip()}\n\n"
+
+
+class ParquetSegmentWriter(BaseSegmentWriter):
+    """
+    Writes segments as a Parquet table with ``text``, ``start``, ``end``, ``probability`` and ``channel`` columns.
+
+    Every flush writes a row group, so a flush policy with large batches keeps the file efficient to scan. Word
+    timestamps are not written.
+    """
+
+    def __init__(self, path: str, flush_policy: FlushPolicy | None = None) -> None:
+        if pa is None:
+            raise ImportError(
+                "pyarrow is required for the Parquet output format. " "Install it with: pip install ols2t[parquet]"
+            )
+        super(ParquetSegmentWriter, self).__init__(flush_policy=flush_policy)
+        self._schema = pa.schema(
+            [
+                ("text", pa.string()),
+                ("start", pa.float64()),
+                ("end", pa.float64()),
+                ("probability", pa.float64()),
+                ("channel", pa.int32()),
+            ]
+        )
+        self._writer = pq.ParquetWriter(path, self._schema)
+
+    def _write_segments(self, segments: List[Segment]) -> None:
+        table = pa.Table.from_pydict(
+            {
+                "text": [segment.text for segment in segments],
+                "start": [segment.start for segment in segments],
+                "end": [segment.end for segment in segments],
+                "probability": [segment.probability for segment in segments],
+                "channel": [segment.channel for segment in segments],
+            },
+            schema=self._schema,
+        )
+        self._writer.write_table(table)
+
+    def _flush_output(self) -> None:
+        pass
+
+    def _close_output(self) -> None:
+        self._writer.close()
+
+
+def create_segment_writer(
+    output_format: OutputFormat, path: str, flush_policy: FlushPolicy | None = None, append: bool = False
+) -> BaseSegmentWriter:
+    if append and output_format != OutputFormat.JSONL:
+        raise ValueError(f"Appending is only supported for {OutputFormat.JSONL.value} output")
+    if output_format == OutputFormat.JSONL:
+        return JsonlSegmentWriter(path=path, flush_policy=flush_policy, append=append)
+    if output_format == OutputFormat.SRT:
+        return SrtSegmentWriter(path=path, flush_policy=flush_policy)
+    if output_format == OutputFormat.VTT:
+        return VttSegmentWriter(path=path, flush_policy=flush_policy)
+    if output_format == OutputFormat.PARQUET:
+        return ParquetSegmentWriter(path=path, flush_policy=flush_policy)
+    raise ValueError(f"Unknown output format: {output_format}")
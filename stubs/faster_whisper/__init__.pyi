@@ -30,17 +30,32 @@ class Segment(NamedTuple):
     avg_logprob: float
     compression_ratio: float
     no_speech_prob: float
-    words: List[Word]
+    words: Optional[List[Word]]
+
+class Encoding:
+    @property
+    def ids(self) -> List[int]: ...
+
+class Tokenizer:
+    def encode(self, sequence: str, add_special_tokens: bool = True) -> Encoding: ...
 
 class WhisperModel:
-    def __init__(self, model_size_or_path: str, device: str) -> None: ...
+    def __init__(self, model_size_or_path: str, device: str, cpu_threads: int = 0) -> None: ...
     def transcribe(
         self,
         stream: BufferedReader | NDArray[np.float32],
-        language: str,
+        language: Optional[str],
         word_timestamps: bool,
         vad_filter: bool,
         vad_parameters: Dict[str, float | int],
+        beam_size: int = 5,
+        best_of: int = 5,
+        temperature: float | List[float] | Tuple[float, ...] = ...,
+        condition_on_previous_text: bool = True,
+        without_timestamps: bool = False,
+        initial_prompt: Optional[str | List[int]] = None,
     ) -> Tuple[List[Segment], TranscriptionInfo]: ...
     @property
     def model(self) -> Whisper: ...
+    @property
+    def hf_tokenizer(self) -> Tokenizer: ...
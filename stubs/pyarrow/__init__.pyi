@@ -0,0 +1,15 @@
+from typing import Any, Dict, List, Tuple
+
+class DataType: ...
+
+class Schema: ...
+
+class Table:
+    @classmethod
+    def from_pydict(cls, mapping: Dict[str, List[Any]], schema: Schema | None = None) -> "Table": ...
+    def to_pydict(self) -> Dict[str, List[Any]]: ...
+
+def schema(fields: List[Tuple[str, DataType]]) -> Schema: ...
+def string() -> DataType: ...
+def float64() -> DataType: ...
+def int32() -> DataType: ...
@@ -0,0 +1,10 @@
+import os
+
+from pyarrow import Schema, Table
+
+class ParquetWriter:
+    def __init__(self, where: str | os.PathLike[str], schema: Schema) -> None: ...
+    def write_table(self, table: Table) -> None: ...
+    def close(self) -> None: ...
+
+def read_table(source: str | os.PathLike[str]) -> Table: ...
@@ -0,0 +1,304 @@
+import json
+import os
+import pstats
+import sys
+import tempfile
+import wave
+from argparse import ArgumentParser
+from collections.abc import Generator
+from typing import Any, Dict, List
+
+import numpy as np
+import pytest
+from pytest_mock import MockerFixture
+
+from ols2t.checkpointing import Checkpointer, TranscriptionCheckpoint
+from ols2t.core import SpeechToTextCore
+from ols2t.interfaces.cli import Cli
+from ols2t.metrics import pipeline_metrics
+from ols2t.models import (
+    BaseStream,
+    FileStream,
+    MicrophoneStream,
+    PcmFileStream,
+    Segment,
+    TranscriptionContext,
+)
+from ols2t.settings import BackpressurePolicy
+from ols2t.speech_to_text_models.base import BaseSpeechToTextModel
+from ols2t.speech_to_text_models.stub import StubSpeechToTextModel
+from ols2t.writers import FlushPolicy, ParquetSegmentWriter, SrtSegmentWriter
+
+
+class _RecordingModel(BaseSpeechToTextModel):
+    def __init__(self) -> None:
+        super(_RecordingModel, self).__init__()
+        self.input_streams: List[BaseStream] = []
+
+    def transcribe(
+        self, input_stream: BaseStream, context: TranscriptionContext | None = None
+    ) -> Generator[Segment, None, None]:
+        self.input_streams.append(input_stream)
+        yield from ()
+
+
+def _create_cli(model: BaseSpeechToTextModel | None = None) -> Cli:
+    core = SpeechToTextCore(model=model or StubSpeechToTextModel())
+    return Cli(core=core, basic_argument_parser=ArgumentParser())
+
+
+def _run_cli(mocker: MockerFixture, *argv: str, model: BaseSpeechToTextModel | None = None) -> None:
+    mocker.patch.object(sys, "argv", ["ols2t", *argv])
+    _create_cli(model=model).run()
+
+
+def _read_jsonl(path: str) -> List[Dict[str, Any]]:
+    with open(path, "r", encoding="utf-8") as fin:
+        return [json.loads(line) for line in fin]
+
+
+@pytest.fixture
+def hello_path(fixture_dir: str) -> str:
+    return os.path.join(fixture_dir, "hello_ja.wav")
+
+
+def test_cli_transcribe_writes_segments_and_echoes_text(
+    mocker: MockerFixture, hello_path: str, capsys: pytest.CaptureFixture[str]
+) -> None:
+    with tempfile.TemporaryDirectory() as tempdir:
+        output_path = os.path.join(tempdir, "output.jsonl")
+        _run_cli(mocker, "transcribe", hello_path, output_path)
+        data = _read_jsonl(output_path)
+    assert [segment["text"] for segment in data] == ["stub"]
+    captured = capsys.readouterr()
+    assert captured.out == "stub"
+    assert captured.err == ""
+
+
+def test_cli_transcribe_metrics_prints_a_summary_to_stderr(
+    mocker: MockerFixture, hello_path: str, capsys: pytest.CaptureFixture[str]
+) -> None:
+    pipeline_metrics.reset()
+    with tempfile.TemporaryDirectory() as tempdir:
+        _run_cli(mocker, "transcribe", hello_path, os.path.join(tempdir, "output.jsonl"), "--metrics")
+    summary = json.loads(capsys.readouterr().err)
+    assert summary["stages"]["decode_audio"]["count"] == 1
+    assert summary["stages"]["decode_audio"]["audio_seconds"] > 0.0
+
+
+def test_cli_transcribe_profile_writes_pstats(
+    mocker: MockerFixture, hello_path: str, capsys: pytest.CaptureFixture[str]
+) -> None:
+    with tempfile.TemporaryDirectory() as tempdir:
+        profile_dir = os.path.join(tempdir, "profiles")
+        _run_cli(mocker, "transcribe", hello_path, os.path.join(tempdir, "output.jsonl"), "--profile", profile_dir)
+        (pstats_file,) = os.listdir(profile_dir)
+        assert pstats.Stats(os.path.join(profile_dir, pstats_file)).total_calls > 0  # type: ignore[attr-defined]
+    assert f"profile written to {os.path.join(profile_dir, pstats_file)}" in capsys.readouterr().err
+
+
+@pytest.mark.parametrize(
+    ("argv", "expected"),
+    [([], BackpressurePolicy.DROP_OLDEST), (["--backpressure", "BLOCK"], BackpressurePolicy.BLOCK)],
+)
+def test_cli_transcribe_microphone_uses_backpressure_policy(
+    mocker: MockerFixture, argv: List[str], expected: BackpressurePolicy
+) -> None:
+    model = _RecordingModel()
+    with tempfile.TemporaryDirectory() as tempdir:
+        _run_cli(mocker, "transcribe", "-", os.path.join(tempdir, "output.jsonl"), *argv, model=model)
+    (stream,) = model.input_streams
+    assert isinstance(stream, MicrophoneStream)
+    assert stream.backpressure_policy == expected
+
+
+def test_cli_transcribe_rejects_unknown_backpressure_policy(mocker: MockerFixture) -> None:
+    with pytest.raises(SystemExit):
+        _run_cli(mocker, "transcribe", "-", "output.jsonl", "--backpressure", "DROP_EVERYTHING")
+
+
+def test_cli_transcribe_memory_maps_raw_pcm_files(mocker: MockerFixture) -> None:
+    model = _RecordingModel()
+    with tempfile.TemporaryDirectory() as tempdir:
+        audio_path = os.path.join(tempdir, "audio.npy")
+        np.save(audio_path, np.zeros(16000, dtype=np.float32))
+        _run_cli(mocker, "transcribe", audio_path, os.path.join(tempdir, "output.jsonl"), model=model)
+        with pytest.raises(SystemExit):
+            _run_cli(mocker, "transcribe", audio_path, os.path.join(tempdir, "output.jsonl"), "--split-channels")
+    (stream,) = model.input_streams
+    assert isinstance(stream, PcmFileStream)
+
+
+def test_cli_run_closes_the_model(mocker: MockerFixture, hello_path: str) -> None:
+    model = _RecordingModel()
+    close = mocker.patch.object(model, "close")
+    with tempfile.TemporaryDirectory() as tempdir:
+        _run_cli(mocker, "transcribe", hello_path, os.path.join(tempdir, "output.jsonl"), "--quiet", model=model)
+    close.assert_called_once_with()
+
+
+def test_cli_transcribe_split_channels_tags_segments_with_their_channel(mocker: MockerFixture) -> None:
+    with tempfile.TemporaryDirectory() as tempdir:
+        audio_path = os.path.join(tempdir, "stereo.wav")
+        with wave.open(audio_path, "wb") as fout:
+            fout.setnchannels(2)
+            fout.setsampwidth(2)
+            fout.setframerate(16000)
+            fout.writeframes(np.zeros((16000, 2), dtype="<i2").tobytes())
+        output_path = os.path.join(tempdir, "output.jsonl")
+        _run_cli(mocker, "transcribe", audio_path, output_path, "--split-channels", "--quiet")
+        data = _read_jsonl(output_path)
+    assert sorted(segment["channel"] for segment in data) == [0, 1]
+
+
+def test_cli_transcribe_split_channels_requires_an_audio_file(mocker: MockerFixture) -> None:
+    with pytest.raises(SystemExit):
+        _run_cli(mocker, "transcribe", "-", "output.jsonl", "--split-channels")
+
+
+class _CheckpointInspectingModel(BaseSpeechToTextModel):
+    def __init__(self, checkpoint_path: str) -> None:
+        super(_CheckpointInspectingModel, self).__init__()
+        self.checkpoint_path = checkpoint_path
+        self.input_streams: List[BaseStream] = []
+        self.checkpoints: List[TranscriptionCheckpoint] = []
+
+    def transcribe(
+        self, input_stream: BaseStream, context: TranscriptionContext | None = None
+    ) -> Generator[Segment, None, None]:
+        self.input_streams.append(input_stream)
+        yield Segment(text="first", start=0.0, end=1.0, probability=1.0)
+        self.checkpoints.append(TranscriptionCheckpoint.load(self.checkpoint_path))
+        yield Segment(text="second", start=1.0, end=2.0, probability=1.0)
+
+
+def test_cli_transcribe_checkpoint_records_progress_and_removes_it_when_done(
+    mocker: MockerFixture, hello_path: str
+) -> None:
+    with tempfile.TemporaryDirectory() as tempdir:
+        output_path = os.path.join(tempdir, "output.jsonl")
+        model = _CheckpointInspectingModel(output_path + ".checkpoint")
+        _run_cli(
+            mocker, "transcribe", hello_path, output_path, "--checkpoint", "--checkpoint-interval", "0", model=model
+        )
+        assert not os.path.exists(model.checkpoint_path)
+        data = _read_jsonl(output_path)
+    (checkpoint,) = model.checkpoints
+    assert checkpoint.offset == 1.0
+    assert (
+        checkpoint.output_size == len(Segment(text="first", start=0.0, end=1.0, probability=1.0).model_dump_json()) + 1
+    )
+    assert [segment["text"] for segment in data] == ["first", "second"]
+    (stream,) = model.input_streams
+    # Checkpoints follow the segments as the model yields them; the file is not re-windowed for them.
+    assert isinstance(stream, FileStream)
+    assert stream.chunk_seconds is None
+
+
+def test_cli_transcribe_resume_continues_after_the_checkpoint(mocker: MockerFixture, hello_path: str) -> None:
+    with tempfile.TemporaryDirectory() as tempdir:
+        output_path = os.path.join(tempdir, "output.jsonl")
+        confirmed = Segment(text="confirmed", start=0.0, end=0.5, probability=1.0).model_dump_json() + "\n"
+        with open(output_path, "w", encoding="utf-8") as fout:
+            fout.write(confirmed + "lost\n")
+        TranscriptionCheckpoint(audio_file=hello_path, offset=0.5, output_size=len(confirmed)).save(
+            output_path + ".checkpoint"
+        )
+        _run_cli(mocker, "transcribe", hello_path, output_path, "--resume", "--quiet")
+        data = _read_jsonl(output_path)
+        assert not os.path.exists(output_path + ".checkpoint")
+    assert [segment["text"] for segment in data] == ["confirmed", "stub"]
+    assert data[1]["start"] == 0.5
+
+
+def test_cli_transcribe_resume_skips_the_transcribed_part_of_raw_pcm_files(mocker: MockerFixture) -> None:
+    model = _RecordingModel()
+    with tempfile.TemporaryDirectory() as tempdir:
+        audio_path = os.path.join(tempdir, "audio.npy")
+        np.save(audio_path, np.zeros(32000, dtype=np.float32))
+        output_path = os.path.join(tempdir, "output.jsonl")
+        confirmed = Segment(text="confirmed", start=0.0, end=1.5, probability=1.0).model_dump_json() + "\n"
+        with open(output_path, "w", encoding="utf-8") as fout:
+            fout.write(confirmed)
+        TranscriptionCheckpoint(audio_file=audio_path, offset=1.5, output_size=len(confirmed)).save(
+            output_path + ".checkpoint"
+        )
+        _run_cli(mocker, "transcribe", audio_path, output_path, "--resume", "--quiet", model=model)
+    (stream,) = model.input_streams
+    assert isinstance(stream, PcmFileStream)
+    assert stream.start == 1.5
+
+
+def test_cli_transcribe_resume_refuses_a_non_empty_output_without_checkpoint(
+    mocker: MockerFixture, hello_path: str
+) -> None:
+    with tempfile.TemporaryDirectory() as tempdir:
+        output_path = os.path.join(tempdir, "output.jsonl")
+        with open(output_path, "w", encoding="utf-8") as fout:
+            fout.write("finished\n")
+        with pytest.raises(SystemExit):
+            _run_cli(mocker, "transcribe", hello_path, output_path, "--resume")
+        with open(output_path, "r", encoding="utf-8") as fin:
+            assert fin.read() == "finished\n"
+
+
+def test_cli_transcribe_writes_the_requested_format_quietly(
+    mocker: MockerFixture, hello_path: str, capsys: pytest.CaptureFixture[str]
+) -> None:
+    with tempfile.TemporaryDirectory() as tempdir:
+        output_path = os.path.join(tempdir, "output.srt")
+        _run_cli(mocker, "transcribe", hello_path, output_path, "--format", "srt", "--quiet")
+        with open(output_path, "r", encoding="utf-8") as fin:
+            actual = fin.read()
+    assert actual.startswith("1\n00:00:00,000 --> ")
+    assert actual.endswith("\nstub\n\n")
+    assert capsys.readouterr().out == ""
+
+
+def test_cli_create_writer_follows_format_and_flush_options() -> None:
+    sut = _create_cli()
+    with tempfile.TemporaryDirectory() as tempdir:
+        output_path = os.path.join(tempdir, "output.srt")
+        args = sut.parser.parse_args(
+            ["transcribe", "in.wav", output_path, "--format", "srt", "--flush-segments", "1", "--flush-seconds", "0.5"]
+        )
+        with sut.create_writer(args) as writer:
+            assert isinstance(writer, SrtSegmentWriter)
+            assert writer.flush_policy == FlushPolicy(max_segments=1, max_seconds=0.5)
+
+
+def test_cli_create_checkpointer_only_with_checkpoint_options() -> None:
+    sut = _create_cli()
+    with tempfile.TemporaryDirectory() as tempdir:
+        output_path = os.path.join(tempdir, "output.jsonl")
+        checkpoint = TranscriptionCheckpoint(audio_file="in.wav")
+        args = sut.parser.parse_args(["transcribe", "in.wav", output_path])
+        with sut.create_writer(args) as writer:
+            assert sut.create_checkpointer(args, checkpoint, writer) is None
+        args = sut.parser.parse_args(
+            ["transcribe", "in.wav", output_path, "--checkpoint", "--checkpoint-interval", "5"]
+        )
+        with sut.create_writer(args) as writer:
+            checkpointer = sut.create_checkpointer(args, checkpoint, writer)
+    assert isinstance(checkpointer, Checkpointer)
+    assert checkpointer.path == output_path + ".checkpoint"
+    assert checkpointer.interval == 5.0
+
+
+def test_cli_create_checkpointer_rejects_writers_without_a_byte_offset(mocker: MockerFixture) -> None:
+    sut = _create_cli()
+    args = sut.parser.parse_args(["transcribe", "in.wav", "output.parquet", "--checkpoint", "--format", "parquet"])
+    writer = mocker.MagicMock(spec=ParquetSegmentWriter)
+    with pytest.raises(SystemExit):
+        sut.create_checkpointer(args, TranscriptionCheckpoint(audio_file="in.wav"), writer)
+
+
+@pytest.mark.parametrize(
+    "argv",
+    [["-", "output.jsonl", "--checkpoint"], ["in.wav", "output.srt", "--checkpoint", "--format", "srt"]],
+)
+def test_cli_prepare_checkpoint_rejects_unsupported_combinations(argv: List[str]) -> None:
+    sut = _create_cli()
+    args = sut.parser.parse_args(["transcribe", *argv])
+    with pytest.raises(SystemExit):
+        sut.prepare_checkpoint(args)
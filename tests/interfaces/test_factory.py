@@ -1,4 +1,5 @@
 from argparse import ArgumentParser
+from pathlib import Path
 
 import pytest
 from pytest_mock import MockerFixture
@@ -10,6 +11,8 @@ from ols2t.settings import (
     CliSettings,
     HttpApiSettings,
     InterfaceType,
+    SocketApiSettings,
+    WatchFolderSettings,
 )
 
 
@@ -33,6 +36,26 @@ def test_create_interface_creates_http_api(mocker: MockerFixture) -> None:
     HttpApi.assert_called_once_with(core=core, settings=settings)
 
 
+def test_create_interface_creates_socket_api(mocker: MockerFixture) -> None:
+    SocketApi = mocker.patch("ols2t.interfaces.socket_api.SocketApi")
+    settings = SocketApiSettings()
+    basic_argument_parser = mocker.MagicMock(spec=ArgumentParser)
+    core = mocker.MagicMock(spec=SpeechToTextApp)
+    actual = create_interface(settings=settings, core=core, basic_argument_parser=basic_argument_parser)
+    assert actual == SocketApi.return_value
+    SocketApi.assert_called_once_with(core=core, settings=settings)
+
+
+def test_create_interface_creates_watch_folder(mocker: MockerFixture, tmp_path: Path) -> None:
+    WatchFolder = mocker.patch("ols2t.interfaces.watch_folder.WatchFolder")
+    settings = WatchFolderSettings(input_dir=tmp_path)
+    basic_argument_parser = mocker.MagicMock(spec=ArgumentParser)
+    core = mocker.MagicMock(spec=SpeechToTextApp)
+    actual = create_interface(settings=settings, core=core, basic_argument_parser=basic_argument_parser)
+    assert actual == WatchFolder.return_value
+    WatchFolder.assert_called_once_with(core=core, settings=settings)
+
+
 def test_create_interface_raises_value_error(mocker: MockerFixture) -> None:
     bad_settings = BaseInterfaceSettings(type=InterfaceType.CLI)
     basic_argument_parser = mocker.MagicMock(spec=ArgumentParser)
@@ -1,12 +1,29 @@
+import os
+import tempfile
+import time
 from typing import Any, Dict, List
 
+import numpy as np
+import pytest
 from pytest_mock import MockerFixture
 from starlette.testclient import TestClient
+from starlette.websockets import WebSocketDisconnect
 
 from ols2t.core import SpeechToTextCore
-from ols2t.interfaces.http_api import HttpApi
-from ols2t.models import BaseStream, Segment
-from ols2t.settings import HttpApiSettings
+from ols2t.interfaces.http_api import (
+    WORKER_CONFIG_ENVIRONMENT_VARIABLE,
+    HttpApi,
+    create_worker_app,
+)
+from ols2t.models import (
+    BaseStream,
+    Segment,
+    TranscriptionContext,
+)
+from ols2t.multiplexing import MultiplexFrameType, encode_multiplex_frame
+from ols2t.profiling import TranscriptionProfiler
+from ols2t.settings import BackpressurePolicy, HttpApiSettings
+from ols2t.speech_to_text_models.remote import RemoteSpeechToTextModel
 
 
 def test_http_api_has_app(mocker: MockerFixture) -> None:
@@ -35,6 +52,34 @@ def test_http_api_run_calls_uvicorn(mocker: MockerFixture) -> None:
     mock_uvicorn_run.assert_called_once_with(http_api.app, host="0.0.0.0", port=8000)
 
 
+def test_http_api_run_with_workers_starts_worker_app_factory(mocker: MockerFixture) -> None:
+    mocker.patch.dict(os.environ)
+    model = RemoteSpeechToTextModel(addresses=["unix:/tmp/ols2t-model.sock"])
+    http_api = HttpApi(core=SpeechToTextCore(model=model), settings=HttpApiSettings(workers=4))
+    mock_uvicorn_run = mocker.patch("ols2t.interfaces.http_api.uvicorn.run")
+    TranscriptionScheduler = mocker.patch("ols2t.interfaces.http_api.TranscriptionScheduler")
+    create_app = mocker.spy(http_api, "_create_app")
+    http_api.run()
+    mock_uvicorn_run.assert_called_once_with(
+        "ols2t.interfaces.http_api:create_worker_app", factory=True, workers=4, host="0.0.0.0", port=8000
+    )
+    # Only the workers serve requests, so the parent builds neither an app nor a scheduler.
+    create_app.assert_not_called()
+    TranscriptionScheduler.assert_not_called()
+    app = create_worker_app()
+    assert app is not http_api.app
+    assert WORKER_CONFIG_ENVIRONMENT_VARIABLE in os.environ
+
+
+def test_http_api_run_with_workers_requires_remote_model(mocker: MockerFixture) -> None:
+    mock_core = mocker.MagicMock(spec=SpeechToTextCore)
+    http_api = HttpApi(core=mock_core, settings=HttpApiSettings(workers=2))
+    mock_uvicorn_run = mocker.patch("ols2t.interfaces.http_api.uvicorn.run")
+    with pytest.raises(ValueError):
+        http_api.run()
+    mock_uvicorn_run.assert_not_called()
+
+
 def test_post_transcribe(mocker: MockerFixture) -> None:
     mock_core = mocker.MagicMock(spec=SpeechToTextCore)
     mock_core.transcribe.return_value = iter([Segment(text="こんにちは", start=0.0, end=2.0, probability=0.9)])
@@ -76,10 +121,38 @@ def test_post_transcribe_multiple_segments(mocker: MockerFixture) -> None:
     assert data[1]["text"] == "世界"
 
 
+def test_post_transcribe_passes_segment_merging_overrides(mocker: MockerFixture) -> None:
+    mock_core = mocker.MagicMock(spec=SpeechToTextCore)
+    mock_core.transcribe.return_value = iter([])
+    http_api = HttpApi(core=mock_core, settings=HttpApiSettings())
+    client = TestClient(http_api.app)
+    response = client.post(
+        "/transcribe?buffer_length=4&margin=1.5",
+        files={"file": ("hello.wav", b"fake audio data", "audio/wav")},
+    )
+    assert response.status_code == 200
+    context = mock_core.transcribe.call_args.kwargs["context"]
+    assert context.segment_merging_parameters.buffer_length == 4
+    assert context.segment_merging_parameters.margin == 1.5
+    assert context.segment_merging_parameters.probability_threshold is None
+
+
+def test_post_transcribe_rejects_invalid_segment_merging_overrides(mocker: MockerFixture) -> None:
+    mock_core = mocker.MagicMock(spec=SpeechToTextCore)
+    http_api = HttpApi(core=mock_core, settings=HttpApiSettings())
+    client = TestClient(http_api.app)
+    response = client.post(
+        "/transcribe?buffer_length=0",
+        files={"file": ("hello.wav", b"fake audio data", "audio/wav")},
+    )
+    assert response.status_code == 422
+    mock_core.transcribe.assert_not_called()
+
+
 def test_ws_transcribe_receives_segments(mocker: MockerFixture) -> None:
     mock_core = mocker.MagicMock(spec=SpeechToTextCore)
 
-    def fake_transcribe(input_stream: BaseStream) -> Any:
+    def fake_transcribe(input_stream: BaseStream, context: TranscriptionContext | None = None) -> Any:
         return iter(
             [
                 Segment(text="こんにちは", start=0.0, end=2.0, probability=0.9),
@@ -104,3 +177,269 @@ def test_ws_transcribe_receives_segments(mocker: MockerFixture) -> None:
     assert received[0]["text"] == "こんにちは"
     assert received[1]["text"] == "世界"
     mock_core.transcribe.assert_called_once()
+
+
+def test_ws_transcribe_batches_segments_when_requested(mocker: MockerFixture) -> None:
+    mock_core = mocker.MagicMock(spec=SpeechToTextCore)
+    mock_core.transcribe.side_effect = lambda input_stream, context=None: iter(
+        [
+            Segment(text="こん", start=0.0, end=1.0, probability=0.9),
+            Segment(text="にち", start=1.0, end=2.0, probability=0.9),
+            Segment(text="は", start=2.0, end=3.0, probability=0.9),
+        ]
+    )
+    http_api = HttpApi(core=mock_core, settings=HttpApiSettings(websocket_flush_interval=1.0))
+    client = TestClient(http_api.app)
+    frames: List[Dict[str, Any]] = []
+    with client.websocket_connect("/ws/transcribe?batch=true") as ws:
+        ws.send_bytes(b"fake audio chunk")
+        ws.send_bytes(b"")
+        while "done" not in (data := ws.receive_json()):
+            frames.append(data)
+    assert len(frames) == 1
+    assert [s["text"] for s in frames[0]["segments"]] == ["こん", "にち", "は"]
+
+
+def test_ws_transcribe_batches_each_decode_step_by_default(mocker: MockerFixture) -> None:
+    def fake_transcribe(input_stream: BaseStream, context: TranscriptionContext | None = None) -> Any:
+        yield Segment(text="こん", start=0.0, end=1.0, probability=0.9)
+        yield Segment(text="にちは", start=1.0, end=2.0, probability=0.9)
+        # The next decode step.
+        time.sleep(0.5)
+        yield Segment(text="世界", start=2.0, end=3.0, probability=0.9)
+
+    mock_core = mocker.MagicMock(spec=SpeechToTextCore)
+    mock_core.transcribe.side_effect = fake_transcribe
+    http_api = HttpApi(core=mock_core, settings=HttpApiSettings())
+    client = TestClient(http_api.app)
+    frames: List[Dict[str, Any]] = []
+    with client.websocket_connect("/ws/transcribe?batch=true") as ws:
+        ws.send_bytes(b"fake audio chunk")
+        ws.send_bytes(b"")
+        while "done" not in (data := ws.receive_json()):
+            frames.append(data)
+    assert [[s["text"] for s in frame["segments"]] for frame in frames] == [["こん", "にちは"], ["世界"]]
+
+
+def test_ws_transcribe_cancels_transcription_when_client_disconnects(mocker: MockerFixture) -> None:
+    mock_core = mocker.MagicMock(spec=SpeechToTextCore)
+    contexts: List[TranscriptionContext] = []
+
+    def fake_transcribe(input_stream: BaseStream, context: TranscriptionContext | None = None) -> Any:
+        assert context is not None
+        contexts.append(context)
+        with input_stream as chunks:
+            for _ in chunks:
+                pass
+        return iter([])
+
+    mock_core.transcribe.side_effect = fake_transcribe
+    http_api = HttpApi(core=mock_core, settings=HttpApiSettings())
+    client = TestClient(http_api.app)
+    with client.websocket_connect("/ws/transcribe?format=f32le") as ws:
+        ws.send_bytes(np.zeros(16000, dtype="<f4").tobytes())
+    deadline = time.monotonic() + 5.0
+    while not (contexts and contexts[0].cancelled) and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert contexts[0].cancelled
+
+
+def test_ws_transcribe_accepts_raw_pcm(mocker: MockerFixture) -> None:
+    mock_core = mocker.MagicMock(spec=SpeechToTextCore)
+    received_samples: List[int] = []
+
+    def fake_transcribe(input_stream: BaseStream, context: TranscriptionContext | None = None) -> Any:
+        with input_stream as chunks:
+            received_samples.append(sum(len(chunk) for chunk in chunks))
+        return iter([Segment(text="こんにちは", start=0.0, end=1.0, probability=0.9)])
+
+    mock_core.transcribe.side_effect = fake_transcribe
+    http_api = HttpApi(core=mock_core, settings=HttpApiSettings())
+    client = TestClient(http_api.app)
+    with client.websocket_connect("/ws/transcribe") as ws:
+        ws.send_json({"format": "s16le", "sampling_rate": 16000})
+        ws.send_bytes(np.zeros(8000, dtype="<i2").tobytes())
+        ws.send_bytes(np.zeros(8000, dtype="<i2").tobytes())
+        ws.send_bytes(b"")
+        assert ws.receive_json()["text"] == "こんにちは"
+        assert "done" in ws.receive_json()
+    assert received_samples == [16000]
+
+
+def test_ws_transcribe_rejects_unsupported_pcm_format(mocker: MockerFixture) -> None:
+    mock_core = mocker.MagicMock(spec=SpeechToTextCore)
+    http_api = HttpApi(core=mock_core, settings=HttpApiSettings())
+    client = TestClient(http_api.app)
+    with client.websocket_connect("/ws/transcribe?format=u8") as ws:
+        assert "error" in ws.receive_json()
+    mock_core.transcribe.assert_not_called()
+
+
+@pytest.mark.parametrize(
+    "control",
+    [
+        "[]",
+        '"pcm"',
+        "42",
+        "not json",
+        '{"format": "u8"}',
+        '{"format": "s16le", "sampling_rate": [16000]}',
+        '{"format": "s16le", "sampling_rate": {}}',
+        '{"format": "s16le", "sampling_rate": 8000}',
+    ],
+)
+def test_ws_transcribe_rejects_malformed_control_message(mocker: MockerFixture, control: str) -> None:
+    mock_core = mocker.MagicMock(spec=SpeechToTextCore)
+    http_api = HttpApi(core=mock_core, settings=HttpApiSettings())
+    client = TestClient(http_api.app)
+    with client.websocket_connect("/ws/transcribe") as ws:
+        ws.send_text(control)
+        assert "error" in ws.receive_json()
+        with pytest.raises(WebSocketDisconnect) as e:
+            ws.receive_json()
+        assert e.value.code == 1003
+    mock_core.transcribe.assert_not_called()
+
+
+def test_ws_transcribe_multiplex_routes_results_by_stream_id(mocker: MockerFixture) -> None:
+    mock_core = mocker.MagicMock(spec=SpeechToTextCore)
+
+    def fake_transcribe(input_stream: BaseStream, context: TranscriptionContext | None = None) -> Any:
+        with input_stream as chunks:
+            samples = sum(len(chunk) for chunk in chunks)
+        yield Segment(text=str(samples), start=0.0, end=1.0, probability=0.9)
+
+    mock_core.transcribe.side_effect = fake_transcribe
+    http_api = HttpApi(core=mock_core, settings=HttpApiSettings(multiplex_workers=2))
+    client = TestClient(http_api.app)
+    received: List[Dict[str, Any]] = []
+    with client.websocket_connect("/ws/transcribe/multiplex?format=s16le") as ws:
+        ws.send_bytes(encode_multiplex_frame(1, MultiplexFrameType.AUDIO, np.zeros(100, dtype="<i2").tobytes()))
+        ws.send_bytes(encode_multiplex_frame(2, MultiplexFrameType.AUDIO, np.zeros(300, dtype="<i2").tobytes()))
+        ws.send_bytes(encode_multiplex_frame(1, MultiplexFrameType.AUDIO, np.zeros(100, dtype="<i2").tobytes()))
+        ws.send_bytes(encode_multiplex_frame(2, MultiplexFrameType.END))
+        ws.send_bytes(encode_multiplex_frame(1, MultiplexFrameType.END))
+        ws.send_bytes(b"")
+        while True:
+            data = ws.receive_json()
+            if data == {"done": True}:
+                break
+            received.append(data)
+    texts = {d["stream_id"]: d["text"] for d in received if "text" in d}
+    assert texts == {1: "200", 2: "300"}
+    assert sorted(d["stream_id"] for d in received if d.get("done")) == [1, 2]
+
+
+def _count_samples(input_stream: BaseStream, context: TranscriptionContext | None = None) -> Any:
+    with input_stream as chunks:
+        samples = sum(len(chunk) for chunk in chunks)
+    yield Segment(text=str(samples), start=0.0, end=1.0, probability=0.9)
+
+
+def _receive_until_done(ws: Any) -> List[Dict[str, Any]]:
+    received: List[Dict[str, Any]] = []
+    while (data := ws.receive_json()) != {"done": True}:
+        received.append(data)
+    return received
+
+
+def test_ws_transcribe_multiplex_queues_and_rejects_streams_beyond_capacity(mocker: MockerFixture) -> None:
+    mock_core = mocker.MagicMock(spec=SpeechToTextCore)
+    mock_core.transcribe.side_effect = _count_samples
+    http_api = HttpApi(core=mock_core, settings=HttpApiSettings(multiplex_workers=1, multiplex_max_pending_streams=1))
+    client = TestClient(http_api.app)
+    pcm = np.zeros(100, dtype="<i2").tobytes()
+    with client.websocket_connect("/ws/transcribe/multiplex?format=s16le") as ws:
+        for stream_id in (1, 2, 3):
+            ws.send_bytes(encode_multiplex_frame(stream_id, MultiplexFrameType.AUDIO, pcm))
+        ws.send_bytes(encode_multiplex_frame(3, MultiplexFrameType.AUDIO, pcm))
+        for stream_id in (1, 2, 3):
+            ws.send_bytes(encode_multiplex_frame(stream_id, MultiplexFrameType.END))
+        ws.send_bytes(b"")
+        received = _receive_until_done(ws)
+    assert {d["stream_id"]: d["text"] for d in received if "text" in d} == {1: "100", 2: "100"}
+    assert [d["stream_id"] for d in received if d.get("queued")] == [2]
+    assert [d["stream_id"] for d in received if "error" in d] == [3]
+    assert sorted(d["stream_id"] for d in received if d.get("done")) == [1, 2]
+    assert http_api.scheduler.active == 0
+
+
+def test_ws_transcribe_multiplex_bounds_buffered_audio_of_waiting_streams(mocker: MockerFixture) -> None:
+    mock_core = mocker.MagicMock(spec=SpeechToTextCore)
+    mock_core.transcribe.side_effect = _count_samples
+    http_api = HttpApi(
+        core=mock_core,
+        settings=HttpApiSettings(
+            multiplex_workers=1, multiplex_queue_size=1, multiplex_backpressure=BackpressurePolicy.DROP_OLDEST
+        ),
+    )
+    client = TestClient(http_api.app)
+    with client.websocket_connect("/ws/transcribe/multiplex?format=s16le") as ws:
+        ws.send_bytes(encode_multiplex_frame(1, MultiplexFrameType.AUDIO, np.zeros(10, dtype="<i2").tobytes()))
+        for samples in (100, 200, 300):
+            ws.send_bytes(encode_multiplex_frame(2, MultiplexFrameType.AUDIO, np.zeros(samples, dtype="<i2").tobytes()))
+        ws.send_bytes(encode_multiplex_frame(2, MultiplexFrameType.END))
+        ws.send_bytes(encode_multiplex_frame(1, MultiplexFrameType.END))
+        ws.send_bytes(b"")
+        received = _receive_until_done(ws)
+    assert {d["stream_id"]: d["text"] for d in received if "text" in d} == {1: "10", 2: "300"}
+
+
+def test_metrics_endpoint_exposes_prometheus_text(mocker: MockerFixture) -> None:
+    mock_core = mocker.MagicMock(spec=SpeechToTextCore)
+    mock_core.transcribe.return_value = iter([Segment(text="こんにちは", start=0.0, end=2.0, probability=0.9)])
+    http_api = HttpApi(core=mock_core, settings=HttpApiSettings())
+    client = TestClient(http_api.app)
+    client.post("/transcribe", files={"file": ("hello.wav", b"fake audio data", "audio/wav")})
+    response = client.get("/metrics")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    assert 'ols2t_stage_duration_seconds_count{stage="serialize"}' in response.text
+
+
+def test_post_transcribe_profiles_when_requested(mocker: MockerFixture) -> None:
+    mock_core = mocker.MagicMock(spec=SpeechToTextCore)
+    mock_core.transcribe.return_value = iter([Segment(text="こんにちは", start=0.0, end=2.0, probability=0.9)])
+    with tempfile.TemporaryDirectory() as tempdir:
+        http_api = HttpApi(core=mock_core, settings=HttpApiSettings(profile_output_dir=tempdir))
+        client = TestClient(http_api.app)
+        response = client.post(
+            "/transcribe",
+            files={"file": ("hello.wav", b"fake audio data", "audio/wav")},
+            headers={"X-Ols2t-Profile": "1", "X-Request-ID": "abc"},
+        )
+        assert response.status_code == 200
+        assert response.headers["X-Request-ID"] == "abc"
+        assert os.listdir(tempdir) == ["abc.pstats"]
+
+
+def test_post_transcribe_is_not_profiled_while_another_request_is(mocker: MockerFixture) -> None:
+    mock_core = mocker.MagicMock(spec=SpeechToTextCore)
+    mock_core.transcribe.return_value = iter([Segment(text="こんにちは", start=0.0, end=2.0, probability=0.9)])
+    with tempfile.TemporaryDirectory() as tempdir:
+        running = TranscriptionProfiler(output_dir=tempdir, request_id="running").iterate(iter(range(2)))
+        next(running)
+        http_api = HttpApi(core=mock_core, settings=HttpApiSettings(profile_output_dir=tempdir))
+        client = TestClient(http_api.app)
+        response = client.post(
+            "/transcribe",
+            files={"file": ("hello.wav", b"fake audio data", "audio/wav")},
+            headers={"X-Ols2t-Profile": "1", "X-Request-ID": "abc"},
+        )
+        list(running)
+        assert response.status_code == 200
+        assert response.json()[0]["text"] == "こんにちは"
+        assert "X-Request-ID" not in response.headers
+        assert os.listdir(tempdir) == ["running.pstats"]
+
+
+def test_post_transcribe_does_not_profile_without_header(mocker: MockerFixture) -> None:
+    mock_core = mocker.MagicMock(spec=SpeechToTextCore)
+    mock_core.transcribe.return_value = iter([])
+    with tempfile.TemporaryDirectory() as tempdir:
+        http_api = HttpApi(core=mock_core, settings=HttpApiSettings(profile_output_dir=tempdir))
+        client = TestClient(http_api.app)
+        response = client.post("/transcribe", files={"file": ("hello.wav", b"fake audio data", "audio/wav")})
+        assert response.status_code == 200
+        assert "X-Request-ID" not in response.headers
+        assert os.listdir(tempdir) == []
@@ -0,0 +1,159 @@
+import asyncio
+import os
+import tempfile
+import threading
+import time
+from collections.abc import Callable, Generator
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, List, Tuple, TypeVar
+
+import numpy as np
+import pytest
+from pytest_mock import MockerFixture
+
+from ols2t.core import SpeechToTextCore
+from ols2t.interfaces.socket_api import SocketApi
+from ols2t.models import (
+    BaseStream,
+    Segment,
+    SegmentMergingParameters,
+    TranscriptionContext,
+    Word,
+)
+from ols2t.settings import SocketApiSettings
+from ols2t.socket_protocol import SocketApiClient, SocketProtocolError
+from ols2t.types import PcmSampleFormat
+
+T = TypeVar("T")
+
+
+def _serve(sut: SocketApi, client: Callable[[Any], T]) -> T:
+    async def scenario() -> T:
+        server = await sut.start_server()
+        async with server:
+            if sut.settings.unix_socket_path is not None:
+                address: Any = sut.settings.unix_socket_path
+            else:
+                address = server.sockets[0].getsockname()[:2]
+            return await asyncio.get_event_loop().run_in_executor(None, client, address)
+
+    return asyncio.run(scenario())
+
+
+def _counting_core(mocker: MockerFixture) -> Any:
+    mock_core = mocker.MagicMock(spec=SpeechToTextCore)
+
+    def fake_transcribe(input_stream: BaseStream, context: TranscriptionContext | None = None) -> Any:
+        with input_stream as chunks:
+            samples = sum(len(chunk) for chunk in chunks)
+        yield Segment(text="こんにちは", start=0.0, end=samples / 16000, probability=0.9)
+        yield Segment(text=str(samples), start=samples / 16000, end=samples / 16000, probability=1.0)
+
+    mock_core.transcribe.side_effect = fake_transcribe
+    return mock_core
+
+
+def test_socket_api_transcribes_over_tcp(mocker: MockerFixture) -> None:
+    sut = SocketApi(core=_counting_core(mocker), settings=SocketApiSettings(port=0))
+
+    def client(address: Any) -> List[List[Segment]]:
+        with SocketApiClient(address, sample_format=PcmSampleFormat.S16LE, timeout=5.0) as c:
+            audio = np.zeros(8000, dtype="<i2").tobytes()
+            # The connection is reused for a second transcription.
+            return [list(c.transcribe([audio, audio])), list(c.transcribe([audio]))]
+
+    first, second = _serve(sut, client)
+    assert first == [
+        Segment(text="こんにちは", start=0.0, end=1.0, probability=0.9),
+        Segment(text="16000", start=1.0, end=1.0, probability=1.0),
+    ]
+    assert second[1].text == "8000"
+
+
+def test_socket_api_transcribes_over_unix_socket(mocker: MockerFixture) -> None:
+    with tempfile.TemporaryDirectory() as tempdir:
+        path = os.path.join(tempdir, "ols2t.sock")
+        sut = SocketApi(core=_counting_core(mocker), settings=SocketApiSettings(unix_socket_path=path))
+
+        def client(address: Any) -> List[Segment]:
+            with SocketApiClient(address, timeout=5.0) as c:
+                return list(c.transcribe([np.zeros(4000, dtype="<f4").tobytes()]))
+
+        segments = _serve(sut, client)
+    assert [s.text for s in segments] == ["こんにちは", "4000"]
+
+
+def test_socket_api_transcribes_with_the_client_context_and_keeps_words_and_channel(mocker: MockerFixture) -> None:
+    contexts: List[TranscriptionContext] = []
+    segment = Segment(
+        text="こんにちは",
+        start=0.0,
+        end=1.0,
+        probability=0.9,
+        words=[Word(text="こんにちは", start=0.25, end=0.75, probability=0.8)],
+        channel=1,
+    )
+
+    def fake_transcribe(input_stream: BaseStream, context: TranscriptionContext | None = None) -> Any:
+        assert context is not None
+        contexts.append(context)
+        with input_stream as chunks:
+            for _ in chunks:
+                pass
+        yield segment
+
+    mock_core = mocker.MagicMock(spec=SpeechToTextCore)
+    mock_core.transcribe.side_effect = fake_transcribe
+    sut = SocketApi(core=mock_core, settings=SocketApiSettings(port=0))
+    context = TranscriptionContext(
+        language="ja", prompt="こんにちは", segment_merging_parameters=SegmentMergingParameters(margin=1.0)
+    )
+
+    def client(address: Any) -> List[Segment]:
+        with SocketApiClient(address, timeout=5.0) as c:
+            return list(c.transcribe([np.zeros(4000, dtype="<f4").tobytes()], context=context))
+
+    assert _serve(sut, client) == [segment]
+    (actual,) = contexts
+    assert actual.language == "ja"
+    assert actual.prompt == "こんにちは"
+    assert actual.segment_merging_parameters == SegmentMergingParameters(margin=1.0)
+
+
+def test_socket_api_reports_transcription_errors(mocker: MockerFixture) -> None:
+    mock_core = mocker.MagicMock(spec=SpeechToTextCore)
+    mock_core.transcribe.side_effect = RuntimeError("model failed")
+    sut = SocketApi(core=mock_core, settings=SocketApiSettings(port=0))
+
+    def client(address: Any) -> None:
+        with SocketApiClient(address, timeout=5.0) as c:
+            list(c.transcribe([np.zeros(100, dtype="<f4").tobytes()]))
+
+    with pytest.raises(SocketProtocolError, match="model failed"):
+        _serve(sut, client)
+
+
+def test_socket_api_rejects_clients_beyond_capacity(mocker: MockerFixture) -> None:
+    sut = SocketApi(core=_counting_core(mocker), settings=SocketApiSettings(port=0, max_workers=1))
+    release = threading.Event()
+
+    def held_audio() -> Generator[bytes, None, None]:
+        yield np.zeros(4000, dtype="<f4").tobytes()
+        release.wait(timeout=5.0)
+
+    def client(address: Any) -> Tuple[List[Segment], str]:
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            with SocketApiClient(address, timeout=5.0) as first:
+                held = executor.submit(lambda: list(first.transcribe(held_audio())))
+                deadline = time.monotonic() + 5.0
+                while sut.scheduler.active == 0 and time.monotonic() < deadline:
+                    time.sleep(0.01)
+                with SocketApiClient(address, timeout=5.0) as second:
+                    with pytest.raises(SocketProtocolError) as e:
+                        list(second.transcribe([np.zeros(4000, dtype="<f4").tobytes()]))
+                release.set()
+                return held.result(timeout=5.0), str(e.value)
+
+    segments, error = _serve(sut, client)
+    assert [s.text for s in segments] == ["こんにちは", "4000"]
+    assert "capacity" in error
@@ -0,0 +1,124 @@
+import json
+import os
+import tempfile
+import threading
+import time
+from collections.abc import Generator
+from typing import Any
+
+from pytest import fixture
+from pytest_mock import MockerFixture
+
+from ols2t.core import SpeechToTextCore
+from ols2t.interfaces.watch_folder import WatchFolder
+from ols2t.models import BaseStream, FileStream, Segment, TranscriptionContext
+from ols2t.settings import WatchFolderSettings
+
+
+@fixture
+def spool_dir() -> Generator[str, None, None]:
+    with tempfile.TemporaryDirectory() as tempdir:
+        yield tempdir
+
+
+def _touch(path: str) -> str:
+    with open(path, "wb") as fout:
+        fout.write(b"audio")
+    return path
+
+
+def test_watch_folder_waits_until_files_are_stable(mocker: MockerFixture, spool_dir: str) -> None:
+    sut = WatchFolder(core=mocker.MagicMock(spec=SpeechToTextCore), settings=WatchFolderSettings(input_dir=spool_dir))
+    path = _touch(os.path.join(spool_dir, "call.wav"))
+    _touch(os.path.join(spool_dir, "notes.txt"))
+    _touch(os.path.join(spool_dir, ".call.wav.tmp"))
+    assert sut.scan(now=0.0) == []
+    assert sut.scan(now=1.0) == []
+    assert sut.scan(now=2.0) == [path]
+    with open(path, "ab") as fout:
+        fout.write(b"more audio")
+    assert sut.scan(now=3.0) == []
+    assert sut.scan(now=5.0) == [path]
+
+
+class _LockCheckingDict(dict):  # type: ignore[type-arg]
+    def __init__(self, lock: Any) -> None:
+        super(_LockCheckingDict, self).__init__()
+        self.lock = lock
+
+    def get(self, *args: Any) -> Any:
+        assert self.lock.locked()
+        return super(_LockCheckingDict, self).get(*args)
+
+    def __setitem__(self, key: Any, value: Any) -> None:
+        assert self.lock.locked()
+        super(_LockCheckingDict, self).__setitem__(key, value)
+
+    def __delitem__(self, key: Any) -> None:
+        assert self.lock.locked()
+        super(_LockCheckingDict, self).__delitem__(key)
+
+
+def test_watch_folder_scan_updates_observed_files_under_the_lock(mocker: MockerFixture, spool_dir: str) -> None:
+    sut = WatchFolder(core=mocker.MagicMock(spec=SpeechToTextCore), settings=WatchFolderSettings(input_dir=spool_dir))
+    sut._observed = _LockCheckingDict(sut._lock)
+    path = _touch(os.path.join(spool_dir, "call.wav"))
+    assert sut.scan(now=0.0) == []
+    assert sut.scan(now=2.0) == [path]
+    os.remove(path)
+    assert sut.scan(now=3.0) == []
+    assert sut._observed == {}
+
+
+def test_watch_folder_writes_jsonl_next_to_input_and_skips_finished_files(
+    mocker: MockerFixture, spool_dir: str
+) -> None:
+    core = mocker.MagicMock(spec=SpeechToTextCore)
+    core.transcribe.return_value = iter([Segment(text="こんにちは", start=0.0, end=1.0, probability=0.9)])
+    sut = WatchFolder(core=core, settings=WatchFolderSettings(input_dir=spool_dir, stable_seconds=0.0))
+    path = _touch(os.path.join(spool_dir, "call.wav"))
+    sut.process(path)
+    core.transcribe.assert_called_once_with(input_stream=FileStream(path=path))
+    with open(path + ".jsonl", "r", encoding="utf-8") as fin:
+        assert [json.loads(line) for line in fin] == [
+            {"text": "こんにちは", "start": 0.0, "end": 1.0, "probability": 0.9}
+        ]
+    assert sorted(os.listdir(spool_dir)) == ["call.wav", "call.wav.jsonl"]
+    sut.scan(now=0.0)
+    assert sut.scan(now=10.0) == []
+
+
+def test_watch_folder_records_failures(mocker: MockerFixture, spool_dir: str) -> None:
+    core = mocker.MagicMock(spec=SpeechToTextCore)
+    core.transcribe.side_effect = RuntimeError("broken file")
+    sut = WatchFolder(core=core, settings=WatchFolderSettings(input_dir=spool_dir))
+    path = _touch(os.path.join(spool_dir, "call.wav"))
+    sut.process(path)
+    assert not os.path.exists(path + ".jsonl")
+    with open(path + ".error", "r", encoding="utf-8") as fin:
+        assert "broken file" in fin.read()
+    assert sut.is_finished(path)
+
+
+def test_watch_folder_run_processes_new_files_until_stopped(mocker: MockerFixture, spool_dir: str) -> None:
+    core = mocker.MagicMock(spec=SpeechToTextCore)
+
+    def fake_transcribe(input_stream: BaseStream, context: TranscriptionContext | None = None) -> Any:
+        return iter([Segment(text="x", start=0.0, end=1.0, probability=0.9)])
+
+    core.transcribe.side_effect = fake_transcribe
+    settings = WatchFolderSettings(input_dir=spool_dir, poll_interval=0.01, stable_seconds=0.0, max_workers=2)
+    sut = WatchFolder(core=core, settings=settings)
+    thread = threading.Thread(target=sut.run)
+    thread.start()
+    try:
+        paths = [_touch(os.path.join(spool_dir, f"call{i}.wav")) for i in range(5)]
+        deadline = time.monotonic() + 5.0
+        while not all(os.path.exists(p + ".jsonl") for p in paths) and time.monotonic() < deadline:
+            time.sleep(0.01)
+    finally:
+        sut.stop()
+        thread.join(timeout=5.0)
+    assert all(os.path.exists(p + ".jsonl") for p in paths)
+    assert core.transcribe.call_count == 5
+    assert not thread.is_alive()
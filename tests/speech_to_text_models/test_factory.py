@@ -3,10 +3,15 @@ from pytest_mock import MockerFixture
 
 from ols2t.settings import (
     BaseSpeechToTextModelSettings,
+    RemoteSpeechToTextModelSettings,
     SegmentMergingSpeechToTextModelSettings,
+    ShardedSpeechToTextModelSettings,
     SpeechToTextModelType,
+    StubSpeechToTextModelSettings,
+    WhisperSpeechToTextModelDecodingPreset,
     WhisperSpeechToTextModelDevice,
     WhisperSpeechToTextModelLanguage,
+    WhisperSpeechToTextModelOutputGranularity,
     WhisperSpeechToTextModelSettings,
     WhisperSpeechToTextModelSize,
 )
@@ -19,12 +24,23 @@ def test_factory_generates_whisper_speech_to_text_model(mocker: MockerFixture) -
         path_or_model_size=WhisperSpeechToTextModelSize.TINY,
         language=WhisperSpeechToTextModelLanguage.JA,
         device=WhisperSpeechToTextModelDevice.CUDA,
+        cpu_threads=4,
+        decoding_preset=WhisperSpeechToTextModelDecodingPreset.FAST,
+        beam_size=2,
     )
     create_speech_to_text_model(settings=settings)
     WhiepserSpeechToTextModel.assert_called_once_with(
         path_or_model_size=WhisperSpeechToTextModelSize.TINY,
         language=WhisperSpeechToTextModelLanguage.JA,
         device=WhisperSpeechToTextModelDevice.CUDA,
+        cpu_threads=4,
+        beam_size=2,
+        best_of=1,
+        temperature=[0.0],
+        condition_on_previous_text=False,
+        without_timestamps=False,
+        word_timestamps=False,
+        output_granularity=WhisperSpeechToTextModelOutputGranularity.SEGMENT,
     )
 
 
@@ -46,9 +62,53 @@ def test_factory_generates_segment_merging_speech_to_text_model(mocker: MockerFi
         )
     )
     create_speech_to_text_model(settings=settings)
-    SegmentMergingSpeechToTextModel.assert_called_once_with(model=WhisperSpeechToTextModel.return_value)
+    SegmentMergingSpeechToTextModel.assert_called_once_with(
+        model=WhisperSpeechToTextModel.return_value,
+        buffer_length=2,
+        margin=0.5,
+        probability_threshold=0.2,
+        prompt_token_budget=0,
+        deduplication_tolerance=None,
+    )
     WhisperSpeechToTextModel.assert_called_once_with(
         path_or_model_size=WhisperSpeechToTextModelSize.TINY,
         language=WhisperSpeechToTextModelLanguage.JA,
         device=WhisperSpeechToTextModelDevice.CPU,
+        cpu_threads=0,
+        beam_size=5,
+        best_of=5,
+        temperature=[0.0, 0.2, 0.4, 0.6, 0.8, 1.0],
+        condition_on_previous_text=True,
+        without_timestamps=False,
+        word_timestamps=True,
+        output_granularity=WhisperSpeechToTextModelOutputGranularity.WORD,
+    )
+
+
+def test_factory_generates_stub_speech_to_text_model(mocker: MockerFixture) -> None:
+    StubSpeechToTextModel = mocker.patch("ols2t.speech_to_text_models.factory.StubSpeechToTextModel")
+    settings = StubSpeechToTextModelSettings(delay=0.1, real_time_factor=0.5, text="x")
+    actual = create_speech_to_text_model(settings=settings)
+    assert actual == StubSpeechToTextModel.return_value
+    StubSpeechToTextModel.assert_called_once_with(delay=0.1, real_time_factor=0.5, text="x")
+
+
+def test_factory_generates_remote_speech_to_text_model(mocker: MockerFixture) -> None:
+    RemoteSpeechToTextModel = mocker.patch("ols2t.speech_to_text_models.factory.RemoteSpeechToTextModel")
+    settings = RemoteSpeechToTextModelSettings(addresses=["unix:/tmp/ols2t.sock"], timeout=3.0)
+    actual = create_speech_to_text_model(settings=settings)
+    assert actual == RemoteSpeechToTextModel.return_value
+    RemoteSpeechToTextModel.assert_called_once_with(addresses=["unix:/tmp/ols2t.sock"], timeout=3.0)
+
+
+def test_factory_generates_sharded_speech_to_text_model(mocker: MockerFixture) -> None:
+    ShardedSpeechToTextModel = mocker.patch("ols2t.speech_to_text_models.factory.ShardedSpeechToTextModel")
+    inner_settings = StubSpeechToTextModelSettings()
+    settings = ShardedSpeechToTextModelSettings(
+        speech_to_text_model_settings=inner_settings, num_workers=4, max_shard_seconds=60.0
+    )
+    actual = create_speech_to_text_model(settings=settings)
+    assert actual == ShardedSpeechToTextModel.return_value
+    ShardedSpeechToTextModel.assert_called_once_with(
+        speech_to_text_model_settings=inner_settings, num_workers=4, max_shard_seconds=60.0
     )
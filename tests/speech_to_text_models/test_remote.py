@@ -0,0 +1,101 @@
+import asyncio
+import threading
+from typing import Any, List
+
+import numpy as np
+import pytest
+from pytest_mock import MockerFixture
+
+from ols2t.core import SpeechToTextCore
+from ols2t.interfaces.socket_api import SocketApi
+from ols2t.models import (
+    AudioFrameStream,
+    BaseStream,
+    Segment,
+    SegmentMergingParameters,
+    TranscriptionContext,
+)
+from ols2t.settings import SocketApiSettings
+from ols2t.speech_to_text_models.remote import RemoteSpeechToTextModel
+from ols2t.speech_to_text_models.stub import StubSpeechToTextModel
+from ols2t.types import AudioFrameChunk
+
+
+def test_remote_speech_to_text_model_transcribes_on_model_servers() -> None:
+    servers = [
+        SocketApi(core=SpeechToTextCore(model=StubSpeechToTextModel(text=text)), settings=SocketApiSettings(port=0))
+        for text in ("a", "b")
+    ]
+    addresses: List[str] = []
+    started = threading.Event()
+    stop = threading.Event()
+
+    async def serve() -> None:
+        running = [await server.start_server() for server in servers]
+        for r in running:
+            host, port = r.sockets[0].getsockname()[:2]
+            addresses.append(f"{host}:{port}")
+        started.set()
+        await asyncio.get_event_loop().run_in_executor(None, stop.wait)
+        for r in running:
+            r.close()
+            await r.wait_closed()
+
+    thread = threading.Thread(target=asyncio.run, args=(serve(),), daemon=True)
+    thread.start()
+    try:
+        assert started.wait(timeout=5.0)
+        sut = RemoteSpeechToTextModel(addresses=addresses, timeout=5.0)
+        actual = []
+        for _ in range(2):
+            stream = AudioFrameStream(
+                chunks=[AudioFrameChunk(np.zeros(16000)), AudioFrameChunk(np.zeros(8000))], sampling_rate=16000
+            )
+            actual.append(list(sut.transcribe(input_stream=stream)))
+    finally:
+        stop.set()
+        thread.join(timeout=5.0)
+    # Transcriptions alternate between the model servers.
+    assert actual == [
+        [Segment(text="a", start=0.0, end=1.5, probability=1.0)],
+        [Segment(text="b", start=0.0, end=1.5, probability=1.0)],
+    ]
+
+
+def test_remote_speech_to_text_model_forwards_the_context(mocker: MockerFixture) -> None:
+    contexts: List[TranscriptionContext] = []
+
+    def fake_transcribe(input_stream: BaseStream, context: TranscriptionContext | None = None) -> Any:
+        assert context is not None
+        contexts.append(context)
+        with input_stream as chunks:
+            for _ in chunks:
+                pass
+        yield Segment(text="a", start=0.0, end=1.0, probability=1.0, channel=0)
+
+    mock_core = mocker.MagicMock(spec=SpeechToTextCore)
+    mock_core.transcribe.side_effect = fake_transcribe
+    server = SocketApi(core=mock_core, settings=SocketApiSettings(port=0))
+
+    async def scenario() -> List[Segment]:
+        running = await server.start_server()
+        async with running:
+            host, port = running.sockets[0].getsockname()[:2]
+            sut = RemoteSpeechToTextModel(addresses=[f"{host}:{port}"], timeout=5.0)
+            stream = AudioFrameStream(chunks=[AudioFrameChunk(np.zeros(16000))], sampling_rate=16000)
+            context = TranscriptionContext(
+                language="en", prompt="hello", segment_merging_parameters=SegmentMergingParameters(buffer_length=2)
+            )
+            return await asyncio.get_event_loop().run_in_executor(
+                None, lambda: list(sut.transcribe(input_stream=stream, context=context))
+            )
+
+    assert asyncio.run(scenario()) == [Segment(text="a", start=0.0, end=1.0, probability=1.0, channel=0)]
+    (actual,) = contexts
+    assert (actual.language, actual.prompt) == ("en", "hello")
+    assert actual.segment_merging_parameters.buffer_length == 2
+
+
+def test_remote_speech_to_text_model_requires_an_address() -> None:
+    with pytest.raises(ValueError):
+        RemoteSpeechToTextModel(addresses=[])
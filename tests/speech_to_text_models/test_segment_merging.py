@@ -1,12 +1,19 @@
 from collections.abc import Generator
 from typing import List
-from unittest.mock import MagicMock, call
+from unittest.mock import ANY, MagicMock, call
 
 import pytest
 from pytest import fixture
 from pytest_mock import MockerFixture
 
-from ols2t.models import BaseStream, FileStream, Segment
+from ols2t.models import (
+    AudioChunkStream,
+    BaseStream,
+    FileStream,
+    Segment,
+    SegmentMergingParameters,
+    TranscriptionContext,
+)
 from ols2t.settings import (
     WhisperSpeechToTextModelLanguage,
     WhisperSpeechToTextModelSize,
@@ -150,7 +157,9 @@ def test_segment_merging_transcribe(
     actual = list(sut.transcribe(input_stream=dummy_input_stream))
     assert actual == expected
     assert speech_to_text_model_mock.transcribe.call_count == 8
-    speech_to_text_model_mock.transcribe.assert_has_calls([call(v) for v in audio_frame_stream_values])
+    speech_to_text_model_mock.transcribe.assert_has_calls([call(v, context=ANY) for v in audio_frame_stream_values])
+    contexts = {id(c.kwargs["context"]) for c in speech_to_text_model_mock.transcribe.call_args_list}
+    assert len(contexts) == 1
     AudioFrameStream.assert_has_calls(
         [
             call(chunks=[dummy_input_segments[0]], sampling_rate=16000),
@@ -201,6 +210,131 @@ def test_merge_segments(segments: List[Segment], expected: List[Segment]) -> Non
     assert actual == expected
 
 
+def test_segment_merging_carries_confirmed_text_as_prompt() -> None:
+    prompts: List[str | None] = []
+
+    def fake_transcribe(input_stream: BaseStream, context: TranscriptionContext) -> Generator[Segment, None, None]:
+        prompts.append(context.prompt)
+        with input_stream as chunks:
+            length = sum(len(chunk) for chunk in chunks) / 16000
+        for i in range(int(length)):
+            yield Segment(text=f"w{len(prompts)}", start=float(i), end=i + 0.9, probability=0.9)
+
+    model = MagicMock(spec=BaseSpeechToTextModel)
+    model.transcribe.side_effect = fake_transcribe
+    input_stream = MagicMock(spec=BaseStream)
+    input_stream.__enter__.return_value = AudioChunkStream(
+        sampling_rate=16000, data=iter([AudioFrameChunk([0.0] * 16000) for _ in range(6)])
+    )
+    sut = segment_merging.SegmentMergingSpeechToTextModel(model=model, prompt_token_budget=2)
+    list(sut.transcribe(input_stream=input_stream))
+    assert prompts[:4] == [None, None, None, None]
+    assert all(prompt is not None for prompt in prompts[4:])
+    # Only the most recent confirmed segments are kept within the budget.
+    assert all(len(prompt or "") <= 4 for prompt in prompts)
+
+
+@pytest.mark.parametrize(("context_budget", "expected"), [(None, 2), (0, 0), (1, 1)])
+def test_segment_merging_keeps_the_prompt_token_budget_of_the_context(
+    context_budget: int | None, expected: int
+) -> None:
+    budgets: List[int | None] = []
+
+    def fake_transcribe(input_stream: BaseStream, context: TranscriptionContext) -> Generator[Segment, None, None]:
+        budgets.append(context.prompt_token_budget)
+        yield from []
+
+    model = MagicMock(spec=BaseSpeechToTextModel)
+    model.transcribe.side_effect = fake_transcribe
+    input_stream = MagicMock(spec=BaseStream)
+    input_stream.__enter__.return_value = AudioChunkStream(
+        sampling_rate=16000, data=iter([AudioFrameChunk([0.0] * 16000)])
+    )
+    sut = segment_merging.SegmentMergingSpeechToTextModel(model=model, prompt_token_budget=2)
+    context = TranscriptionContext(prompt_token_budget=context_budget)
+    list(sut.transcribe(input_stream=input_stream, context=context))
+    assert budgets == [expected]
+
+
+@pytest.mark.parametrize(
+    ("context", "expected_window_seconds"),
+    [
+        (None, [1, 2, 2, 2, 2]),
+        (TranscriptionContext(segment_merging_parameters=SegmentMergingParameters(buffer_length=1)), [1, 1, 1, 1, 1]),
+    ],
+)
+def test_segment_merging_window_follows_request_overrides(
+    context: TranscriptionContext | None, expected_window_seconds: List[int]
+) -> None:
+    window_seconds: List[int] = []
+
+    def fake_transcribe(input_stream: BaseStream, context: TranscriptionContext) -> Generator[Segment, None, None]:
+        with input_stream as chunks:
+            window_seconds.append(sum(len(chunk) for chunk in chunks) // 16000)
+        yield from []
+
+    model = MagicMock(spec=BaseSpeechToTextModel)
+    model.transcribe.side_effect = fake_transcribe
+    input_stream = MagicMock(spec=BaseStream)
+    input_stream.__enter__.return_value = AudioChunkStream(
+        sampling_rate=16000, data=iter([AudioFrameChunk([0.0] * 16000) for _ in range(5)])
+    )
+    sut = segment_merging.SegmentMergingSpeechToTextModel(model=model, buffer_length=2)
+    list(sut.transcribe(input_stream=input_stream, context=context))
+    assert window_seconds == expected_window_seconds
+
+
+def test_segment_merging_stops_when_cancelled() -> None:
+    context = TranscriptionContext()
+
+    def fake_transcribe(input_stream: BaseStream, context: TranscriptionContext) -> Generator[Segment, None, None]:
+        context.cancel()
+        yield Segment(text="w", start=0.0, end=0.5, probability=0.9)
+
+    model = MagicMock(spec=BaseSpeechToTextModel)
+    model.transcribe.side_effect = fake_transcribe
+    input_stream = MagicMock(spec=BaseStream)
+    input_stream.__enter__.return_value = AudioChunkStream(
+        sampling_rate=16000, data=iter([AudioFrameChunk([0.0] * 16000) for _ in range(5)])
+    )
+    sut = segment_merging.SegmentMergingSpeechToTextModel(model=model)
+    assert list(sut.transcribe(input_stream=input_stream, context=context)) == []
+    model.transcribe.assert_called_once()
+    input_stream.__exit__.assert_called_once()
+
+
+def test_segment_merging_closes_the_inner_model() -> None:
+    model = MagicMock(spec=BaseSpeechToTextModel)
+    with segment_merging.SegmentMergingSpeechToTextModel(model=model):
+        model.close.assert_not_called()
+    model.close.assert_called_once_with()
+
+
+def test_add_segment_deduplicates_repeated_words() -> None:
+    sut = segment_merging.SegmentMergingSpeechToTextModel(
+        model=MagicMock(spec=BaseSpeechToTextModel), deduplication_tolerance=0.2
+    )
+    segment_buffer: List[Segment] = []
+    sut.add_segment(segment_buffer, Segment(text=" Hello", start=1.0, end=1.5, probability=0.6))
+    sut.add_segment(segment_buffer, Segment(text="hello,", start=1.1, end=1.45, probability=0.9))
+    sut.add_segment(segment_buffer, Segment(text=" Hello", start=1.05, end=1.5, probability=0.5))
+    sut.add_segment(segment_buffer, Segment(text=" Hello", start=2.0, end=2.5, probability=0.5))
+    sut.add_segment(segment_buffer, Segment(text=" world", start=1.0, end=1.5, probability=0.5))
+    assert segment_buffer == [
+        Segment(text="hello,", start=1.1, end=1.45, probability=0.9),
+        Segment(text=" Hello", start=2.0, end=2.5, probability=0.5),
+        Segment(text=" world", start=1.0, end=1.5, probability=0.5),
+    ]
+
+
+def test_add_segment_keeps_duplicates_by_default() -> None:
+    sut = segment_merging.SegmentMergingSpeechToTextModel(model=MagicMock(spec=BaseSpeechToTextModel))
+    segment_buffer: List[Segment] = []
+    sut.add_segment(segment_buffer, Segment(text="hello", start=1.0, end=1.5, probability=0.6))
+    sut.add_segment(segment_buffer, Segment(text="hello", start=1.0, end=1.5, probability=0.6))
+    assert len(segment_buffer) == 2
+
+
 @pytest.mark.slow
 def test_segment_merging_speech_to_text_model_transcribe(hello_fixture: FileStream) -> None:
     model = segment_merging.SegmentMergingSpeechToTextModel(
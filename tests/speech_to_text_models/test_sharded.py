@@ -0,0 +1,37 @@
+import numpy as np
+import pytest
+from pytest_mock import MockerFixture
+
+from ols2t.models import AudioFrameStream
+from ols2t.settings import StubSpeechToTextModelSettings
+from ols2t.speech_to_text_models.sharded import ShardedSpeechToTextModel
+from ols2t.types import AudioFrameChunk
+
+
+def test_sharded_speech_to_text_model_shifts_segments_to_global_time(mocker: MockerFixture) -> None:
+    stream = AudioFrameStream(chunks=[AudioFrameChunk(np.zeros(40000))], sampling_rate=16000)
+    with ShardedSpeechToTextModel(
+        speech_to_text_model_settings=StubSpeechToTextModelSettings(text="x"), num_workers=2
+    ) as sut:
+        mocker.patch.object(sut, "shard", return_value=[(0, 16000), (16000, 40000)])
+        actual = list(sut.transcribe(input_stream=stream))
+        executor = sut.executor
+    # Leaving the model shut the worker processes down.
+    with pytest.raises(RuntimeError):
+        executor.submit(int)
+    assert [(s.text, s.start, s.end) for s in actual] == [("x", 0.0, 1.0), ("x", 1.0, 2.5)]
+
+
+def test_sharded_speech_to_text_model_cuts_shards_in_silence() -> None:
+    sampling_rate = 16000
+    t = np.arange(sampling_rate, dtype=np.float32) / sampling_rate
+    tone = (0.5 * np.sin(2 * np.pi * 440 * t)).astype(np.float32)
+    silence = np.zeros(sampling_rate, dtype=np.float32)
+    audio = np.concatenate([tone, silence, tone, silence, tone])
+    sut = ShardedSpeechToTextModel(speech_to_text_model_settings=StubSpeechToTextModelSettings(), num_workers=2)
+    shards = sut.shard(audio, sampling_rate)
+    assert shards[0][0] == 0
+    assert shards[-1][1] == len(audio)
+    for (_, end), (start, _) in zip(shards, shards[1:]):
+        assert end == start
+        assert np.all(audio[end - 100 : end + 100] == 0.0)
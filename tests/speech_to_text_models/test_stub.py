@@ -0,0 +1,36 @@
+import time
+from unittest.mock import MagicMock
+
+import numpy as np
+
+from ols2t.models import AudioChunkStream, BaseStream, Segment
+from ols2t.speech_to_text_models.stub import StubSpeechToTextModel
+from ols2t.types import AudioFrameChunk
+
+
+def test_stub_speech_to_text_model_emits_one_segment_per_chunk() -> None:
+    input_stream = MagicMock(spec=BaseStream)
+    input_stream.__enter__.return_value = AudioChunkStream(
+        sampling_rate=16000,
+        data=iter(
+            [AudioFrameChunk(np.zeros(16000, dtype=np.float32)), AudioFrameChunk(np.zeros(8000, dtype=np.float32))]
+        ),
+    )
+    sut = StubSpeechToTextModel(text="x")
+    actual = list(sut.transcribe(input_stream=input_stream))
+    assert actual == [
+        Segment(text="x", start=0.0, end=1.0, probability=1.0),
+        Segment(text="x", start=1.0, end=1.5, probability=1.0),
+    ]
+    input_stream.__exit__.assert_called_once()
+
+
+def test_stub_speech_to_text_model_waits_for_delay() -> None:
+    input_stream = MagicMock(spec=BaseStream)
+    input_stream.__enter__.return_value = AudioChunkStream(
+        sampling_rate=16000, data=iter([AudioFrameChunk(np.zeros(16000, dtype=np.float32))])
+    )
+    sut = StubSpeechToTextModel(delay=0.05, real_time_factor=0.1)
+    started = time.perf_counter()
+    list(sut.transcribe(input_stream=input_stream))
+    assert time.perf_counter() - started >= 0.15
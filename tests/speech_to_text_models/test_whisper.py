@@ -1,10 +1,27 @@
+import math
+import os
+import tempfile
+from unittest.mock import MagicMock
+
+import numpy as np
 import pytest
 from ctranslate2 import get_cuda_device_count
+from pytest_mock import MockerFixture
 
-from ols2t.models import FileStream, Segment
+from ols2t.models import (
+    AudioFrameStream,
+    FileStream,
+    PcmFileStream,
+    Segment,
+    TranscriptionContext,
+    Word,
+)
 from ols2t.settings import (
+    WhisperSpeechToTextModelDecodingPreset,
     WhisperSpeechToTextModelDevice,
     WhisperSpeechToTextModelLanguage,
+    WhisperSpeechToTextModelOutputGranularity,
+    WhisperSpeechToTextModelSettings,
     WhisperSpeechToTextModelSize,
 )
 from ols2t.speech_to_text_models.whisper import WhisperSpeechToTextModel
@@ -38,3 +55,159 @@ def test_whisper_speech_to_text_model_accepts_device_argument() -> None:
     else:
         with pytest.raises(RuntimeError):
             model.model_cache
+
+
+def test_whisper_speech_to_text_model_yields_segments_without_word_timestamps(mocker: MockerFixture) -> None:
+    WhisperModel = mocker.patch("ols2t.speech_to_text_models.whisper.WhisperModel")
+    segment = MagicMock(start=0.5, end=1.5, text="こんにちは", avg_logprob=-0.1, words=None)
+    WhisperModel.return_value.transcribe.return_value = ([segment], MagicMock())
+    model = WhisperSpeechToTextModel(
+        path_or_model_size=WhisperSpeechToTextModelSize.TINY,
+        language=WhisperSpeechToTextModelLanguage.JA,
+        beam_size=1,
+        best_of=1,
+        temperature=[0.0],
+        condition_on_previous_text=False,
+        word_timestamps=False,
+        output_granularity=WhisperSpeechToTextModelOutputGranularity.SEGMENT,
+    )
+    stream = AudioFrameStream(chunks=[np.zeros(16000, dtype=np.float32)], sampling_rate=16000)
+    actual = list(model.transcribe(input_stream=stream))
+    assert actual == [Segment(start=0.5, end=1.5, text="こんにちは", probability=math.exp(-0.1))]
+    kwargs = WhisperModel.return_value.transcribe.call_args.kwargs
+    assert kwargs["beam_size"] == 1
+    assert kwargs["best_of"] == 1
+    assert kwargs["temperature"] == [0.0]
+    assert kwargs["condition_on_previous_text"] is False
+    assert kwargs["word_timestamps"] is False
+
+
+def test_whisper_fast_decoding_preset_can_be_overridden() -> None:
+    settings = WhisperSpeechToTextModelSettings(
+        path_or_model_size=WhisperSpeechToTextModelSize.TINY,
+        language=WhisperSpeechToTextModelLanguage.JA,
+        decoding_preset=WhisperSpeechToTextModelDecodingPreset.FAST,
+        word_timestamps=True,
+    )
+    assert settings.beam_size == 1
+    assert settings.temperature == [0.0]
+    assert settings.word_timestamps is True
+    assert settings.output_granularity == WhisperSpeechToTextModelOutputGranularity.SEGMENT
+
+
+def test_whisper_default_decoding_preset_keeps_the_field_defaults() -> None:
+    settings = WhisperSpeechToTextModelSettings(
+        path_or_model_size=WhisperSpeechToTextModelSize.TINY, language=WhisperSpeechToTextModelLanguage.JA
+    )
+    explicit = WhisperSpeechToTextModelSettings(
+        path_or_model_size=WhisperSpeechToTextModelSize.TINY,
+        language=WhisperSpeechToTextModelLanguage.JA,
+        decoding_preset=WhisperSpeechToTextModelDecodingPreset.DEFAULT,
+    )
+    assert explicit == settings
+    assert settings.beam_size == 5
+    assert settings.word_timestamps is True
+    assert settings.output_granularity == WhisperSpeechToTextModelOutputGranularity.WORD
+
+
+def test_whisper_word_granularity_requires_word_timestamps() -> None:
+    with pytest.raises(ValueError):
+        WhisperSpeechToTextModelSettings(
+            path_or_model_size=WhisperSpeechToTextModelSize.TINY,
+            language=WhisperSpeechToTextModelLanguage.JA,
+            decoding_preset=WhisperSpeechToTextModelDecodingPreset.FAST,
+            output_granularity=WhisperSpeechToTextModelOutputGranularity.WORD,
+        )
+    with pytest.raises(ValueError):
+        WhisperSpeechToTextModel(
+            path_or_model_size=WhisperSpeechToTextModelSize.TINY,
+            language=WhisperSpeechToTextModelLanguage.JA,
+            word_timestamps=False,
+        )
+
+
+def test_whisper_segment_granularity_nests_words(mocker: MockerFixture) -> None:
+    WhisperModel = mocker.patch("ols2t.speech_to_text_models.whisper.WhisperModel")
+    words = [
+        MagicMock(start=0.5, end=1.0, word="こん", probability=0.8),
+        MagicMock(start=1.0, end=1.5, word="にちは", probability=0.9),
+    ]
+    segment = MagicMock(start=0.5, end=1.5, text="こんにちは", avg_logprob=-0.1, words=words)
+    WhisperModel.return_value.transcribe.return_value = ([segment], MagicMock())
+    model = WhisperSpeechToTextModel(
+        path_or_model_size=WhisperSpeechToTextModelSize.TINY,
+        language=WhisperSpeechToTextModelLanguage.JA,
+        output_granularity=WhisperSpeechToTextModelOutputGranularity.SEGMENT,
+    )
+    stream = AudioFrameStream(chunks=[np.zeros(16000, dtype=np.float32)], sampling_rate=16000)
+    actual = list(model.transcribe(input_stream=stream))
+    assert len(actual) == 1
+    assert actual[0].text == "こんにちは"
+    assert actual[0].words == [
+        Word(text="こん", start=0.5, end=1.0, probability=0.8),
+        Word(text="にちは", start=1.0, end=1.5, probability=0.9),
+    ]
+
+
+def test_whisper_auto_language_is_detected_once_per_stream(mocker: MockerFixture) -> None:
+    WhisperModel = mocker.patch("ols2t.speech_to_text_models.whisper.WhisperModel")
+    WhisperModel.return_value.transcribe.side_effect = [
+        ([], MagicMock(language="en", duration_after_vad=0.0)),
+        ([], MagicMock(language="ja", duration_after_vad=1.0)),
+        ([], MagicMock(language="ja", duration_after_vad=1.0)),
+    ]
+    model = WhisperSpeechToTextModel(
+        path_or_model_size=WhisperSpeechToTextModelSize.TINY, language=WhisperSpeechToTextModelLanguage.AUTO
+    )
+    context = TranscriptionContext()
+    input_stream = MagicMock(spec=AudioFrameStream)
+    input_stream.__enter__.return_value.__iter__.return_value = iter([np.zeros(16000, dtype=np.float32)] * 3)
+    input_stream.__enter__.return_value.sampling_rate = 16000
+    list(model.transcribe(input_stream=input_stream, context=context))
+    languages = [c.kwargs["language"] for c in WhisperModel.return_value.transcribe.call_args_list]
+    # The silent first chunk does not decide the language; the first voiced one does.
+    assert languages == [None, None, "ja"]
+    assert context.language == "ja"
+
+
+def test_whisper_passes_prompt_within_token_budget(mocker: MockerFixture) -> None:
+    WhisperModel = mocker.patch("ols2t.speech_to_text_models.whisper.WhisperModel")
+    WhisperModel.return_value.hf_tokenizer.encode.return_value.ids = [1, 2, 3, 4, 5]
+    WhisperModel.return_value.transcribe.return_value = ([], MagicMock(language="ja", duration_after_vad=1.0))
+    model = WhisperSpeechToTextModel(
+        path_or_model_size=WhisperSpeechToTextModelSize.TINY, language=WhisperSpeechToTextModelLanguage.JA
+    )
+    stream = AudioFrameStream(chunks=[np.zeros(16000, dtype=np.float32)], sampling_rate=16000)
+    context = TranscriptionContext(prompt="こんにちは", prompt_token_budget=3)
+    list(model.transcribe(input_stream=stream, context=context))
+    WhisperModel.return_value.hf_tokenizer.encode.assert_called_once_with(" こんにちは", add_special_tokens=False)
+    assert WhisperModel.return_value.transcribe.call_args.kwargs["initial_prompt"] == [3, 4, 5]
+
+
+@pytest.mark.parametrize(
+    "output_granularity",
+    [WhisperSpeechToTextModelOutputGranularity.WORD, WhisperSpeechToTextModelOutputGranularity.SEGMENT],
+)
+def test_whisper_shifts_segments_by_the_start_of_their_chunk(
+    mocker: MockerFixture, output_granularity: WhisperSpeechToTextModelOutputGranularity
+) -> None:
+    WhisperModel = mocker.patch("ols2t.speech_to_text_models.whisper.WhisperModel")
+
+    def decode(*args: object, **kwargs: object) -> object:
+        words = [MagicMock(start=0.5, end=1.0, word="こんにちは", probability=0.8)]
+        segment = MagicMock(start=0.5, end=1.0, text="こんにちは", avg_logprob=0.0, words=words)
+        return [segment], MagicMock(language="ja", duration_after_vad=1.0)
+
+    WhisperModel.return_value.transcribe.side_effect = decode
+    model = WhisperSpeechToTextModel(
+        path_or_model_size=WhisperSpeechToTextModelSize.TINY,
+        language=WhisperSpeechToTextModelLanguage.JA,
+        output_granularity=output_granularity,
+    )
+    with tempfile.TemporaryDirectory() as tempdir:
+        path = os.path.join(tempdir, "audio.npy")
+        np.save(path, np.zeros(48000, dtype=np.float32))
+        actual = list(model.transcribe(input_stream=PcmFileStream(path=path, chunk_frames=32000)))
+    assert [(s.start, s.end) for s in actual] == [(0.5, 1.0), (2.5, 3.0)]
+    if output_granularity == WhisperSpeechToTextModelOutputGranularity.SEGMENT:
+        assert actual[1].words == [Word(text="こんにちは", start=2.5, end=3.0, probability=0.8)]
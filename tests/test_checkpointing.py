@@ -0,0 +1,68 @@
+import os
+import tempfile
+
+import pytest
+from pytest_mock import MockerFixture
+
+from ols2t.checkpointing import (
+    Checkpointer,
+    CheckpointError,
+    TranscriptionCheckpoint,
+    resume_output,
+)
+from ols2t.models import Segment
+from ols2t.writers import JsonlSegmentWriter
+
+
+def test_checkpointer_saves_at_most_every_interval_and_finish_removes_it(mocker: MockerFixture) -> None:
+    mocker.patch("ols2t.checkpointing.time.monotonic", return_value=100.0)
+    with tempfile.TemporaryDirectory() as tempdir:
+        output_path = os.path.join(tempdir, "output.jsonl")
+        checkpoint_path = output_path + ".checkpoint"
+        segment = Segment(text="first", start=0.0, end=1.0, probability=1.0)
+        with JsonlSegmentWriter(output_path) as writer:
+            sut = Checkpointer(checkpoint_path, TranscriptionCheckpoint(audio_file="long.wav"), writer, interval=10.0)
+            writer.write(segment)
+            assert sut.update(1.0, now=105.0) is False
+            assert not os.path.exists(checkpoint_path)
+            assert sut.update(2.0, now=110.0) is True
+            writer.write(segment)
+            assert sut.update(3.0, now=111.0) is False
+            saved = TranscriptionCheckpoint.load(checkpoint_path)
+            assert saved == TranscriptionCheckpoint(
+                audio_file="long.wav", offset=2.0, output_size=len(segment.model_dump_json()) + 1
+            )
+            assert sut.checkpoint == saved
+        assert [name for name in os.listdir(tempdir) if name.endswith(".tmp")] == []
+        sut.finish()
+        assert not os.path.exists(checkpoint_path)
+
+
+def test_resume_output_truncates_output_written_after_the_checkpoint() -> None:
+    with tempfile.TemporaryDirectory() as tempdir:
+        output_path = os.path.join(tempdir, "output.jsonl")
+        checkpoint_path = output_path + ".checkpoint"
+        with open(output_path, "w", encoding="utf-8") as fout:
+            fout.write("confirmed\nlost\n")
+        TranscriptionCheckpoint(audio_file="long.wav", offset=4.0, output_size=len("confirmed\n")).save(checkpoint_path)
+        checkpoint = resume_output(checkpoint_path, output_path, "long.wav")
+        with open(output_path, "r", encoding="utf-8") as fin:
+            assert fin.read() == "confirmed\n"
+        assert checkpoint.offset == 4.0
+        with pytest.raises(CheckpointError):
+            resume_output(checkpoint_path, output_path, "other.wav")
+        TranscriptionCheckpoint(audio_file="long.wav", offset=8.0, output_size=100).save(checkpoint_path)
+        with pytest.raises(CheckpointError):
+            resume_output(checkpoint_path, output_path, "long.wav")
+
+
+def test_resume_output_without_checkpoint_starts_over_only_from_an_empty_output() -> None:
+    with tempfile.TemporaryDirectory() as tempdir:
+        output_path = os.path.join(tempdir, "output.jsonl")
+        checkpoint_path = output_path + ".checkpoint"
+        assert resume_output(checkpoint_path, output_path, "long.wav") == TranscriptionCheckpoint(audio_file="long.wav")
+        with open(output_path, "w", encoding="utf-8") as fout:
+            fout.write("finished\n")
+        with pytest.raises(CheckpointError):
+            resume_output(checkpoint_path, output_path, "long.wav")
+        assert os.path.getsize(output_path) == len("finished\n")
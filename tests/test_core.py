@@ -1,7 +1,15 @@
+import asyncio
+import itertools
+import threading
+from collections.abc import Generator
+from typing import List
+from unittest.mock import ANY
+
+import pytest
 from pytest_mock import MockerFixture
 
 from ols2t.core import SpeechToTextCore
-from ols2t.models import FileStream, Segment
+from ols2t.models import BaseStream, FileStream, Segment, TranscriptionContext
 from ols2t.settings import (
     SpeechToTextCoreSettings,
     SpeechToTextModelType,
@@ -39,4 +47,103 @@ def test_speech_to_text_core_transcribe(mocker: MockerFixture, hello_fixture: Fi
 
     actual = core.transcribe(input_stream=hello_fixture)
     assert list(actual) == segments
-    model.transcribe.assert_called_once_with(input_stream=hello_fixture)
+    model.transcribe.assert_called_once_with(input_stream=hello_fixture, context=None)
+
+
+def test_speech_to_text_core_closes_its_model(mocker: MockerFixture) -> None:
+    model = mocker.Mock(spec=BaseSpeechToTextModel)
+    close = mocker.patch.object(model, "close")
+    with SpeechToTextCore(model=model) as core:
+        assert core.model is model
+        close.assert_not_called()
+    close.assert_called_once_with()
+
+
+def test_speech_to_text_core_atranscribe(mocker: MockerFixture, hello_fixture: FileStream) -> None:
+    model = mocker.Mock(spec=BaseSpeechToTextModel)
+    segments = [Segment(text=str(i), start=float(i), end=i + 1.0, probability=0.9) for i in range(10)]
+    model.transcribe.return_value = iter(segments)
+    core = SpeechToTextCore(model=model)
+
+    async def collect() -> List[Segment]:
+        return [segment async for segment in core.atranscribe(input_stream=hello_fixture, max_buffered_segments=2)]
+
+    assert asyncio.run(collect()) == segments
+    model.transcribe.assert_called_once_with(input_stream=hello_fixture, context=ANY)
+    assert not model.transcribe.call_args.kwargs["context"].cancelled
+
+
+def test_speech_to_text_core_atranscribe_propagates_errors(mocker: MockerFixture, hello_fixture: FileStream) -> None:
+    def fail(input_stream: BaseStream, context: TranscriptionContext | None = None) -> Generator[Segment, None, None]:
+        yield Segment(text="a", start=0.0, end=1.0, probability=0.9)
+        raise RuntimeError("model failed")
+
+    model = mocker.Mock(spec=BaseSpeechToTextModel)
+    model.transcribe.side_effect = fail
+    core = SpeechToTextCore(model=model)
+    received: List[Segment] = []
+
+    async def collect() -> None:
+        async for segment in core.atranscribe(input_stream=hello_fixture):
+            received.append(segment)
+
+    with pytest.raises(RuntimeError, match="model failed"):
+        asyncio.run(collect())
+    assert [segment.text for segment in received] == ["a"]
+
+
+def test_speech_to_text_core_atranscribe_stops_model_when_consumer_leaves(
+    mocker: MockerFixture, hello_fixture: FileStream
+) -> None:
+    closed = threading.Event()
+    produced: List[int] = []
+
+    def endless(
+        input_stream: BaseStream, context: TranscriptionContext | None = None
+    ) -> Generator[Segment, None, None]:
+        try:
+            for i in itertools.count():
+                produced.append(i)
+                yield Segment(text=str(i), start=float(i), end=i + 1.0, probability=0.9)
+        finally:
+            closed.set()
+
+    model = mocker.Mock(spec=BaseSpeechToTextModel)
+    model.transcribe.side_effect = endless
+    core = SpeechToTextCore(model=model)
+
+    async def take_one() -> Segment:
+        async for segment in core.atranscribe(input_stream=hello_fixture, max_buffered_segments=1):
+            return segment
+        raise AssertionError("no segment")
+
+    assert asyncio.run(take_one()).text == "0"
+    assert closed.wait(timeout=5.0)
+    assert len(produced) <= 4
+    assert model.transcribe.call_args.kwargs["context"].cancelled
+
+
+def test_speech_to_text_core_transcribe_channels_tags_segments(mocker: MockerFixture) -> None:
+    streams = [mocker.MagicMock(spec=BaseStream), mocker.MagicMock(spec=BaseStream)]
+
+    def fake_transcribe(
+        input_stream: BaseStream, context: TranscriptionContext | None = None
+    ) -> Generator[Segment, None, None]:
+        name = "agent" if input_stream is streams[0] else "customer"
+        for i in range(3):
+            yield Segment(text=f"{name}{i}", start=float(i), end=i + 1.0, probability=0.9)
+
+    model = mocker.Mock(spec=BaseSpeechToTextModel)
+    model.transcribe.side_effect = fake_transcribe
+    core = SpeechToTextCore(model=model)
+    actual = list(core.transcribe_channels(input_streams=streams))
+    assert sorted((segment.channel, segment.text) for segment in actual) == [
+        (0, "agent0"),
+        (0, "agent1"),
+        (0, "agent2"),
+        (1, "customer0"),
+        (1, "customer1"),
+        (1, "customer2"),
+    ]
+    assert [s.text for s in actual if s.channel == 1] == ["customer0", "customer1", "customer2"]
+    assert actual[0].model_dump()["channel"] in (0, 1)
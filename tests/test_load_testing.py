@@ -0,0 +1,50 @@
+import asyncio
+import os
+
+from ols2t.load_testing import (
+    LoadTestConfig,
+    LoadTestEndpoint,
+    RequestResult,
+    run_load_test,
+    serve_stub_http_api,
+    summarize,
+)
+
+
+def test_summarize_reports_percentiles_and_error_rate() -> None:
+    config = LoadTestConfig(
+        url="http://localhost:8000", endpoint=LoadTestEndpoint.TRANSCRIBE, audio_path="a.wav", audio_seconds=2.0
+    )
+    results = [
+        RequestResult(latency=1.0, time_to_first_segment=0.5, segments=1),
+        RequestResult(latency=3.0, time_to_first_segment=None, segments=0),
+        RequestResult(latency=0.1, time_to_first_segment=None, segments=0, error="boom"),
+    ]
+    actual = summarize(config, results, elapsed=4.0)
+    assert actual["requests"] == 3
+    assert actual["succeeded"] == 2
+    assert actual["error_rate"] == 1 / 3
+    assert actual["errors"] == {"boom": 1}
+    assert actual["throughput_requests_per_second"] == 0.5
+    assert actual["throughput_audio_seconds_per_second"] == 1.0
+    assert actual["latency_seconds"]["p50"] == 2.0
+    assert actual["time_to_first_segment_seconds"]["p50"] == 0.5
+
+
+def test_load_test_against_stub_server(fixture_dir: str) -> None:
+    audio_path = os.path.join(fixture_dir, "webm_chunks", "audio.webm")
+    with serve_stub_http_api(delay=0.01) as url:
+        for endpoint in LoadTestEndpoint:
+            config = LoadTestConfig(
+                url=url,
+                endpoint=endpoint,
+                audio_path=audio_path,
+                audio_seconds=1.0,
+                concurrency=2,
+                requests_per_client=2,
+                speed=0.0,
+            )
+            actual = asyncio.run(run_load_test(config))
+            assert actual["requests"] == 4
+            assert actual["error_rate"] == 0.0, actual["errors"]
+            assert actual["time_to_first_segment_seconds"]["p50"] is not None
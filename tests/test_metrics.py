@@ -0,0 +1,76 @@
+import time
+from typing import List
+
+from ols2t.metrics import (
+    Histogram,
+    PipelineMetrics,
+    PipelineStage,
+    Stopwatch,
+)
+
+
+def test_stopwatch_excludes_consumer_time() -> None:
+    def producer() -> List[int]:
+        time.sleep(0.05)
+        return [1, 2]
+
+    sut = Stopwatch()
+    for _ in sut.iterate(producer()):
+        time.sleep(0.1)
+    assert sut.elapsed < 0.1
+
+
+def test_histogram_cumulative_counts() -> None:
+    sut = Histogram(buckets=(0.1, 1.0))
+    for value in (0.05, 0.1, 0.5, 2.0):
+        sut.observe(value)
+    assert sut.cumulative_counts() == [(0.1, 2), (1.0, 3), (float("inf"), 4)]
+    assert sut.count == 4
+    assert abs(sut.sum - 2.65) < 1e-9
+
+
+def test_pipeline_metrics_summary() -> None:
+    sut = PipelineMetrics()
+    sut.observe_stage(PipelineStage.MODEL_TRANSCRIBE, 1.0, audio_seconds=4.0)
+    sut.observe_stage(PipelineStage.MODEL_TRANSCRIBE, 1.0, audio_seconds=4.0)
+    sut.observe_stage(PipelineStage.SERIALIZE, 0.01)
+    sut.observe_queue_wait("microphone", 0.5, depth=3)
+    sut.observe_queue_wait("microphone", 0.5, depth=1)
+    sut.observe_chunk("microphone", 16000)
+    sut.count_segments(PipelineStage.MODEL_TRANSCRIBE, 5)
+    sut.count_dropped_audio("microphone", 1.5)
+    actual = sut.summary()
+    assert actual["stages"]["model_transcribe"] == {
+        "count": 2,
+        "total_seconds": 2.0,
+        "mean_seconds": 1.0,
+        "audio_seconds": 8.0,
+        "real_time_factor": 0.25,
+    }
+    assert "real_time_factor" not in actual["stages"]["serialize"]
+    assert actual["queues"]["microphone"] == {"waits": 2, "total_wait_seconds": 1.0, "depth": 1.0, "max_depth": 3.0}
+    assert actual["chunks"]["microphone"] == {"count": 1, "total_samples": 16000.0, "mean_samples": 16000.0}
+    assert actual["segments"] == {"model_transcribe": 5.0}
+    assert actual["dropped_audio_seconds"] == {"microphone": 1.5}
+
+
+def test_pipeline_metrics_to_prometheus() -> None:
+    sut = PipelineMetrics()
+    sut.observe_stage(PipelineStage.DECODE_AUDIO, 0.5, audio_seconds=2.0)
+    sut.observe_queue_wait("bytes_chunk", 0.0, depth=7)
+    actual = sut.to_prometheus().splitlines()
+    assert "# TYPE ols2t_stage_duration_seconds histogram" in actual
+    assert 'ols2t_stage_duration_seconds_bucket{stage="decode_audio",le="0.25"} 0' in actual
+    assert 'ols2t_stage_duration_seconds_bucket{stage="decode_audio",le="0.5"} 1' in actual
+    assert 'ols2t_stage_duration_seconds_bucket{stage="decode_audio",le="+Inf"} 1' in actual
+    assert 'ols2t_stage_duration_seconds_sum{stage="decode_audio"} 0.5' in actual
+    assert 'ols2t_stage_duration_seconds_count{stage="decode_audio"} 1' in actual
+    assert 'ols2t_stage_audio_seconds_total{stage="decode_audio"} 2' in actual
+    assert 'ols2t_queue_depth{queue="bytes_chunk"} 7' in actual
+
+
+def test_pipeline_metrics_reset() -> None:
+    sut = PipelineMetrics()
+    sut.observe_stage(PipelineStage.SERIALIZE, 0.1)
+    sut.reset()
+    assert sut.summary() == {"stages": {}, "queues": {}, "chunks": {}, "segments": {}, "dropped_audio_seconds": {}}
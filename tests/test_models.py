@@ -1,16 +1,38 @@
 import glob
+import os
+import queue
+import tempfile
+import threading
 import time
+import wave
 from collections.abc import Iterable
 from multiprocessing import Event as MPEvent
 from multiprocessing import Process
 from multiprocessing import Queue as MPQueue
+from multiprocessing import Value as MPValue
+from multiprocessing.sharedctypes import Synchronized
 from multiprocessing.synchronize import Event as EventClass
+from typing import List
 
 import numpy as np
+import pytest
 from numpy.typing import NDArray
+from pyaudio import paInputOverflowed
 from pytest_mock import MockerFixture
 
-from ols2t.models import BytesChunkStream, MicrophoneStream
+from ols2t.models import (
+    BytesChunkStream,
+    DecodingError,
+    FileStream,
+    MicrophoneStream,
+    PcmChunkStream,
+    PcmFileStream,
+    decoding_process,
+    put_with_backpressure,
+    recording_process,
+)
+from ols2t.settings import BackpressurePolicy
+from ols2t.types import AudioFrameChunk, PcmSampleFormat
 
 
 def test_microphone_stream(
@@ -40,14 +62,14 @@ def test_bytes_chunk_stream(
 
     stop_event = MPEvent()
 
-    def adding_chunks(queue: "MPQueue[bytes]", stop_event: EventClass) -> None:
+    def adding_chunks(queue: "MPQueue[bytes | None]", stop_event: EventClass) -> None:
         for chunk_path in sorted(glob.glob("tests/fixtures/webm_chunks/webm_chunk_*.bin")):
             with open(chunk_path, "rb") as f:
                 queue.put(f.read())
                 time.sleep(0.7)
         stop_event.set()
 
-    queue: "MPQueue[bytes]" = MPQueue(maxsize=256)
+    queue: "MPQueue[bytes | None]" = MPQueue(maxsize=256)
     sut = BytesChunkStream(chunk_queue=queue, stop_event=stop_event)
     with open("tests/fixtures/webm_chunks/webm_decoded.npy", "rb") as f:
         expected_data = np.load(f)
@@ -66,3 +88,264 @@ def test_bytes_chunk_stream(
         assert current_frame == expected_data.shape[0]
     finally:
         p.join()
+
+
+def test_bytes_chunk_stream_ends_on_sentinel_without_timeouts() -> None:
+    queue: "MPQueue[bytes | None]" = MPQueue(maxsize=256)
+    for chunk_path in sorted(glob.glob("tests/fixtures/webm_chunks/webm_chunk_*.bin")):
+        with open(chunk_path, "rb") as f:
+            queue.put(f.read())
+    queue.put(None)
+    with open("tests/fixtures/webm_chunks/webm_decoded.npy", "rb") as f:
+        expected_data = np.load(f)
+    sut = BytesChunkStream(chunk_queue=queue, stop_event=MPEvent())
+    started = time.perf_counter()
+    with sut as stream:
+        actual = np.concatenate(list(stream))
+    assert time.perf_counter() - started < 1.0
+    assert np.allclose(actual, expected_data)
+
+
+def test_bytes_chunk_stream_raises_decoder_errors() -> None:
+    queue: "MPQueue[bytes | None]" = MPQueue(maxsize=256)
+    queue.put(b"this is not a media container" * 100)
+    queue.put(None)
+    sut = BytesChunkStream(chunk_queue=queue, stop_event=MPEvent())
+    with pytest.raises(DecodingError):
+        with sut as stream:
+            list(stream)
+
+
+def test_bytes_chunk_stream_without_data_is_empty() -> None:
+    queue: "MPQueue[bytes | None]" = MPQueue(maxsize=256)
+    queue.put(None)
+    with BytesChunkStream(chunk_queue=queue, stop_event=MPEvent()) as stream:
+        assert list(stream) == []
+
+
+@pytest.mark.parametrize("fails", [False, True])
+def test_decoding_process_closes_the_container(mocker: MockerFixture, fails: bool) -> None:
+    av_open = mocker.patch("ols2t.models.av_container.open")
+    container = av_open.return_value.__enter__.return_value
+    frame = mocker.MagicMock()
+    frame.to_ndarray.return_value = np.zeros((1, 4), dtype=np.float32)
+    container.decode.side_effect = ValueError("broken") if fails else lambda stream: iter([frame])
+    output_queue: "MPQueue[AudioFrameChunk | Exception | None]" = MPQueue(maxsize=256)
+    decoding_process(MPQueue(maxsize=256), output_queue, MPEvent())
+    av_open.return_value.__exit__.assert_called_once()
+    outputs = [output_queue.get(timeout=1.0) for _ in range(1 if fails else 2)]
+    assert outputs[-1] is None
+
+
+def _drain(queue: "MPQueue[AudioFrameChunk | Exception | None]") -> List[float]:
+    values: List[float] = []
+    while len(values) < 2:
+        chunk = queue.get(timeout=1.0)
+        assert isinstance(chunk, np.ndarray)
+        values.append(float(chunk[0]))
+    return values
+
+
+@pytest.mark.parametrize(
+    ("policy", "expected"),
+    [(BackpressurePolicy.DROP_OLDEST, [2.0, 3.0]), (BackpressurePolicy.DROP_NEWEST, [1.0, 2.0])],
+)
+def test_put_with_backpressure_drops_when_queue_is_full(policy: BackpressurePolicy, expected: List[float]) -> None:
+    queue: "MPQueue[AudioFrameChunk | Exception | None]" = MPQueue(maxsize=2)
+    stop_event = MPEvent()
+    dropped_frames: "Synchronized[int]" = MPValue("q", 0)
+    for value in (1.0, 2.0, 3.0):
+        put_with_backpressure(queue, AudioFrameChunk([value] * 4), policy, stop_event, dropped_frames)
+    assert dropped_frames.value == 4
+    assert _drain(queue) == expected
+
+
+def test_put_with_backpressure_block_gives_up_when_stopped() -> None:
+    queue: "MPQueue[AudioFrameChunk | Exception | None]" = MPQueue(maxsize=1)
+    stop_event = MPEvent()
+    dropped_frames: "Synchronized[int]" = MPValue("q", 0)
+    put_with_backpressure(queue, AudioFrameChunk([1.0]), BackpressurePolicy.BLOCK, stop_event, dropped_frames)
+    stop_event.set()
+    put_with_backpressure(queue, AudioFrameChunk([2.0]), BackpressurePolicy.BLOCK, stop_event, dropped_frames)
+    # The abandoned chunk is lost audio too.
+    assert dropped_frames.value == 1
+    assert queue.qsize() == 1
+
+
+def test_recording_process_counts_input_overflows_as_dropped(mocker: MockerFixture) -> None:
+    PyAudio = mocker.patch("ols2t.models.PyAudio")
+    stop_event = MPEvent()
+
+    def read(frames: int, exception_on_overflow: bool) -> bytes:
+        assert exception_on_overflow is True
+        if PyAudio.return_value.open.return_value.read.call_count == 1:
+            raise OSError(paInputOverflowed, "Input overflowed")
+        stop_event.set()
+        return np.zeros(frames, dtype=np.float32).tobytes()
+
+    PyAudio.return_value.open.return_value.read.side_effect = read
+    queue: "MPQueue[AudioFrameChunk | Exception | None]" = MPQueue(maxsize=4)
+    dropped_frames: "Synchronized[int]" = MPValue("q", 0)
+    recording_process(queue, stop_event, BackpressurePolicy.DROP_OLDEST, dropped_frames)
+    chunk = queue.get(timeout=1.0)
+    assert isinstance(chunk, np.ndarray) and len(chunk) == 16000
+    assert queue.get(timeout=1.0) is None
+    assert dropped_frames.value == 16000
+
+
+def test_microphone_stream_reports_dropped_frames() -> None:
+    sut = MicrophoneStream(backpressure_policy=BackpressurePolicy.DROP_NEWEST)
+    assert sut.backpressure_policy == BackpressurePolicy.DROP_NEWEST
+    assert sut.dropped_frames == 0
+    assert sut.dropped_seconds == 0.0
+
+
+@pytest.mark.parametrize(
+    "sample_format, payload",
+    [
+        (PcmSampleFormat.F32LE, np.array([0.0, 0.5, -0.25, 1.0], dtype="<f4").tobytes()),
+        (PcmSampleFormat.S16LE, np.array([0, 16384, -8192, 32767], dtype="<i2").tobytes()),
+    ],
+)
+def test_pcm_chunk_stream(sample_format: PcmSampleFormat, payload: bytes) -> None:
+    chunk_queue: "queue.Queue[bytes | None]" = queue.Queue()
+    # Split in the middle of a sample to check that partial samples are carried over.
+    chunk_queue.put(payload[:3])
+    chunk_queue.put(payload[3:])
+    chunk_queue.put(None)
+    with PcmChunkStream(chunk_queue=chunk_queue, sample_format=sample_format, min_chunk_frames=1) as chunks:
+        result = np.concatenate(list(chunks))
+    np.testing.assert_allclose(result, [0.0, 0.5, -0.25, 1.0], atol=1e-4)
+
+
+def test_pcm_chunk_stream_coalesces_small_messages() -> None:
+    chunk_queue: "queue.Queue[bytes | None]" = queue.Queue()
+    for _ in range(4):
+        chunk_queue.put(np.zeros(100, dtype="<f4").tobytes())
+    chunk_queue.put(None)
+    with PcmChunkStream(chunk_queue=chunk_queue, min_chunk_frames=250) as chunks:
+        assert [len(chunk) for chunk in chunks] == [300, 100]
+
+
+def test_pcm_chunk_stream_ends_on_stop_event_without_end_marker() -> None:
+    chunk_queue: "queue.Queue[bytes | None]" = queue.Queue()
+    chunk_queue.put(np.zeros(4, dtype="<f4").tobytes())
+    stop_event = threading.Event()
+    stop_event.set()
+    sut = PcmChunkStream(chunk_queue=chunk_queue, min_chunk_frames=4, stop_event=stop_event)
+    with sut as chunks:
+        actual = [len(chunk) for chunk in chunks]
+    # Audio queued before the stop is still delivered.
+    assert actual == [4]
+
+
+def test_pcm_file_stream_maps_npy_without_copying(longtext_all_decoded_fixture_path: str) -> None:
+    expected = np.load(longtext_all_decoded_fixture_path)
+    sut = PcmFileStream(path=longtext_all_decoded_fixture_path, chunk_frames=16000)
+    with sut as chunks:
+        actual = []
+        for chunk in chunks:
+            assert isinstance(chunk, AudioFrameChunk)
+            assert not chunk.flags.owndata
+            actual.append(np.array(chunk))
+    np.testing.assert_array_equal(np.concatenate(actual), expected)
+    assert len(actual[0]) == 16000
+
+
+@pytest.mark.parametrize(
+    "extension, samples, expected",
+    [
+        (".f32", np.array([0.0, 0.5, -0.25], dtype="<f4"), [0.0, 0.5, -0.25]),
+        (".s16", np.array([0, 16384, -8192], dtype="<i2"), [0.0, 0.5, -0.25]),
+    ],
+)
+def test_pcm_file_stream_reads_headerless_pcm(
+    extension: str, samples: NDArray[np.generic], expected: List[float]
+) -> None:
+    with tempfile.TemporaryDirectory() as tempdir:
+        path = os.path.join(tempdir, "audio" + extension)
+        samples.tofile(path)
+        with PcmFileStream(path=path, chunk_frames=2) as chunks:
+            actual = [c.tolist() for c in chunks]
+    assert actual == [expected[:2], expected[2:]]
+
+
+def test_pcm_file_stream_skips_audio_before_start() -> None:
+    with tempfile.TemporaryDirectory() as tempdir:
+        path = os.path.join(tempdir, "audio.npy")
+        np.save(path, np.arange(10, dtype=np.float32))
+        with PcmFileStream(path=path, sampling_rate=4, chunk_frames=4, start=0.5) as chunks:
+            actual = [c.tolist() for c in chunks]
+    assert actual == [[2.0, 3.0, 4.0, 5.0], [6.0, 7.0, 8.0, 9.0]]
+
+
+def test_pcm_file_stream_requires_sample_format_for_unknown_extension() -> None:
+    with tempfile.TemporaryDirectory() as tempdir:
+        path = os.path.join(tempdir, "audio.raw")
+        np.zeros(4, dtype="<i2").tofile(path)
+        with pytest.raises(ValueError):
+            with PcmFileStream(path=path) as chunks:
+                list(chunks)
+        with PcmFileStream(path=path, sample_format=PcmSampleFormat.S16LE) as chunks:
+            assert [len(c) for c in chunks] == [4]
+
+
+@pytest.mark.parametrize("chunk_frames", [0, -1])
+def test_pcm_file_stream_rejects_non_positive_chunk_frames(chunk_frames: int) -> None:
+    with tempfile.TemporaryDirectory() as tempdir:
+        path = os.path.join(tempdir, "audio.npy")
+        np.save(path, np.zeros(4, dtype=np.float32))
+        with pytest.raises(ValueError):
+            PcmFileStream(path=path, chunk_frames=chunk_frames)
+
+
+def _write_stereo_wav(path: str, left: NDArray[np.int16], right: NDArray[np.int16]) -> None:
+    with wave.open(path, "wb") as fout:
+        fout.setnchannels(2)
+        fout.setsampwidth(2)
+        fout.setframerate(16000)
+        fout.writeframes(np.stack([left, right], axis=1).astype("<i2").tobytes())
+
+
+def test_file_stream_selects_and_splits_channels() -> None:
+    left = np.full(16000, 16384, dtype=np.int16)
+    right = np.zeros(16000, dtype=np.int16)
+    with tempfile.TemporaryDirectory() as tempdir:
+        path = os.path.join(tempdir, "stereo.wav")
+        _write_stereo_wav(path, left, right)
+        with FileStream(path=path, channel=1) as chunks:
+            (selected,) = list(chunks)
+        split = FileStream(path=path).split_channels()
+        with pytest.raises(ValueError):
+            with FileStream(path=path, channel=2) as chunks:
+                list(chunks)
+    assert np.allclose(selected, 0.0)
+    assert len(split) == 2
+    with split[0] as chunks:
+        assert np.allclose(np.concatenate(list(chunks)), 0.5, atol=1e-3)
+    with split[1] as chunks:
+        assert np.allclose(np.concatenate(list(chunks)), 0.0)
+
+
+def test_file_stream_skips_audio_before_start() -> None:
+    samples = np.concatenate([np.zeros(16000, dtype=np.int16), np.full(8000, 16384, dtype=np.int16)])
+    with tempfile.TemporaryDirectory() as tempdir:
+        path = os.path.join(tempdir, "stereo.wav")
+        _write_stereo_wav(path, samples, samples)
+        with FileStream(path=path, start=1.0) as chunks:
+            (mono,) = list(chunks)
+        with FileStream(path=path, channel=0, start=1.0) as chunks:
+            (selected,) = list(chunks)
+    assert len(mono) == len(selected) == 8000
+    assert np.allclose(mono, 0.5, atol=1e-3)
+    assert np.allclose(selected, 0.5, atol=1e-3)
+
+
+def test_file_stream_yields_chunks_of_chunk_seconds() -> None:
+    samples = np.zeros(40000, dtype=np.int16)
+    with tempfile.TemporaryDirectory() as tempdir:
+        path = os.path.join(tempdir, "stereo.wav")
+        _write_stereo_wav(path, samples, samples)
+        with FileStream(path=path, start=0.5, chunk_seconds=1.0) as chunks:
+            lengths = [len(chunk) for chunk in chunks]
+    assert lengths == [16000, 16000]
@@ -0,0 +1,113 @@
+import threading
+from typing import Any, List
+
+import pytest
+from pytest_mock import MockerFixture
+
+from ols2t.core import SpeechToTextCore
+from ols2t.models import BaseStream, Segment, TranscriptionContext
+from ols2t.multiplexing import (
+    MultiplexFrameType,
+    SchedulerFullError,
+    TranscriptionScheduler,
+    decode_multiplex_frame,
+    encode_multiplex_frame,
+)
+
+
+def test_multiplex_frame_round_trip() -> None:
+    frame = encode_multiplex_frame(2**32 - 1, MultiplexFrameType.AUDIO, b"\x01\x02")
+    stream_id, frame_type, payload = decode_multiplex_frame(frame)
+    assert stream_id == 2**32 - 1
+    assert frame_type == MultiplexFrameType.AUDIO
+    assert bytes(payload) == b"\x01\x02"
+
+
+def test_decode_multiplex_frame_rejects_unknown_frame_type() -> None:
+    with pytest.raises(ValueError):
+        decode_multiplex_frame(b"\x00\x00\x00\x00\x09")
+
+
+def test_transcription_scheduler_bounds_concurrency(mocker: MockerFixture) -> None:
+    mock_core = mocker.MagicMock(spec=SpeechToTextCore)
+    lock = threading.Lock()
+    active = 0
+    peak = 0
+    release = threading.Event()
+
+    def fake_transcribe(input_stream: BaseStream, context: TranscriptionContext | None = None) -> Any:
+        nonlocal active, peak
+        with lock:
+            active += 1
+            peak = max(peak, active)
+        release.wait(timeout=5.0)
+        with lock:
+            active -= 1
+        yield Segment(text="hello", start=0.0, end=1.0, probability=1.0)
+
+    mock_core.transcribe.side_effect = fake_transcribe
+    sut = TranscriptionScheduler(core=mock_core, max_workers=2)
+    received: List[Segment] = []
+    futures = [sut.submit(mocker.MagicMock(spec=BaseStream), received.append) for _ in range(5)]
+    release.set()
+    for future in futures:
+        future.result(timeout=5.0)
+    sut.shutdown()
+    assert sut.max_workers == 2
+    assert peak <= 2
+    assert len(received) == 5
+
+
+def test_transcription_scheduler_rejects_streams_beyond_workers_and_pending(mocker: MockerFixture) -> None:
+    mock_core = mocker.MagicMock(spec=SpeechToTextCore)
+    release = threading.Event()
+
+    def fake_transcribe(input_stream: BaseStream, context: TranscriptionContext | None = None) -> Any:
+        release.wait(timeout=5.0)
+        yield Segment(text="hello", start=0.0, end=1.0, probability=1.0)
+
+    mock_core.transcribe.side_effect = fake_transcribe
+    sut = TranscriptionScheduler(core=mock_core, max_workers=2, max_pending=1)
+    received: List[Segment] = []
+    futures = [sut.submit(mocker.MagicMock(spec=BaseStream), received.append) for _ in range(3)]
+    assert sut.active == 3
+    assert sut.pending == 1
+    with pytest.raises(SchedulerFullError):
+        sut.submit(mocker.MagicMock(spec=BaseStream), received.append)
+    release.set()
+    for future in futures:
+        future.result(timeout=5.0)
+    sut.submit(mocker.MagicMock(spec=BaseStream), received.append).result(timeout=5.0)
+    sut.shutdown()
+    assert len(received) == 4
+    assert sut.active == 0
+
+
+def test_transcription_scheduler_skips_streams_cancelled_while_waiting(mocker: MockerFixture) -> None:
+    mock_core = mocker.MagicMock(spec=SpeechToTextCore)
+    sut = TranscriptionScheduler(core=mock_core, max_workers=1)
+    context = TranscriptionContext()
+    context.cancel()
+    sut.submit(mocker.MagicMock(spec=BaseStream), lambda _: None, context=context).result(timeout=5.0)
+    sut.shutdown()
+    mock_core.transcribe.assert_not_called()
+
+
+def test_transcription_scheduler_releases_streams_cancelled_before_they_start(mocker: MockerFixture) -> None:
+    mock_core = mocker.MagicMock(spec=SpeechToTextCore)
+    release = threading.Event()
+
+    def fake_transcribe(input_stream: BaseStream, context: TranscriptionContext | None = None) -> Any:
+        release.wait(timeout=5.0)
+        yield from ()
+
+    mock_core.transcribe.side_effect = fake_transcribe
+    sut = TranscriptionScheduler(core=mock_core, max_workers=1, max_pending=1)
+    running = sut.submit(mocker.MagicMock(spec=BaseStream), lambda _: None)
+    waiting = sut.submit(mocker.MagicMock(spec=BaseStream), lambda _: None)
+    assert waiting.cancel()
+    assert sut.active == 1
+    release.set()
+    running.result(timeout=5.0)
+    sut.shutdown()
+    assert sut.active == 0
@@ -0,0 +1,81 @@
+import os
+import pstats
+import tempfile
+import threading
+from collections.abc import Generator
+from typing import List
+
+from ols2t.profiling import TranscriptionProfiler
+
+
+def test_transcription_profiler_iterate_writes_pstats() -> None:
+    def producer() -> Generator[int, None, None]:
+        for i in range(3):
+            yield sum(range(1000 * i))
+
+    with tempfile.TemporaryDirectory() as tempdir:
+        sut = TranscriptionProfiler(output_dir=tempdir, request_id="request-1")
+        assert list(sut.iterate(producer())) == [0, 499500, 1999000]
+        assert sut.output_path == os.path.join(tempdir, "request-1.pstats")
+        stats = pstats.Stats(sut.output_path)
+        assert any(function_name == "producer" for _, _, function_name in stats.stats)  # type: ignore[attr-defined]
+
+
+def test_transcription_profiler_writes_pstats_when_consumer_stops_early() -> None:
+    with tempfile.TemporaryDirectory() as tempdir:
+        sut = TranscriptionProfiler(output_dir=tempdir)
+        iterator = sut.iterate(iter(range(10)))
+        assert next(iterator) == 0
+        iterator.close()
+        assert os.path.exists(sut.output_path)
+
+
+def test_transcription_profiler_sanitizes_request_id() -> None:
+    with tempfile.TemporaryDirectory() as tempdir:
+        sut = TranscriptionProfiler(output_dir=tempdir, request_id="../escape")
+        assert os.path.dirname(sut.output_path) == tempdir
+
+
+def test_transcription_profiler_runs_one_profiler_at_a_time() -> None:
+    with tempfile.TemporaryDirectory() as tempdir:
+        first = TranscriptionProfiler(output_dir=tempdir, request_id="first")
+        running = first.iterate(iter(range(3)))
+        assert next(running) == 0
+        second = TranscriptionProfiler(output_dir=tempdir, request_id="second")
+        assert list(second.iterate(iter(range(3)))) == [0, 1, 2]
+        with TranscriptionProfiler(output_dir=tempdir, request_id="third") as third:
+            pass
+        assert list(running) == [1, 2]
+        assert first.profiled
+        assert not second.profiled
+        assert not third.profiled
+        assert sorted(os.listdir(tempdir)) == ["first.pstats"]
+        fourth = TranscriptionProfiler(output_dir=tempdir, request_id="fourth")
+        assert list(fourth.iterate(iter(range(3)))) == [0, 1, 2]
+        assert fourth.profiled
+
+
+def test_transcription_profiler_concurrent_iterations_do_not_fail() -> None:
+    barrier = threading.Barrier(2, timeout=5.0)
+    errors: List[BaseException] = []
+
+    def producer() -> Generator[int, None, None]:
+        barrier.wait()
+        yield sum(range(1000))
+
+    def run(profiler: TranscriptionProfiler) -> None:
+        try:
+            list(profiler.iterate(producer()))
+        except BaseException as e:
+            errors.append(e)
+
+    with tempfile.TemporaryDirectory() as tempdir:
+        profilers = [TranscriptionProfiler(output_dir=tempdir, request_id=f"request-{i}") for i in range(2)]
+        threads = [threading.Thread(target=run, args=(profiler,)) for profiler in profilers]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert errors == []
+        assert sorted(profiler.profiled for profiler in profilers) == [False, True]
+        assert len(os.listdir(tempdir)) == 1
@@ -0,0 +1,98 @@
+import json
+import os
+import tempfile
+from typing import List
+
+import pytest
+from pytest_mock import MockerFixture
+
+from ols2t.models import Segment
+from ols2t.writers import (
+    FlushPolicy,
+    JsonlSegmentWriter,
+    OutputFormat,
+    ParquetSegmentWriter,
+    SrtSegmentWriter,
+    VttSegmentWriter,
+    create_segment_writer,
+)
+
+SEGMENTS: List[Segment] = [
+    Segment(text=" こんにちは", start=0.0, end=1.25, probability=0.9),
+    Segment(text=" 世界", start=1.25, end=62.5, probability=0.8, channel=1),
+]
+
+
+def _read(path: str) -> str:
+    with open(path, "r", encoding="utf-8") as fin:
+        return fin.read()
+
+
+def test_jsonl_segment_writer_buffers_until_the_flush_policy_triggers() -> None:
+    with tempfile.TemporaryDirectory() as tempdir:
+        path = os.path.join(tempdir, "output.jsonl")
+        with JsonlSegmentWriter(path, flush_policy=FlushPolicy(max_segments=2, max_seconds=None)) as writer:
+            writer.write(SEGMENTS[0])
+            assert _read(path) == ""
+            writer.write(SEGMENTS[1])
+            assert _read(path) == "".join(segment.model_dump_json() + "\n" for segment in SEGMENTS)
+            writer.write(SEGMENTS[0])
+        lines = _read(path).splitlines()
+    assert [Segment.model_validate(json.loads(line)) for line in lines] == [*SEGMENTS, SEGMENTS[0]]
+
+
+def test_jsonl_segment_writer_appends() -> None:
+    with tempfile.TemporaryDirectory() as tempdir:
+        path = os.path.join(tempdir, "output.jsonl")
+        for segment in SEGMENTS:
+            with create_segment_writer(OutputFormat.JSONL, path, append=True) as writer:
+                writer.write(segment)
+        assert len(_read(path).splitlines()) == 2
+
+
+def test_srt_and_vtt_segment_writers() -> None:
+    with tempfile.TemporaryDirectory() as tempdir:
+        srt_path = os.path.join(tempdir, "output.srt")
+        vtt_path = os.path.join(tempdir, "output.vtt")
+        with SrtSegmentWriter(srt_path) as srt, VttSegmentWriter(vtt_path) as vtt:
+            for segment in SEGMENTS:
+                srt.write(segment)
+                vtt.write(segment)
+        assert _read(srt_path) == (
+            "1\n00:00:00,000 --> 00:00:01,250\nこんにちは\n\n2\n00:00:01,250 --> 00:01:02,500\n世界\n\n"
+        )
+        assert _read(vtt_path) == (
+            "WEBVTT\n\n00:00:00.000 --> 00:00:01.250\nこんにちは\n\n00:00:01.250 --> 00:01:02.500\n世界\n\n"
+        )
+
+
+def test_create_segment_writer_appends_only_jsonl() -> None:
+    with tempfile.TemporaryDirectory() as tempdir:
+        with pytest.raises(ValueError):
+            create_segment_writer(OutputFormat.SRT, os.path.join(tempdir, "output.srt"), append=True)
+
+
+def test_parquet_segment_writer_requires_pyarrow(mocker: MockerFixture) -> None:
+    mocker.patch("ols2t.writers.pa", None)
+    with tempfile.TemporaryDirectory() as tempdir:
+        with pytest.raises(ImportError, match="ols2t\\[parquet\\]"):
+            ParquetSegmentWriter(os.path.join(tempdir, "output.parquet"))
+
+
+def test_parquet_segment_writer() -> None:
+    pytest.importorskip("pyarrow")
+    import pyarrow.parquet as pq
+
+    with tempfile.TemporaryDirectory() as tempdir:
+        path = os.path.join(tempdir, "output.parquet")
+        with create_segment_writer(OutputFormat.PARQUET, path, flush_policy=FlushPolicy(max_segments=1)) as writer:
+            for segment in SEGMENTS:
+                writer.write(segment)
+        table = pq.read_table(path)
+    assert table.to_pydict() == {
+        "text": [" こんにちは", " 世界"],
+        "start": [0.0, 1.25],
+        "end": [1.25, 62.5],
+        "probability": [0.9, 0.8],
+        "channel": [None, 1],
+    }